@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Offline detection and mapping throughput over saved page HTML.
+
+    python -m benchmarks.offline_analysis
+    python -m benchmarks.offline_analysis snapshots/ --rounds 5
+
+Without snapshots a synthetic Workday "My Information" / "My Experience"
+page is generated. Each parser row reports snapshots/s and per-snapshot
+milliseconds for parse + detection + labels + rule mapping, plus how many
+fields were found and how many rules answered. The "cached" row reruns the
+snapshots as files through analyze_snapshots with a warm snapshot cache, so
+it includes reading and hashing each file, the cache lookup and mapping.
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from typing import List, Tuple
+from src.candidate_profile import compile_profile
+from src.config import config
+from src.disk_cache import DiskCache
+from src.offline_analysis import analyze_html, analyze_snapshots, find_snapshots
+from src.resume_parser import ParsedResume
+
+RESUME = ParsedResume(
+    name="Jane A. Doe", email="jane.doe@example.com", phone="(408) 555-0142",
+    address="123 Main St, Santa Clara, CA 95050", skills=["Python", "Go", "PostgreSQL"],
+    experience=[{"title": "Senior Software Engineer", "company": "Acme Analytics", "location": "San Jose, CA",
+                 "start_date": "Jan 2020", "end_date": "Present", "description": "Led streaming migration"},
+                {"title": "Software Engineer", "company": "Widget Corp", "location": "Palo Alto, CA",
+                 "start_date": "06/2017", "end_date": "12/2019", "description": "Built REST APIs"}],
+    education=[{"school": "Stanford University", "degree": "Master of Science in Computer Science",
+                "graduation_date": "2017"}],
+)
+
+
+def _text_field(automation_id: str, label: str, input_type: str = "text") -> str:
+    return (f'<div data-automation-id="formField-{automation_id}"><label for="{automation_id}">{label}</label>'
+            f'<input type="{input_type}" id="{automation_id}" data-automation-id="{automation_id}"></div>')
+
+
+def _block(prefix: str, index: int, keys: List[Tuple[str, str]]) -> str:
+    fields = "".join(f'<div data-automation-id="formField-{key}"><label>{label}</label>'
+                     f'<input type="text" data-automation-id="{key}"></div>' for key, label in keys)
+    return f'<div data-automation-id="{prefix}-{index}"><h4>{prefix} {index}</h4>{fields}</div>'
+
+
+def synthetic_page(blocks: int = 3, filler: int = 400) -> str:
+    """A Workday-shaped page: contact fields, listbox dropdowns, repeatable blocks, essays and page noise"""
+    contact = "".join(_text_field(key, label, kind) for key, label, kind in [
+        ("legalNameSection_firstName", "First Name*", "text"), ("legalNameSection_lastName", "Last Name*", "text"),
+        ("addressSection_addressLine1", "Address Line 1*", "text"), ("addressSection_city", "City*", "text"),
+        ("addressSection_postalCode", "Postal Code*", "text"), ("email", "Email Address*", "email"),
+        ("phone-number", "Phone Number*", "tel"), ("phone-extension", "Phone Extension", "text")])
+    dropdowns = "".join(f'<div data-automation-id="formField-{key}"><label>{label}</label>'
+                        f'<button aria-haspopup="listbox" data-automation-id="{key}">Select One</button></div>'
+                        for key, label in [("countryDropdown", "Country*"), ("addressSection_countryRegion", "State*"),
+                                           ("sourceDropdown", "How Did You Hear About Us?*")])
+    experience = "".join(_block("workExperience", i, [("jobTitle", "Job Title*"), ("companyName", "Company*"),
+                                                      ("location", "Location"), ("startDate", "From*")])
+                         for i in range(1, blocks + 1))
+    education = "".join(_block("education", i, [("schoolName", "School or University*"), ("degree", "Degree*")])
+                        for i in range(1, blocks + 1))
+    essays = "".join(f'<div><label for="q{i}">Why are you interested in this role? ({i})</label>'
+                     f'<textarea id="q{i}"></textarea></div>' for i in range(3))
+    noise = "".join(f'<div class="css-{i}"><span>Navigation item {i}</span><a href="#{i}">Link</a></div>'
+                    for i in range(filler))
+    scripts = "<script>" + "var x = 1;" * 2000 + "</script>"
+    return (f"<html><head>{scripts}</head><body><header>{noise}</header><main>"
+            f"<h2>My Information</h2>{contact}{dropdowns}"
+            f'<div data-automation-id="workExperienceSection"><h3>Work Experience</h3>{experience}</div>'
+            f'<div data-automation-id="educationSection"><h3>Education</h3>{education}</div>'
+            f"<h2>Application Questions</h2>{essays}"
+            f'<input type="hidden" name="csrf"><div style="display: none"><input type="text" name="trap"></div>'
+            f"</main></body></html>")
+
+
+def _time(analyze, pages: List[str], rounds: int):
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        results = [analyze(page) for page in pages]
+        timings.append((time.perf_counter() - started) / len(pages))
+    return statistics.median(timings), results[0].counts()
+
+
+def _time_cached(pages: List[str], rounds: int, parser: str, profile):
+    """Median per-snapshot time of analyze_snapshots once every detection is cached"""
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for i, page in enumerate(pages):
+            paths.append(os.path.join(directory, f"snapshot_{i:04d}.html"))
+            with open(paths[-1], "w", encoding="utf-8") as file:
+                file.write(page)
+        cache = DiskCache(os.path.join(directory, "detections.sqlite3"), ttl=config.snapshot_cache_ttl,
+                          disk_entries=max(len(pages), 5000))
+        list(analyze_snapshots(paths, RESUME, profile, parser=parser, cache=cache))  # Warm the cache
+        timings = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            results = list(analyze_snapshots(paths, RESUME, profile, parser=parser, workers=1, cache=cache))
+            timings.append((time.perf_counter() - started) / len(pages))
+        if not all(result.cached for result in results):
+            print("⚠️ Some snapshots missed the warm cache")
+        return statistics.median(timings), results[0].counts()
+
+
+def run(pages: List[str], rounds: int, parsers: List[str]):
+    profile = compile_profile(RESUME)
+    print(f"{len(pages)} snapshots, {statistics.mean(len(page) for page in pages) / 1024:.0f} KB average\n")
+    print(f"{'parser':<14}{'snaps/s':>9}{'ms/snap':>9}{'fields':>8}{'rules':>7}{'open':>6}")
+    rows = {}
+    for parser in parsers:
+        try:
+            analyze_html(pages[0], RESUME, profile, parser=parser)
+        except Exception as e:
+            print(f"{parser:<14} unavailable ({e})")
+            continue
+        rows[parser] = _time(lambda page: analyze_html(page, RESUME, profile, parser=parser), pages, rounds)
+    if rows:
+        rows["cached"] = _time_cached(pages, rounds, next(iter(rows)), profile)
+    for name, (per_page, counts) in rows.items():
+        print(f"{name:<14}{1 / per_page:>9.0f}{per_page * 1000:>9.2f}{counts['fields']:>8}"
+              f"{counts['block'] + counts['profile']:>7}{counts['open']:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", nargs="?", help="Directory or glob of saved .html snapshots")
+    parser.add_argument("--rounds", type=int, default=3, help="Passes over all snapshots; the median is reported")
+    parser.add_argument("--copies", type=int, default=50, help="Copies of the synthetic page to analyze")
+    parser.add_argument("--parser", action="append", dest="parsers", help="lxml or html.parser (default: both)")
+    args = parser.parse_args()
+
+    if args.source:
+        pages = []
+        for path in find_snapshots(args.source):
+            with open(path, encoding="utf-8", errors="replace") as file:
+                pages.append(file.read())
+        if not pages:
+            parser.error(f"no snapshots found in {args.source}")
+    else:
+        pages = [synthetic_page()] * args.copies
+    run(pages, args.rounds, args.parsers or ["lxml", "html.parser"])
+
+
+if __name__ == "__main__":
+    main()
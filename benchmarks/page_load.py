@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Compare Workday page loads with and without the network policy.
+
+    python -m benchmarks.page_load https://acme.wd5.myworkdayjobs.com/en-US/Careers/job/...
+    python -m benchmarks.page_load URL [URL ...] --runs 5 --headless
+
+Every run uses a fresh browser so nothing is served from cache. Load time is
+the wall time of driver.get() until the load event; requests and KB are read
+from Chrome's network log, so the difference between the two rows is what
+the policy saves.
+"""
+import argparse
+import statistics
+import time
+from typing import Dict, List
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+from src.network_policy import NetworkPolicy, apply_network_policy, collect_network_stats, enable_network_logging
+
+
+def load_once(url: str, policy: NetworkPolicy, headless: bool, service: Service) -> Dict[str, float]:
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    enable_network_logging(options)
+    driver = webdriver.Chrome(service=service, options=options)
+    try:
+        if policy:
+            apply_network_policy(driver, policy)
+        started = time.perf_counter()
+        driver.get(url)  # Returns after the load event
+        elapsed = time.perf_counter() - started
+        time.sleep(2)  # Let late trackers and widgets fire so they are counted too
+        stats = collect_network_stats(driver, policy)
+        return {"seconds": elapsed, "requests": stats.requests - stats.blocked,
+                "kb": stats.bytes / 1024, "blocked": stats.blocked}
+    finally:
+        driver.quit()
+
+
+def run(urls: List[str], runs: int, headless: bool):
+    service = Service(ChromeDriverManager().install())
+    modes = {"off": None, "on": NetworkPolicy.from_config()}
+    for url in urls:
+        print(url)
+        print(f"{'policy':<8}{'load s':>9}{'requests':>10}{'KB':>10}{'blocked':>9}")
+        medians = {}
+        for name, policy in modes.items():
+            results = [load_once(url, policy, headless, service) for _ in range(runs)]
+            medians[name] = {key: statistics.median(result[key] for result in results) for key in results[0]}
+            row = medians[name]
+            print(f"{name:<8}{row['seconds']:>9.2f}{row['requests']:>10.0f}{row['kb']:>10.0f}{row['blocked']:>9.0f}")
+        off, on = medians["off"], medians["on"]
+        print(f"saved   {off['seconds'] - on['seconds']:>9.2f}{off['requests'] - on['requests']:>10.0f}"
+              f"{off['kb'] - on['kb']:>10.0f}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("urls", nargs="+")
+    parser.add_argument("--runs", type=int, default=3, help="Loads per mode; medians are reported")
+    parser.add_argument("--headless", action="store_true")
+    args = parser.parse_args()
+    run(args.urls, args.runs, args.headless)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Compare PDF text extraction backends on throughput and quality.
+
+    python -m benchmarks.pdf_extraction                 # synthetic samples
+    python -m benchmarks.pdf_extraction resumes/*.pdf   # your own PDFs
+
+Quality is the similarity to a .txt ground truth next to the PDF when one
+exists (synthetic samples always have one), plus the share of word-like
+tokens as a layout-mangling signal.
+"""
+import argparse
+import difflib
+import glob
+import os
+import re
+import tempfile
+import time
+from src.pdf_extract import PDF_BACKENDS, available_backends, extract_pdf_text, get_backend
+from benchmarks.samples import write_sample_pdfs
+
+WORD = re.compile(r"^[A-Za-z][A-Za-z'.,-]{0,19}$")
+
+
+def word_ratio(text: str) -> float:
+    """Share of tokens that look like normal words (low when words run together)"""
+    tokens = text.split()
+    return sum(1 for token in tokens if WORD.match(token)) / len(tokens) if tokens else 0.0
+
+
+def similarity(text: str, truth: str) -> float:
+    return difflib.SequenceMatcher(None, " ".join(text.split()), " ".join(truth.split()), autojunk=False).ratio()
+
+
+def run(paths, backends, repeat: int, workers: int):
+    print(f"{'file':<24}{'backend':<12}{'mode':<10}{'pages':>6}{'pages/s':>10}{'words':>8}{'match':>8}")
+    for path in paths:
+        truth_path = os.path.splitext(path)[0] + ".txt"
+        truth = open(truth_path, encoding="utf-8").read() if os.path.exists(truth_path) else None
+
+        for name in backends:
+            pages = get_backend(name).page_count(path)
+            for mode, mode_workers in (("serial", 1), ("parallel", workers)):
+                started = time.perf_counter()
+                for _ in range(repeat):
+                    # Force the pool for the parallel row regardless of document size
+                    if mode == "parallel":
+                        text = _extract_parallel(path, name, mode_workers)
+                    else:
+                        text = extract_pdf_text(path, backend=name, workers=1)
+                elapsed = (time.perf_counter() - started) / repeat
+
+                match = f"{similarity(text, truth):.3f}" if truth else "-"
+                print(f"{os.path.basename(path)[:23]:<24}{name:<12}{mode:<10}{pages:>6}"
+                      f"{pages / elapsed:>10.1f}{word_ratio(text):>8.2f}{match:>8}")
+
+
+def _extract_parallel(path: str, backend: str, workers: int) -> str:
+    from src.config import config
+    previous = config.pdf_parallel_min_pages
+    config.pdf_parallel_min_pages = 1
+    try:
+        return extract_pdf_text(path, backend=backend, workers=workers)
+    finally:
+        config.pdf_parallel_min_pages = previous
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pdfs", nargs="*", help="PDF files or globs (default: generated samples)")
+    parser.add_argument("--backend", action="append", choices=list(PDF_BACKENDS), help="Backends to compare")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+
+    backends = args.backend or available_backends()
+    if not backends:
+        raise SystemExit("No PDF backend installed")
+
+    if args.pdfs:
+        paths = sorted(path for pattern in args.pdfs for path in glob.glob(pattern))
+        run(paths, backends, args.repeat, args.workers)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            run(write_sample_pdfs(directory), backends, args.repeat, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Measure the rule-based resume parser on throughput and field accuracy.
+
+    python -m benchmarks.resume_parsing
+    python -m benchmarks.resume_parsing --repeat 2000
+
+Accuracy is scored against the expected values in benchmarks/samples.py,
+separately for the synthetic samples and for held-out samples the rules
+were not written against. The old regex fallback is scored alongside for
+reference. "llm" counts the fields that would still be sent to the LLM at
+the configured threshold.
+"""
+import argparse
+import time
+from typing import Dict, List
+from src.config import config
+from src.resume_parser import FIELD_SECTIONS, ResumeParser
+from src.resume_rules import RuleBasedResumeParser
+from src.resume_sections import split_sections
+from benchmarks.samples import HELDOUT_RESUMES, SAMPLE_RESUMES
+
+SCALAR_FIELDS = ("name", "email", "phone", "address")
+LIST_FIELDS = {"experience": ("company", "title"), "education": ("school", "year")}
+SAMPLE_SETS = {"synthetic": SAMPLE_RESUMES, "held-out": HELDOUT_RESUMES}
+
+
+def _normalize(value) -> str:
+    return " ".join(str(value or "").lower().split())
+
+
+def score_fields(parsed: Dict, expected: Dict) -> Dict[str, float]:
+    """Per-field accuracy in [0, 1] for the fields listed in expected"""
+    scores = {}
+    for field in SCALAR_FIELDS:
+        if field in expected:
+            scores[field] = float(_normalize(parsed.get(field)) == _normalize(expected[field]))
+    if "skills" in expected:
+        found = {_normalize(skill) for skill in parsed.get("skills") or []}
+        wanted = {_normalize(skill) for skill in expected["skills"]}
+        scores["skills"] = len(found & wanted) / len(found | wanted) if found | wanted else 1.0
+    for field, keys in LIST_FIELDS.items():
+        if field in expected:
+            scores[field] = _score_entries(parsed.get(field) or [], expected[field], keys)
+    return scores
+
+
+def _score_entries(parsed: List[Dict], expected: List[Dict], keys) -> float:
+    # Entries are compared in order; extra or missing entries count as wrong
+    total = max(len(parsed), len(expected)) * len(keys)
+    correct = sum(
+        1 for got, want in zip(parsed, expected) for key in keys
+        if _normalize(got.get(key)) == _normalize(want.get(key))
+    )
+    return correct / total if total else 1.0
+
+
+def run(repeat: int):
+    rules = RuleBasedResumeParser()
+    regex = ResumeParser(llm_client=object())
+
+    parsers = {
+        "rules": lambda text: rules.parse(text)[0],
+        "regex": lambda text: vars(regex._parse_text_with_regex(text)),
+    }
+    fields = list(SCALAR_FIELDS) + ["skills"] + list(LIST_FIELDS)
+    print(f"{'set':<11}{'parser':<8}{'parses/s':>10}" + "".join(f"{field[:10]:>11}" for field in fields)
+          + f"{'mean':>7}{'llm':>6}")
+
+    for set_name, samples in SAMPLE_SETS.items():
+        for name, parse in parsers.items():
+            started = time.perf_counter()
+            for _ in range(repeat):
+                for sample in samples:
+                    parse(sample["text"])
+            rate = repeat * len(samples) / (time.perf_counter() - started)
+
+            totals = {field: 0.0 for field in fields}
+            llm_fields = 0
+            for sample in samples:
+                for field, value in score_fields(parse(sample["text"]), sample["expected"]).items():
+                    totals[field] += value / len(samples)
+                if name == "rules":
+                    _, confidence = rules.parse(sample["text"])
+                    sections = split_sections(sample["text"])
+                    llm_fields += sum(1 for field, score in confidence.items()
+                                      if field in FIELD_SECTIONS and FIELD_SECTIONS[field] in sections
+                                      and score < config.rule_confidence_threshold)
+
+            llm = str(llm_fields) if name == "rules" else "-"
+            mean = sum(totals.values()) / len(totals)
+            print(f"{set_name:<11}{name:<8}{rate:>10.0f}" + "".join(f"{totals[field]:>11.2f}" for field in fields)
+                  + f"{mean:>7.2f}{llm:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+    run(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+"""Synthetic sample resumes and PDFs for the benchmarks.
+
+The texts are generated here rather than checked in, so every benchmark has
+exact ground truth to score extraction and parsing quality against.
+"""
+import os
+from typing import List
+
+SAMPLE_RESUMES = [
+    {
+        "text": """Jane A. Doe
+Santa Clara, CA 95050
+jane.doe@example.com | (408) 555-0142 | linkedin.com/in/jane-doe
+
+SUMMARY
+Backend engineer with 7 years of experience building distributed data pipelines and APIs.
+
+SKILLS
+Python, Go, PostgreSQL, Kafka, Kubernetes, AWS
+
+EXPERIENCE
+Senior Software Engineer
+Acme Analytics, San Jose, CA
+Jan 2020 - Present
+- Led migration of batch ETL to streaming on Kafka, cutting data latency from hours to minutes
+- Mentored four engineers
+
+Software Engineer
+Widget Corp | Palo Alto, CA | 06/2017 - 12/2019
+- Built REST APIs serving 20M requests per day
+
+EDUCATION
+Stanford University
+Master of Science in Computer Science, 2017
+University of California, Berkeley
+Bachelor of Science in Electrical Engineering, 2015
+
+CERTIFICATIONS
+AWS Certified Solutions Architect - Associate, 2021
+""",
+        "expected": {
+            "name": "Jane A. Doe",
+            "email": "jane.doe@example.com",
+            "phone": "(408) 555-0142",
+            "address": "Santa Clara, CA 95050",
+            "skills": ["Python", "Go", "PostgreSQL", "Kafka", "Kubernetes", "AWS"],
+            "experience": [
+                {"company": "Acme Analytics", "title": "Senior Software Engineer"},
+                {"company": "Widget Corp", "title": "Software Engineer"},
+            ],
+            "education": [
+                {"school": "Stanford University", "year": "2017"},
+                {"school": "University of California, Berkeley", "year": "2015"},
+            ],
+        },
+    },
+    {
+        "text": """RAHUL MEHTA
+rahul.mehta@example.org
++1 415-555-0199
+1200 Market Street, San Francisco, CA 94102
+
+Professional Summary
+Data scientist focused on experimentation and forecasting for consumer products.
+
+Technical Skills
+Python • SQL • Spark • scikit-learn • Tableau
+
+Work Experience
+Data Scientist at Bright Retail Inc. (March 2021 – Present)
+Built demand forecasting models used for inventory planning across 300 stores.
+Analyst at Northwind Traders (Aug 2018 – Feb 2021)
+Owned weekly KPI reporting and A/B test analysis.
+
+Education
+M.S. Statistics, University of Washington, 2018
+B.Tech Computer Engineering, Indian Institute of Technology Bombay, 2016
+""",
+        "expected": {
+            "name": "Rahul Mehta",
+            "email": "rahul.mehta@example.org",
+            "phone": "+1 415-555-0199",
+            "address": "1200 Market Street, San Francisco, CA 94102",
+            "skills": ["Python", "SQL", "Spark", "scikit-learn", "Tableau"],
+            "experience": [
+                {"company": "Bright Retail Inc.", "title": "Data Scientist"},
+                {"company": "Northwind Traders", "title": "Analyst"},
+            ],
+            "education": [
+                {"school": "University of Washington", "year": "2018"},
+                {"school": "Indian Institute of Technology Bombay", "year": "2016"},
+            ],
+        },
+    },
+    {
+        "text": """Maria Garcia
+London, United Kingdom
+maria.garcia@example.co.uk  +44 20 7946 0958
+
+OBJECTIVE
+Product designer seeking a senior role on a design systems team.
+
+EMPLOYMENT HISTORY
+Lead Product Designer, Orbit Labs
+2019 - 2024
+Created and maintained the company design system used by 12 product teams.
+Product Designer, Pixel & Co
+2016 - 2019
+
+EDUCATION
+Royal College of Art - MA Interaction Design - 2016
+
+SKILLS
+Figma, Sketch, Prototyping, User Research, Accessibility
+""",
+        "expected": {
+            "name": "Maria Garcia",
+            "email": "maria.garcia@example.co.uk",
+            "phone": "+44 20 7946 0958",
+            "address": "London, United Kingdom",
+            "skills": ["Figma", "Sketch", "Prototyping", "User Research", "Accessibility"],
+            "experience": [
+                {"company": "Orbit Labs", "title": "Lead Product Designer"},
+                {"company": "Pixel & Co", "title": "Product Designer"},
+            ],
+            "education": [
+                {"school": "Royal College of Art", "year": "2016"},
+            ],
+        },
+    },
+]
+
+# Held out from rule development: headings, date formats and layouts the
+# rules in src/resume_rules.py were not written against. Scored separately
+# so the synthetic set can't hide overfitting.
+HELDOUT_RESUMES = [
+    {
+        "text": """Thomas O'Brien, PE
+Structural Engineer
+Phone: 312.555.0187
+Email: tobrien@example.net
+Chicago, Illinois
+
+CORE COMPETENCIES
+Revit | ETABS | SAP2000 | AutoCAD | Steel design | Seismic retrofits
+
+PROFESSIONAL EXPERIENCE
+Thornton Hale Partners — Chicago, IL
+Project Engineer, 2019/03 – 2023/11
+Designed steel and concrete framing for mid-rise residential projects.
+
+Lakeshore Design Group — Evanston, IL
+Staff Engineer, 2015/06 – 2019/02
+
+ACADEMIC BACKGROUND
+Master of Engineering, Structural Engineering — Northwestern University (2015)
+Bachelor of Science, Civil Engineering — Purdue University (2013)
+""",
+        "expected": {
+            "name": "Thomas O'Brien, PE",
+            "email": "tobrien@example.net",
+            "phone": "312.555.0187",
+            "address": "Chicago, Illinois",
+            "skills": ["Revit", "ETABS", "SAP2000", "AutoCAD", "Steel design", "Seismic retrofits"],
+            "experience": [
+                {"company": "Thornton Hale Partners", "title": "Project Engineer"},
+                {"company": "Lakeshore Design Group", "title": "Staff Engineer"},
+            ],
+            "education": [
+                {"school": "Northwestern University", "year": "2015"},
+                {"school": "Purdue University", "year": "2013"},
+            ],
+        },
+    },
+    {
+        "text": """Anna Schmidt
+Berliner Str. 12, 10115 Berlin, Germany
+anna.schmidt@example.de · +49 30 1234567
+
+Profile
+Frontend developer building accessible web applications for public-sector clients.
+
+Career History
+03.2020 – heute: Senior Frontend Developer, Digitalwerk GmbH
+09.2016 – 02.2020: Web Developer, Nordlicht Media AG
+
+Qualifications
+2012 – 2016  B.Sc. Informatik, Technische Universität München
+
+Tools & Technologies
+TypeScript, React, Vue.js, WCAG, Cypress
+""",
+        "expected": {
+            "name": "Anna Schmidt",
+            "email": "anna.schmidt@example.de",
+            "phone": "+49 30 1234567",
+            "address": "Berliner Str. 12, 10115 Berlin, Germany",
+            "skills": ["TypeScript", "React", "Vue.js", "WCAG", "Cypress"],
+            "experience": [
+                {"company": "Digitalwerk GmbH", "title": "Senior Frontend Developer"},
+                {"company": "Nordlicht Media AG", "title": "Web Developer"},
+            ],
+            "education": [
+                {"school": "Technische Universität München", "year": "2016"},
+            ],
+        },
+    },
+    {
+        "text": """KWAME MENSAH
+Atlanta, GA 30303 | (404) 555-0123 | kwame.mensah@example.com
+
+EXPERIENCE
+DELTA FREIGHT SOLUTIONS                                  Sept. 2018 to present
+Operations Manager
+- Cut average dock-to-stock time by 30% across three warehouses
+PEACHTREE LOGISTICS                                      May 2014 to Aug. 2018
+Shift Supervisor
+
+EDUCATION
+Georgia State University, B.B.A. Supply Chain Management, May 2014
+
+SKILLS & CERTIFICATIONS
+Lean Six Sigma Green Belt; SAP EWM; Forklift certified; Team leadership
+""",
+        "expected": {
+            "name": "Kwame Mensah",
+            "email": "kwame.mensah@example.com",
+            "phone": "(404) 555-0123",
+            "address": "Atlanta, GA 30303",
+            "skills": ["Lean Six Sigma Green Belt", "SAP EWM", "Forklift certified", "Team leadership"],
+            "experience": [
+                {"company": "Delta Freight Solutions", "title": "Operations Manager"},
+                {"company": "Peachtree Logistics", "title": "Shift Supervisor"},
+            ],
+            "education": [
+                {"school": "Georgia State University", "year": "2014"},
+            ],
+        },
+    },
+    {
+        "text": """Li Wei
+liwei.dev@example.com
++86 138 0013 8000
+Shanghai, China
+
+About Me
+Mobile engineer with eight years of Android and iOS experience in fintech.
+
+Relevant Experience
+Mobile Tech Lead | FinPay Technologies | 2021-01 ~ Present
+iOS Engineer | Orient Bank Digital | 2017-07 ~ 2020-12
+Android Developer | Hangzhou Apps Studio | 2015-07 ~ 2017-06
+
+Education
+Zhejiang University | B.Eng. Software Engineering | 2011 - 2015
+
+Skills
+Kotlin / Swift / Flutter / Jetpack Compose / CI/CD
+""",
+        "expected": {
+            "name": "Li Wei",
+            "email": "liwei.dev@example.com",
+            "phone": "+86 138 0013 8000",
+            "address": "Shanghai, China",
+            "skills": ["Kotlin", "Swift", "Flutter", "Jetpack Compose", "CI/CD"],
+            "experience": [
+                {"company": "FinPay Technologies", "title": "Mobile Tech Lead"},
+                {"company": "Orient Bank Digital", "title": "iOS Engineer"},
+                {"company": "Hangzhou Apps Studio", "title": "Android Developer"},
+            ],
+            "education": [
+                {"school": "Zhejiang University", "year": "2015"},
+            ],
+        },
+    },
+    {
+        "text": """Sarah-Jane Whitfield
+Nurse Practitioner
+
+Contact
+sj.whitfield@example.org
+(617) 555-0164
+Boston, MA
+
+Clinical Experience
+Family Nurse Practitioner
+Harbor Community Health Center
+July 2019 - Current
+Registered Nurse, Emergency Department
+Massachusetts General Hospital
+June 2013 - June 2019
+
+Licenses
+Board Certified FNP (AANP), Massachusetts RN License
+
+Education
+Master of Science in Nursing
+Boston College, 2019
+Bachelor of Science in Nursing
+University of Massachusetts Amherst, 2013
+
+Areas of Expertise
+Primary care, Chronic disease management, Patient education, Epic EHR
+""",
+        "expected": {
+            "name": "Sarah-Jane Whitfield",
+            "email": "sj.whitfield@example.org",
+            "phone": "(617) 555-0164",
+            "address": "Boston, MA",
+            "skills": ["Primary care", "Chronic disease management", "Patient education", "Epic EHR"],
+            "experience": [
+                {"company": "Harbor Community Health Center", "title": "Family Nurse Practitioner"},
+                {"company": "Massachusetts General Hospital", "title": "Registered Nurse, Emergency Department"},
+            ],
+            "education": [
+                {"school": "Boston College", "year": "2019"},
+                {"school": "University of Massachusetts Amherst", "year": "2013"},
+            ],
+        },
+    },
+]
+
+
+def _latin1(line: str) -> str:
+    return line.encode("latin-1", "replace").decode("latin-1")
+
+
+def _escape_pdf_text(line: str) -> str:
+    return _latin1(line).replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_sample_pdf(path: str, pages: List[List[str]]):
+    """Write a minimal text PDF (Helvetica, one text block per page)"""
+    objects = []  # object bodies, numbered from 1
+
+    # Catalog, page tree and font first, then a page and its content per page
+    page_ids = [4 + 2 * index for index in range(len(pages))]
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    for page_id, lines in zip(page_ids, pages):
+        text = "BT /F1 10 Tf 12 TL 50 760 Td " + " ".join(
+            f"({_escape_pdf_text(line)}) Tj T*" for line in lines
+        ) + " ET"
+        stream = text.encode("latin-1")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(output)
+
+
+def write_sample_pdfs(directory: str, page_counts=(1, 4, 16, 48)) -> List[str]:
+    """Resume-like PDFs of increasing length with a .txt ground truth next to each"""
+    lines = [_latin1(line) for resume in SAMPLE_RESUMES for line in resume["text"].splitlines() if line.strip()]
+    paths = []
+    for count in page_counts:
+        pages = [[lines[(i * 50 + j) % len(lines)] for j in range(50)] for i in range(count)]
+        path = os.path.join(directory, f"sample_{count}p.pdf")
+        write_sample_pdf(path, pages)
+        with open(path[:-4] + ".txt", "w", encoding="utf-8") as file:
+            file.write("\n".join("\n".join(page) for page in pages))
+        paths.append(path)
+    return paths
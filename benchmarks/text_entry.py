@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Time text entry methods on a local page that counts the events validators see.
+
+    python -m benchmarks.text_entry
+    python -m benchmarks.text_entry --lengths 30 300 2000 --headless
+
+Methods: per-character send_keys with the configured typing delay (the old
+path), the same without delay, one send_keys call, one Input.insertText call
+and chunked insertText. Each row reports seconds, speedup over the old path,
+whether the field ended up with the exact text, and the input/keyup/change
+events fired.
+"""
+import argparse
+import time
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from webdriver_manager.chrome import ChromeDriverManager
+from src.config import config
+from src.text_input import insert_text, type_per_character
+
+PAGE = """data:text/html,<textarea id="field" rows="10" cols="80"></textarea><script>
+window.counts = {input: 0, keyup: 0, change: 0};
+const field = document.getElementById('field');
+['input', 'keyup', 'change'].forEach((name) => field.addEventListener(name, () => window.counts[name]++));
+</script>"""
+
+# Per-character typing at the configured delay is only timed up to this length, then extrapolated
+SLOW_SAMPLE_CHARS = 50
+
+
+def measure(driver, method, text: str):
+    field = driver.find_element(By.ID, "field")
+    driver.execute_script("arguments[0].value = ''; window.counts = {input: 0, keyup: 0, change: 0};", field)
+    started = time.perf_counter()
+    method(driver, field, text)
+    elapsed = time.perf_counter() - started
+    value = driver.execute_script("return arguments[0].value;", field)
+    counts = driver.execute_script("return window.counts;")
+    return elapsed, value == text, counts
+
+
+def run(lengths, headless: bool):
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    driver.get(PAGE)
+
+    methods = {
+        "keys+delay": lambda d, e, t: type_per_character(e, t),
+        "keys": lambda d, e, t: type_per_character(e, t, delay=0),
+        "send_keys": lambda d, e, t: e.send_keys(t),
+        "insert": lambda d, e, t: insert_text(d, e, t, chunk_chars=0, blur=False),
+        "chunked": lambda d, e, t: insert_text(d, e, t, blur=False),
+    }
+    try:
+        for length in lengths:
+            text = ("Experienced engineer who ships reliable systems. " * (length // 49 + 1))[:length]
+            print(f"\n{length} characters")
+            print(f"{'method':<12}{'seconds':>9}{'speedup':>9}{'exact':>7}{'input':>7}{'keyup':>7}{'change':>8}")
+            baseline = None
+            for name, method in methods.items():
+                sample = text
+                if name == "keys+delay" and length > SLOW_SAMPLE_CHARS:
+                    sample = text[:SLOW_SAMPLE_CHARS]
+                elapsed, exact, counts = measure(driver, method, sample)
+                elapsed *= len(text) / len(sample)
+                baseline = baseline or elapsed
+                exact_text = "yes" if exact else "no"
+                print(f"{name:<12}{elapsed:>9.2f}{baseline / elapsed:>8.0f}x{exact_text:>7}"
+                      f"{counts['input']:>7}{counts['keyup']:>7}{counts['change']:>8}")
+    finally:
+        driver.quit()
+    print(f"\ntyping_delay={config.typing_delay}s, text_chunk_chars={config.text_chunk_chars}; "
+          f"keys+delay is extrapolated beyond {SLOW_SAMPLE_CHARS} characters")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lengths", type=int, nargs="+", default=[30, 300, 2000])
+    parser.add_argument("--headless", action="store_true")
+    args = parser.parse_args()
+    run(args.lengths, args.headless)
+
+
+if __name__ == "__main__":
+    main()
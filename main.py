@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 import click
+import json
 import os
+import time
 from rich.console import Console
 from rich.prompt import Prompt, Confirm
 from rich.table import Table
@@ -19,7 +21,9 @@ def cli():
 @click.option('--resume', '-r', required=True, help='Path to your resume (PDF or DOCX)')
 @click.option('--url', '-u', required=True, help='Workday application URL')
 @click.option('--headless', is_flag=True, help='Run browser in headless mode')
-def fill(resume, url, headless):
+@click.option('--save-plan', default=None, help='Save the pages, fields and answers of a successful run as a JSON fill plan')
+@click.option('--plan', default=None, help='Replay a fill plan from the same tenant; diverging pages are filled live')
+def fill(resume, url, headless, save_plan, plan):
     """Automatically fill a Workday application"""
     
     # Validate resume file
@@ -34,6 +38,11 @@ def fill(resume, url, headless):
     console.print("🤖 [bold blue]Workday Desktop Agent[/bold blue]")
     console.print(f"📄 Resume: {resume}")
     console.print(f"🌐 URL: {url}")
+    if plan:
+        if not os.path.exists(plan):
+            console.print(f"❌ [red]Fill plan not found: {plan}[/red]")
+            return
+        console.print(f"🗺️ Fill plan: {plan}")
     
     if not Confirm.ask("\nProceed with automatic application filling?"):
         return
@@ -50,7 +59,7 @@ def fill(resume, url, headless):
         ) as progress:
             task = progress.add_task("Filling application...", total=None)
             
-            results = agent.auto_fill_application(url, resume)
+            results = agent.auto_fill_application(url, resume, save_plan_path=save_plan, replay_plan_path=plan)
         
         # Display results
         console.print("\n" + "="*50)
@@ -64,6 +73,8 @@ def fill(resume, url, headless):
         
         console.print(f"�  Pages processed: {results.get('pages_completed', 0)}")
         console.print(f"📝 Total fields filled: {results.get('total_fields_filled', 0)}")
+        if plan:
+            console.print(f"🗺️ Pages replayed from plan: {results.get('pages_replayed', 0)}")
         console.print(f"📎 Resume uploaded: {'✅' if results.get('resume_uploaded', False) else '❌'}")
         
         if results.get("errors"):
@@ -128,6 +139,111 @@ def parse(resume):
     except Exception as e:
         console.print(f"❌ [red]Error parsing resume: {str(e)}[/red]")
 
+@cli.command('bulk-parse')
+@click.argument('source')
+@click.option('--output', '-o', default='parsed_resumes.jsonl', show_default=True, help='JSONL file to append results to')
+@click.option('--workers', '-w', type=int, default=None, help='Processes for text extraction (default: CPU count)')
+@click.option('--llm-concurrency', type=int, default=None, help='Resumes parsed by the LLM at once')
+@click.option('--force', is_flag=True, help='Re-parse files even if unchanged since the last run')
+@click.option('--include-text', is_flag=True, help='Store the extracted resume text in each record')
+def bulk_parse(source, output, workers, llm_concurrency, force, include_text):
+    """Parse every resume in a directory or glob into a JSONL file"""
+    from src.bulk_parse import BulkResumeParser, find_resumes
+    from src.llm_router import build_default_llm_client
+    from src.resume_parser import ResumeParser
+
+    paths = find_resumes(source)
+    if not paths:
+        console.print(f"❌ [red]No PDF or DOCX resumes found in: {source}[/red]")
+        return
+
+    def report(record):
+        if record["status"] == "ok":
+            console.print(f"✅ {os.path.basename(record['path'])} "
+                          f"[dim](extract {record['extract_seconds']}s, parse {record['parse_seconds']}s)[/dim]")
+        else:
+            console.print(f"❌ [red]{os.path.basename(record['path'])}: {record['error']}[/red]")
+
+    started = time.perf_counter()
+    bulk = BulkResumeParser(ResumeParser(build_default_llm_client()), workers=workers,
+                            llm_concurrency=llm_concurrency, include_text=include_text)
+    counts = bulk.run(paths, output, force=force, on_record=report)
+    console.print(f"\n📊 Parsed {counts['ok']}, failed {counts['error']}, unchanged {counts['skipped']} "
+                  f"in {time.perf_counter() - started:.1f}s → {output}")
+
+@cli.command()
+@click.argument('source')
+@click.option('--resume', '-r', default=None, help='Resume (PDF/DOCX) or parsed resume JSON (bulk-parse record) to map with')
+@click.option('--output', '-o', default=None, help='JSONL file for every snapshot\'s fields, answers and sources')
+@click.option('--llm', is_flag=True, help='Also send the fields rules leave open to the LLM')
+@click.option('--parser', type=click.Choice(['lxml', 'html.parser']), default=None, help='HTML parser (default: lxml if installed)')
+@click.option('--top', type=int, default=15, show_default=True, help='Most common labels left for the LLM to list')
+@click.option('--workers', '-w', type=int, default=None, help='Processes for HTML parsing and detection (default: CPU count)')
+@click.option('--no-cache', is_flag=True, help='Detect again even for snapshots analyzed before')
+def analyze(source, resume, output, llm, parser, top, workers, no_cache):
+    """Run field detection and mapping over saved page HTML, without a browser"""
+    from collections import Counter
+    from src.candidate_profile import compile_profile, load_or_compile_profile
+    from src.field_resolver import normalize_label
+    from src.offline_analysis import analyze_snapshots, find_snapshots, load_resume_data
+
+    paths = find_snapshots(source)
+    if not paths:
+        console.print(f"❌ [red]No HTML snapshots found in: {source}[/red]")
+        return
+
+    llm_client, resume_data, profile = None, None, None
+    if llm or (resume and not resume.lower().endswith(('.json', '.jsonl'))):
+        from src.llm_router import build_default_llm_client
+        llm_client = build_default_llm_client()
+    if resume:
+        resume_data = load_resume_data(resume, llm_client)
+        profile = (compile_profile(resume_data) if resume.lower().endswith(('.json', '.jsonl'))
+                   else load_or_compile_profile(resume, resume_data))
+    elif llm:
+        console.print("⚠️ [yellow]--llm needs --resume; only detection and labels are analyzed[/yellow]")
+
+    totals, open_labels, layouts = Counter(), Counter(), set()
+    started = time.perf_counter()
+    out = open(output, 'w', encoding='utf-8') if output else None
+    try:
+        for analysis in analyze_snapshots(paths, resume=resume_data, profile=profile, parser=parser,
+                                          llm_client=llm_client if llm else None, workers=workers,
+                                          use_cache=not no_cache):
+            totals.update(analysis.counts())
+            totals["cached"] += analysis.cached
+            totals["prompt_tokens"] += analysis.prompt_tokens
+            totals["errors"] += len(analysis.errors)
+            layouts.add(analysis.fingerprint)
+            open_labels.update(normalize_label(f.label) for f in analysis.open_fields())
+            for error in analysis.errors:
+                console.print(f"❌ [red]{os.path.basename(analysis.path)}: {error}[/red]")
+            if out:
+                out.write(json.dumps(analysis.to_dict()) + "\n")
+    finally:
+        if out:
+            out.close()
+    elapsed = time.perf_counter() - started
+
+    table = Table(show_header=True, header_style="bold blue")
+    table.add_column("Fields", justify="right")
+    table.add_column("Blocks", justify="right")
+    table.add_column("Profile rules", justify="right")
+    table.add_column("LLM", justify="right")
+    table.add_column("Left open", justify="right")
+    table.add_column("Open prompt tokens", justify="right")
+    fields_total = totals["fields"] or 1
+    table.add_row(str(totals["fields"]),
+                  *(f"{totals[key]} ({totals[key] / fields_total:.0%})" for key in ("block", "profile", "llm", "open")),
+                  str(totals["prompt_tokens"]) if resume_data else "-")
+    console.print(table)
+    if top and open_labels:
+        console.print(f"\n🔎 [bold]Most common labels left for the LLM:[/bold]")
+        for label, count in open_labels.most_common(top):
+            console.print(f"  {count:>5}  {label}")
+    console.print(f"\n📊 {len(paths)} snapshots ({totals['cached']} cached), {len(layouts - {''})} layouts "
+                  f"in {elapsed:.2f}s ({len(paths) / elapsed:.0f} snapshots/s)" + (f" → {output}" if output else ""))
+
 @cli.command()
 def test():
     """Test system requirements"""
@@ -135,9 +251,11 @@ def test():
     
     # Test LLM connection
     try:
+        from src.config import config
         from src.llm_client import OpenRouterClient
-        openrouter_key = "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"
-        client = OpenRouterClient(openrouter_key, model="deepseek/deepseek-chat")
+        if not config.openrouter_api_key:
+            raise ValueError("OPENROUTER_API_KEY is not set")
+        client = OpenRouterClient(config.openrouter_api_key, model=config.openrouter_model)
         if client.test_connection():
             console.print("✅ [green]OpenRouter DeepSeek Chat (FREE) service is working[/green]")
         else:
@@ -1,8 +1,11 @@
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable, Tuple
 import time
 import os
 import json
-from dataclasses import dataclass
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -15,33 +18,55 @@ import cv2
 import numpy as np
 from PIL import Image
 from src.llm_client import LLMClient
+from src.form_fields import (DATE_MONTH_SEGMENT, FIELD_SECTIONS_SCRIPT, FIELD_SELECTORS, SKIPPED_SEGMENTS,
+                             UNKNOWN_LABEL, WorkdayField)
 from src.resume_parser import ParsedResume
+from src.prompt_builder import MappingPromptBuilder, estimate_tokens
+from src.field_resolver import resolve_field_locally
+from src.candidate_profile import CandidateProfile, compile_profile, load_or_compile_profile
+from src.essay_service import EssayService
+from src.job_posting import JobPosting, extract_job_posting, guess_company_and_position, load_cached_posting
+from src.layout_cache import XPATH_FUNCTION, PageLayout, changed_labels, get_layout_cache, read_labels, read_page_layout
+from src.fill_plan import FillPlan, PlanStep, load_plan, save_plan
+from src.widgets import find_widget_adapter, may_be_widget
+from src.repeatable_sections import block_field_values, expand_sections
+from src.resume_upload import upload_resume, upload_visible
+from src.session_store import capture_session, get_session_store, restore_session, session_state
+from src.network_policy import NetworkPolicy, apply_network_policy, collect_network_stats, enable_network_logging
+from src.text_input import enter_text
+from src.offline_analysis import save_snapshot
+from src.checkpoint_journal import (ApplicationJournal, JournalState, COMPLETED, NAVIGATED, PAGE_FILLED,
+                                    PAGE_MAPPED, RESUME_PARSED, RESUME_UPLOADED)
 from src.config import config
 from templates.prompts import WORKDAY_PROMPTS
 
-@dataclass
-class WorkdayField:
-    """Represents a field in Workday application"""
-    label: str
-    field_type: str  # text, textarea, select, checkbox, radio
-    value: str = ""
-    xpath: str = ""
-    filled: bool = False
-
 class WorkdayAgent:
     def __init__(self, llm_client: LLMClient = None):
-        # Use OpenRouter by default with the provided API key
+        # Use the configured backends (OpenRouter with DeepSeek Chat by default)
         if llm_client is None:
-            from src.llm_client import OpenRouterClient
-            openrouter_key = "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"
-            self.llm_client = OpenRouterClient(openrouter_key, model="deepseek/deepseek-chat")
-            print("🤖 Using OpenRouter with DeepSeek Chat (FREE) for enhanced AI capabilities")
+            from src.llm_router import build_default_llm_client
+            self.llm_client = build_default_llm_client()
+            print(f"🤖 Using {type(self.llm_client).__name__} ({self.llm_client.model}) for enhanced AI capabilities")
         else:
             self.llm_client = llm_client
             
         self.driver = None
         self.wait = None
         self.resume_data = None
+        self.profile: Optional[CandidateProfile] = None
+        self.prompt_builder = MappingPromptBuilder()
+        self.llm_session = None
+        self.essays: Optional[EssayService] = None
+        self.job: Optional[JobPosting] = None
+        self.layouts = get_layout_cache()
+        self.page_layout: Optional[PageLayout] = None
+        self.page_layout_cached = False
+        self.last_next_xpath = ""  # Locator of the button that last moved to a new page
+        self.block_values: Dict[str, str] = {}  # Locator -> answer for experience/education block fields
+        self.sessions = get_session_store()
+        self.session_valid = False  # Signed in through a restored session
+        self.network_policy: Optional[NetworkPolicy] = None
+        self.journal: Optional[ApplicationJournal] = None
         
         # Create screenshots directory
         os.makedirs(config.screenshot_dir, exist_ok=True)
@@ -57,10 +82,21 @@ class WorkdayAgent:
         options.add_argument("--disable-blink-features=AutomationControlled")
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option('useAutomationExtension', False)
+        if config.block_requests:
+            enable_network_logging(options)
         
         service = Service(ChromeDriverManager().install())
         self.driver = webdriver.Chrome(service=service, options=options)
         self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        if config.block_requests:
+            try:
+                self.network_policy = NetworkPolicy.from_config()
+                apply_network_policy(self.driver, self.network_policy)
+                print(f"🚫 Blocking {len(self.network_policy.urls())} URL patterns "
+                      f"({', '.join(self.network_policy.patterns)})")
+            except Exception as e:
+                print(f"⚠️ Could not apply network policy: {e}")
+                self.network_policy = None
         
         self.wait = WebDriverWait(self.driver, config.browser_timeout)
         print("✅ Browser initialized")
@@ -70,6 +106,8 @@ class WorkdayAgent:
         from src.resume_parser import ResumeParser
         parser = ResumeParser(self.llm_client)
         self.resume_data = parser.parse_resume(resume_path)
+        self.profile = load_or_compile_profile(resume_path, self.resume_data)
+        self._reset_mapping_session()
         print(f"✅ Resume loaded: {self.resume_data.name}")
         return self.resume_data
     
@@ -78,6 +116,7 @@ class WorkdayAgent:
         from src.resume_parser import ResumeParser
         parser = ResumeParser(self.llm_client)
         self.resume_data = parser.parse_resume(resume_path)
+        self._reset_mapping_session()
         
         # Enhanced parsing to extract more fields
         if not self.resume_data.name and self.resume_data.raw_text:
@@ -88,6 +127,7 @@ class WorkdayAgent:
                 if len(line.split()) >= 2 and not '@' in line and not any(char.isdigit() for char in line):
                     self.resume_data.name = line
                     break
+        self.profile = load_or_compile_profile(resume_path, self.resume_data)
         
         print(f"✅ Comprehensive resume parsing completed")
         print(f"📋 Extracted: Name: {self.resume_data.name}, Email: {self.resume_data.email}, Phone: {self.resume_data.phone}")
@@ -97,6 +137,9 @@ class WorkdayAgent:
     
     def handle_account_creation(self) -> bool:
         """Create account with email from resume, or ask for password if exists"""
+        if self.session_valid:
+            print("🔑 Already signed in from the saved session, skipping account handling")
+            return True
         try:
             email = self.resume_data.email
             print(f"👤 Attempting account creation/login with: {email}")
@@ -164,6 +207,7 @@ class WorkdayAgent:
                                             login_btn.click()
                                             time.sleep(3)
                                             break
+                                    self._save_session()
                                 
                                 return True
                     except Exception as e:
@@ -196,54 +240,7 @@ class WorkdayAgent:
     
     def upload_resume_priority(self, resume_path: str) -> bool:
         """Upload resume with priority - comprehensive search"""
-        try:
-            print("📎 Searching for resume upload fields...")
-            
-            # Comprehensive file upload selectors
-            file_selectors = [
-                "input[type='file']",
-                "input[accept*='.pdf']",
-                "input[accept*='.doc']",
-                "input[name*='resume']",
-                "input[name*='cv']",
-                "input[id*='resume']",
-                "input[id*='cv']",
-                "input[id*='upload']",
-                "input[class*='upload']"
-            ]
-            
-            uploaded = False
-            for selector in file_selectors:
-                try:
-                    file_inputs = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for file_input in file_inputs:
-                        try:
-                            if file_input.is_enabled():
-                                label = self._get_field_label(file_input)
-                                print(f"📎 Found upload field: {label}")
-                                
-                                # Upload the file
-                                file_input.send_keys(os.path.abspath(resume_path))
-                                print(f"✅ Resume uploaded successfully to: {label}")
-                                uploaded = True
-                                time.sleep(2)
-                                break
-                        except Exception as e:
-                            print(f"⚠️ Upload attempt failed: {e}")
-                            continue
-                    if uploaded:
-                        break
-                except:
-                    continue
-            
-            if not uploaded:
-                print("⚠️ No file upload fields found")
-            
-            return uploaded
-            
-        except Exception as e:
-            print(f"❌ Resume upload failed: {e}")
-            return False
+        return self.upload_resume_comprehensive(resume_path)
     
     def _handle_alerts(self):
         """Handle JavaScript alerts, including success messages"""
@@ -262,38 +259,28 @@ class WorkdayAgent:
             # No alert present, continue normally
             pass
     
-    def detect_all_form_fields(self) -> List[WorkdayField]:
-        """Detect ALL form fields comprehensively"""
+    def detect_all_form_fields(self, prepared: bool = False) -> List[WorkdayField]:
+        """Detect ALL form fields comprehensively
+        
+        Pass `prepared=True` when `_prepare_page` already ran for this page.
+        """
         fields = []
         
-        # Handle any success alerts first
-        self._handle_alerts()
+        if not prepared:
+            self._prepare_page()
+        
+        cached_fields = self._load_page_layout()
+        if cached_fields is not None:
+            return cached_fields
+        self.block_values = block_field_values(self.driver, self.resume_data) if self.resume_data else {}
         
         print("🔍 Comprehensive form field detection...")
         self.take_screenshot("comprehensive_form_analysis")
         
-        # Enhanced selectors for all possible form elements
-        all_selectors = [
-            ("input[type='text']", "text"),
-            ("input[type='email']", "email"),
-            ("input[type='tel']", "tel"),
-            ("input[type='number']", "number"),
-            ("input[type='date']", "date"),
-            ("input[type='url']", "url"),
-            ("input[not(@type)]", "text"),  # inputs without type
-            ("textarea", "textarea"),
-            ("select", "select"),
-            ("input[type='radio']", "radio"),
-            ("input[type='checkbox']", "checkbox")
-        ]
-        
-        for selector, field_type in all_selectors:
+        elements_found = []
+        for selector, field_type in FIELD_SELECTORS:
             try:
-                if selector.startswith("input[not"):
-                    # XPath for inputs without type attribute
-                    elements = self.driver.find_elements(By.XPATH, "//input[not(@type) or @type='']")
-                else:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
                 
                 for element in elements:
                     try:
@@ -305,16 +292,22 @@ class WorkdayAgent:
                         if element.get_attribute("type") == "file":
                             continue
                         
+                        # Segmented dates are one field, filled from the month segment
+                        automation_id = element.get_attribute("data-automation-id") or ""
+                        if automation_id in SKIPPED_SEGMENTS:
+                            continue
+                        
                         label = self._get_field_label(element)
                         xpath = self._get_element_xpath(element)
                         
                         if label and xpath:
                             field = WorkdayField(
                                 label=label,
-                                field_type=field_type,
+                                field_type="date" if automation_id == DATE_MONTH_SEGMENT else field_type,
                                 xpath=xpath
                             )
                             fields.append(field)
+                            elements_found.append(element)
                             
                     except Exception as e:
                         continue
@@ -323,248 +316,358 @@ class WorkdayAgent:
                 print(f"Error detecting {field_type} fields: {e}")
                 continue
         
+        for field, section in zip(fields, self._get_field_sections(elements_found)):
+            field.section = section
+        
         print(f"🔍 Detected {len(fields)} total form fields")
         return fields
     
-    def map_all_resume_data_to_fields(self, fields: List[WorkdayField]) -> List[WorkdayField]:
-        """Intelligent LLM-powered field mapping with smart completion"""
+    def map_all_resume_data_to_fields(self, fields: List[WorkdayField],
+                                      on_mapped: Callable[[List[WorkdayField]], None] = None) -> List[WorkdayField]:
+        """Intelligent LLM-powered field mapping with smart completion
+        
+        `on_mapped` is called with each chunk's fields as soon as it is mapped.
+        """
         if not self.resume_data:
             return fields
         
         print("🧠 Intelligent LLM-powered field mapping...")
         
-        # Create comprehensive context for LLM
-        resume_context = {
-            "name": self.resume_data.name or "",
-            "email": self.resume_data.email or "",
-            "phone": self.resume_data.phone or "",
-            "address": self.resume_data.address or "",
-            "summary": self.resume_data.summary or "",
-            "skills": self.resume_data.skills or [],
-            "experience": self.resume_data.experience or [],
-            "education": self.resume_data.education or []
-        }
-        
-        # Group fields for batch processing
-        field_info = []
-        for i, field in enumerate(fields):
-            field_info.append({
-                "index": i,
-                "label": field.label,
-                "type": field.field_type
-            })
-        
-        # Use LLM for COMPLETE job application field mapping
-        mapping_prompt = f"""
-You are an expert job application assistant. Fill out ALL job application fields intelligently using the resume data.
-
-RESUME DATA:
-{json.dumps(resume_context, indent=2)}
-
-FORM FIELDS TO FILL:
-{json.dumps(field_info, indent=2)}
-
-COMPLETE JOB APPLICATION FIELD HANDLING:
-
-🔹 1. PERSONAL INFORMATION:
-   - First Name: Extract from full name
-   - Middle Name: Extract if available, otherwise leave blank
-   - Last Name: Extract from full name
-   - Preferred Name: Same as first name unless specified
-   - Phone Number: From resume with proper formatting
-   - Email Address: From resume
-   - Country of Residence: "United States" for US addresses
-   - Home Address: Parse into Street, City, State/Province, Zip/Postal Code
-   - If "Santa Clara, CA": Street="[infer]", City="Santa Clara", State="California", Zip="95050"
-
-🔹 2. CANDIDATE PROFILE:
-   - Preferred Language: "English"
-   - Desired Work Location: Based on current address or "Remote/Hybrid"
-   - Willingness to Relocate: "Yes" or "Open to discussion"
-   - Employment Type: "Full-time" (default)
-   - Available Start Date: "Immediately" or "Two weeks notice"
-   - Salary Expectations: "Competitive" or "Negotiable"
-   - Work Authorization: "Yes" (for US addresses)
-   - Sponsorship Requirement: "No" (for US citizens)
-
-🔹 3. RESUME/CV UPLOAD:
-   - Upload Resume: [File upload handled separately]
-   - Cover Letter: "Available upon request"
-   - LinkedIn Profile: Generate if not available: "linkedin.com/in/[firstname-lastname]"
-   - Portfolio/Website: Leave blank unless specified
-   - GitHub/Behance: Leave blank unless specified
-
-🔹 4. EDUCATION:
-   - School Name: From education data
-   - Degree Type: "Bachelor's", "Master's", "PhD", etc.
-   - Field of Study: From education data
-   - GPA: Leave blank unless specified
-   - Start & End Dates: From education data or estimate
-   - Graduated: "Yes" for completed degrees
-
-🔹 5. WORK EXPERIENCE:
-   - Employer Name: From experience data
-   - Job Title: From experience data
-   - Location: City, State, Country from experience
-   - Start & End Dates: MM/YYYY format
-   - Responsibilities: From experience descriptions
-   - Reason for Leaving: "Career advancement" or "New opportunities"
-
-🔹 6. CERTIFICATIONS/LICENSES:
-   - Certification Name: From resume if available
-   - Issuing Organization: From resume if available
-   - Issue Date: From resume or leave blank
-   - Expiration Date: Leave blank unless specified
-
-🔹 7. SKILLS:
-   - Languages: "English (Native)" + others from resume
-   - Software Tools: From skills data
-   - Technical Skills: From skills data
-   - Other Competencies: From skills data
-
-🔹 8. SCREENING QUESTIONS:
-   - Work Authorization: "Yes" (for US)
-   - Previous Employment: "No" (unless specified)
-   - Non-compete Agreements: "No" (default)
-   - Technology Experience: "Yes" if relevant skills match
-   - Travel Willingness: "Yes, up to 25%" (reasonable default)
-
-🔹 9. VOLUNTARY DISCLOSURES (EEO):
-   - Gender: "Prefer not to disclose"
-   - Race/Ethnicity: "Prefer not to disclose"
-   - Veteran Status: "Not a veteran"
-   - Disability Status: "No disability"
-
-🔹 10. ACKNOWLEDGMENT & CONSENT:
-   - Terms & Conditions: "Yes" or "I agree"
-   - Background Check: "Yes" or "I consent"
-   - Drug Test Policy: "Yes" or "I acknowledge"
-   - Information Accuracy: "Yes" or "I certify"
-
-SMART FIELD MATCHING:
-- Match field labels intelligently (case-insensitive, partial matching)
-- For dropdowns: provide most appropriate option
-- For radio buttons: select based on context
-- For checkboxes: check based on typical professional responses
-- For text areas: generate professional, relevant responses
-
-Return ONLY a JSON object mapping field indices to appropriate values:
-{{
-  "0": "value for field 0",
-  "1": "value for field 1",
-  ...
-}}
-"""
-        
-        try:
-            print("🤖 Asking LLM to intelligently fill form fields...")
-            response = self.llm_client.generate_response(mapping_prompt, max_length=2000)
-            
-            # Extract JSON from response
-            json_start = response.find('{')
-            json_end = response.rfind('}') + 1
-            
-            if json_start != -1 and json_end != -1:
-                json_str = response[json_start:json_end]
-                mappings = json.loads(json_str)
+        # Profile lookups first; only the rest costs LLM context
+        all_fields, answered, fields = fields, [], []
+        for field in all_fields:
+            resolved = field.cached or self._apply_profile_value(field) or self._apply_essay(field)
+            (answered if resolved else fields).append(field)
+        if answered:
+            print(f"📇 {len(answered)} fields answered from the candidate profile, layout cache and prepared essays")
+            if on_mapped:
+                on_mapped(answered)
+        
+        # Token-bounded chunks grouped by section, so one truncated answer
+        # only costs its own chunk
+        chunks = self.prompt_builder.chunk_fields(fields, config.mapping_chunk_tokens)
+        if len(chunks) > 1:
+            print(f"🧩 Mapping {len(fields)} fields in {len(chunks)} parallel chunks")
+        
+        print("🤖 Asking LLM to intelligently fill form fields...")
+        if self._session_mode() and chunks:
+            self._get_mapping_session()  # Create once before fanning out
+        with ThreadPoolExecutor(max_workers=min(config.llm_max_workers, len(chunks)) or 1) as executor:
+            futures = {executor.submit(self._map_field_chunk, fields, indices): indices for indices in chunks}
+            for future in as_completed(futures):
+                indices = futures[future]
+                try:
+                    mappings = future.result()
+                except Exception as e:
+                    print(f"⚠️ LLM mapping failed for {len(indices)} fields: {e}, using fallback mapping")
+                    mappings = None
+                    self._enhanced_basic_mapping([fields[i] for i in indices])
                 
                 # Apply LLM mappings to fields
-                for i, field in enumerate(fields):
-                    field_value = mappings.get(str(i), "")
-                    if field_value and field_value.strip():
-                        field.value = field_value.strip()
-                        print(f"🧠 LLM mapped: {field.label} = {field.value}")
+                if mappings is not None:
+                    for i in indices:
+                        field_value = mappings.get(str(i), "")
+                        if isinstance(field_value, str) and field_value.strip():
+                            fields[i].value = field_value.strip()
+                            print(f"🧠 LLM mapped: {fields[i].label} = {fields[i].value}")
                 
-                mapped_count = len([f for f in fields if f.value])
-                print(f"✅ LLM intelligently mapped {mapped_count} fields")
-                return fields
-            
-        except Exception as e:
-            print(f"⚠️ LLM mapping failed: {e}, using fallback mapping")
+                if on_mapped:
+                    on_mapped([fields[i] for i in indices])
         
-        # Fallback to enhanced basic mapping
-        return self._enhanced_basic_mapping(fields)
+        mapped_count = len([f for f in all_fields if f.value])
+        print(f"✅ LLM intelligently mapped {mapped_count} fields")
+        return all_fields
+    
+    def _map_field_chunk(self, fields: List[WorkdayField], indices: List[int]) -> Dict[str, Any]:
+        """Map one chunk of fields, returning the LLM's index -> value object"""
+        chunk = [fields[i] for i in indices]
+        # Structured output constrains the answer to this chunk's indices
+        schema = self.prompt_builder.mapping_schema(indices)
+        
+        if self._session_mode():
+            session = self._get_mapping_session()
+            body = self.prompt_builder.build_fields(chunk, indices)
+            print(f"📏 Mapping prompt ~{estimate_tokens(body)} tokens (resume and instructions primed in session)")
+            mappings = session.generate_json(body, schema=schema, max_length=2000, temperature=0)
+        else:
+            # Compact prompt: static instructions as a reusable prefix, page data minified
+            prompt = self.prompt_builder.build(self.resume_data, chunk, indices, job=self.job,
+                                              profile=self._get_profile())
+            print(f"📏 Mapping prompt ~{prompt.total_tokens} tokens "
+                  f"(static prefix ~{prompt.prefix_tokens}, page ~{prompt.body_tokens}, "
+                  f"sections: {', '.join(prompt.sections)})")
+            mappings = self.llm_client.generate_json(prompt.body, schema=schema, max_length=2000,
+                                                     temperature=0, system=prompt.prefix)
+        
+        if not isinstance(mappings, dict):
+            raise ValueError("LLM response is not a JSON object")
+        return mappings
+    
+    def _session_mode(self) -> bool:
+        """Prime a session only when the backend keeps its context server side"""
+        # Stateless backends would resend the primer with every chunk; per-chunk
+        # prompts carry just the profile sections those fields need
+        return config.llm_session_mode and getattr(self.llm_client, "keeps_context", False)
+    
+    def _get_mapping_session(self):
+        """Mapping session primed once with resume and instructions per application"""
+        if self.llm_session is None:
+            primer = self.prompt_builder.build_primer(self.resume_data, job=self.job, profile=self._get_profile())
+            print(f"🧩 Priming LLM session (~{estimate_tokens(self.prompt_builder.prefix + primer)} tokens)")
+            self.llm_session = self.llm_client.start_session(system=self.prompt_builder.prefix, primer=primer)
+        return self.llm_session
+    
+    def _reset_mapping_session(self):
+        """Drop the primed session, e.g. when a different resume is loaded"""
+        if self.llm_session:
+            self.llm_session.close()
+        self.llm_session = None
+    
+    def _get_profile(self) -> Optional[CandidateProfile]:
+        """Candidate profile, compiled on demand when resume data was set directly"""
+        if self.profile is None and self.resume_data:
+            self.profile = compile_profile(self.resume_data)
+        return self.profile
+    
+    def _apply_profile_value(self, field: WorkdayField) -> bool:
+        """Fill field.value from the candidate profile; True when it was answered"""
+        if field.xpath in self.block_values:
+            # The resume entry for this block decides, even when it has no answer
+            field.value = self.block_values[field.xpath]
+            return True
+        value = resolve_field_locally(field.label, field.field_type, self._get_profile())
+        if value:
+            field.value = value
+        return bool(value)
+    
+    def _expand_repeatable_sections(self):
+        """One experience/education block per resume entry, added before the page is read"""
+        self.block_values = {}
+        if self.resume_data:
+            expand_sections(self.driver, self.resume_data)
+    
+    def _prepare_page(self):
+        """Dismiss alerts, expand repeatable sections and read the layout, once per page"""
+        # Handle any success alerts first
+        self._handle_alerts()
+        self._expand_repeatable_sections()
+        self.page_layout, self.page_layout_cached = read_page_layout(self.driver), False
+    
+    def _load_page_layout(self) -> Optional[List[WorkdayField]]:
+        """Fields of a tenant page seen before, or None to detect and map from scratch"""
+        if self.layouts is None or self.page_layout is None:
+            return None
+        candidate = self.layouts.candidate_key(self._get_profile())
+        stored = self.layouts.load(self.page_layout, candidate)
+        if stored is None:
+            return None
+        labels = read_labels(self.driver, [record["xpath"] for record in stored])
+        if labels is None:
+            return None
+        if changed_labels(stored, labels):
+            # Same structure, different questions: the stored answers belong to another posting
+            print(f"🗂️ Cached layout for {self.page_layout.host} has different questions, detecting it live")
+            self.layouts.invalidate(self.page_layout, candidate)
+            return None
+        
+        fields = self._fields_from_records(stored)
+        self.page_layout_cached = True
+        print(f"🗂️ Known {self.page_layout.host} page layout: {len(fields)} fields from the layout cache, "
+              f"{len([f for f in fields if f.cached])} already resolved")
+        return fields
+    
+    def _save_page_layout(self, fields: List[WorkdayField]):
+        """Remember this page's fields and answers, or drop a cached layout that no longer fits"""
+        if self.layouts is None or self.page_layout is None or not fields:
+            return
+        candidate = self.layouts.candidate_key(self._get_profile())
+        if self.page_layout_cached:
+            # A cached locator that no longer resolves means the layout changed under the same fingerprint
+            if any(field.cached and field.value and not field.filled for field in fields):
+                print(f"🗂️ Cached layout for {self.page_layout.host} is stale, it will be re-detected next time")
+                self.layouts.invalidate(self.page_layout, candidate)
+            return
+        if not any(field.value for field in fields):
+            return  # Mapping failed; nothing worth reusing
+        self.layouts.save(self.page_layout, candidate, self._field_records(fields))
+    
+    def _field_records(self, fields: List[WorkdayField]) -> List[Dict[str, Any]]:
+        """Fields with their answers as reusable records for layout caches and fill plans"""
+        job_values = [value.lower() for value in (self.job.title, self.job.requisition_id) if value] if self.job else []
+        records = []
+        for field in fields:
+            # Essays and answers naming this posting are regenerated for the next one
+            resolved = field.field_type != "textarea" and not any(
+                value in field.value.lower() for value in job_values)
+            records.append({"label": field.label, "field_type": field.field_type, "xpath": field.xpath,
+                            "section": field.section, "value": field.value if resolved else "",
+                            "resolved": resolved})
+        return records
+    
+    def _fields_from_records(self, records: List[Dict[str, Any]]) -> List[WorkdayField]:
+        return [WorkdayField(label=item["label"], field_type=item["field_type"], xpath=item["xpath"],
+                             section=item.get("section", ""), value=item.get("value", ""),
+                             cached=item.get("resolved", False))
+                for item in records]
+    
+    def _replay_step_fields(self, step: Optional[PlanStep]) -> Optional[List[WorkdayField]]:
+        """The plan's fields when the page (read by `_prepare_page`) still has the recorded layout, else None"""
+        if step is None:
+            return None
+        layout = self.page_layout
+        if layout is None or layout.fingerprint != step.fingerprint:
+            print("🗺️ Page differs from the fill plan, detecting it live")
+            return None
+        labels = read_labels(self.driver, [record["xpath"] for record in step.fields])
+        if labels is None:
+            return None
+        # Filled like a layout cache hit, so a stale locator is reported the same way
+        self.page_layout_cached = True
+        fields = self._fields_from_records(step.fields)
+        changed = changed_labels(step.fields, labels)
+        for i in changed:
+            # A different question at the recorded locator is mapped live
+            fields[i].label, fields[i].value, fields[i].cached = labels[i], "", False
+        print(f"🗺️ Page matches the fill plan: {len(fields)} fields, "
+              f"{len([f for f in fields if f.cached])} already resolved"
+              + (f", {len(changed)} relabeled" if changed else ""))
+        return fields
+    
+    def _open_journal(self, workday_url: str, resume_path: str) -> JournalState:
+        """Open this application's journal and return what an interrupted run already finished"""
+        self.journal = None
+        if not config.journal_enabled:
+            return JournalState()
+        try:
+            self.journal = ApplicationJournal(workday_url, resume_path)
+            state = self.journal.state()
+        except Exception as e:
+            print(f"⚠️ Checkpoint journal unavailable: {e}")
+            self.journal = None
+            return JournalState()
+        if state.completed:
+            # The last run finished, so this is a new attempt
+            self.journal.reset()
+            return JournalState()
+        if state.resume:
+            print(f"📓 Resuming interrupted application: {len(state.pages)} pages mapped, "
+                  f"resume {'uploaded' if state.uploaded else 'not uploaded'}, reached page {state.last_page or 1}")
+        return state
+    
+    def _record(self, step: str, **data):
+        """Journal a finished step; journal errors never stop the application"""
+        if self.journal is None:
+            return
+        try:
+            self.journal.record(step, **data)
+        except Exception as e:
+            print(f"⚠️ Could not write checkpoint journal: {e}")
+    
+    def _use_journaled_resume(self, resume_path: str, data: Dict[str, Any]):
+        """Take the parsed resume from the journal instead of parsing it again"""
+        self.resume_data = ParsedResume(**data)
+        self._reset_mapping_session()
+        self.profile = load_or_compile_profile(resume_path, self.resume_data)
+        print(f"📓 Resume restored from checkpoint: {self.resume_data.name}")
+    
+    def _journaled_page_fields(self, state: JournalState) -> Optional[List[WorkdayField]]:
+        """Fields mapped by the interrupted run, when this page (read by `_prepare_page`) has a layout it mapped"""
+        if not state.pages:
+            return None
+        layout = self.page_layout
+        entry = state.mapped_page(layout.fingerprint) if layout else None
+        if entry is None:
+            return None
+        self.page_layout_cached = True
+        fields = self._fields_from_records(entry["fields"])
+        print(f"📓 Page mapped before the interruption: {len(fields)} fields, "
+              f"{len([f for f in fields if f.cached])} resolved")
+        return fields
+    
+    def _follow_plan_navigation(self, navigation: Dict[str, str]) -> bool:
+        """Click the recorded next button, falling back to searching for one"""
+        xpath = navigation.get("xpath")
+        if xpath:
+            try:
+                element = self.driver.find_element(By.XPATH, xpath)
+                if element.is_displayed() and element.is_enabled():
+                    self._robust_click(element)
+                    time.sleep(3)  # Wait for page transition
+                    if self._verify_page_change():
+                        print("✅ Moved to the next page as recorded in the fill plan")
+                        self.last_next_xpath = xpath
+                        return True
+            except Exception as e:
+                print(f"⚠️ Recorded next button not usable: {e}")
+        return self.go_to_next_page()
+    
+    def _start_essays(self, workday_url: str):
+        """Set up essays; a posting seen before starts the common ones while the browser starts"""
+        # A posting seen before is known exactly; otherwise guess from the URL for mapping prompts
+        # and start essays once `_load_job_posting` reads the real posting, not for the guess
+        cached = load_cached_posting(workday_url)
+        if cached is None:
+            company, position = guess_company_and_position(workday_url)
+        self.job = cached or JobPosting(url=workday_url, company=company, title=position)
+        if self.essays:
+            self.essays.stop()
+        self.essays = EssayService(self.llm_client, self.resume_data, self._get_profile())
+        if cached:
+            self.essays.start(self.job)
+    
+    def _apply_essay(self, field: WorkdayField, timeout: float = 0) -> bool:
+        """Fill an essay-style textarea from the background essays; True when answered"""
+        if field.field_type != "textarea" or self.essays is None:
+            return False
+        answer = self.essays.answer_for_label(field.label, timeout=timeout)
+        if answer:
+            field.value = answer
+            print(f"✍️ Essay answer used for: {field.label}")
+        return bool(answer)
+    
+    def _split_essay_fields(self, fields: List[WorkdayField]) -> Tuple[List[WorkdayField], List[WorkdayField]]:
+        """Start essays for the page's open textareas; returns (essay fields, everything else)"""
+        open_textareas = [f for f in fields if f.field_type == "textarea" and not f.value and not f.cached]
+        if self.essays is None or not open_textareas:
+            return [], fields
+        labels = set(self.essays.prepare([f.label for f in open_textareas]))
+        essay_fields = [f for f in open_textareas if f.label in labels]
+        essay_ids = {id(f) for f in essay_fields}
+        return essay_fields, [f for f in fields if id(f) not in essay_ids]
+    
+    def _fill_essay_fields(self, fields: List[WorkdayField]) -> int:
+        """Fill essay textareas once the rest of the page is done, waiting for their answers"""
+        if not fields:
+            return 0
+        deadline = time.time() + config.essay_wait_seconds
+        missing = [f for f in fields if not self._apply_essay(f, timeout=max(0.0, deadline - time.time()))]
+        if missing:
+            # Essays that failed or ran late go through regular field mapping
+            self.map_all_resume_data_to_fields(missing)
+        filled_count = len([f for f in fields if self._fill_single_field(f)])
+        print(f"✅ Filled {filled_count} essay fields")
+        return filled_count
     
     def _enhanced_basic_mapping(self, fields: List[WorkdayField]) -> List[WorkdayField]:
         """Enhanced fallback mapping with smart inference"""
         print("🔄 Using enhanced fallback mapping...")
-        
-        # Extract location components from address
-        address = self.resume_data.address or ""
-        city, state, zip_code, country = self._parse_address_components(address)
+        profile = self._get_profile()
         
         for field in fields:
+            if self._apply_profile_value(field):
+                continue
             label_lower = field.label.lower()
             
-            # Enhanced name handling
-            if any(keyword in label_lower for keyword in ["first name", "given name"]):
-                if self.resume_data.name:
-                    field.value = self.resume_data.name.split()[0] if self.resume_data.name.split() else ""
-            elif any(keyword in label_lower for keyword in ["last name", "family name", "surname"]):
-                if self.resume_data.name:
-                    parts = self.resume_data.name.split()
-                    field.value = parts[-1] if len(parts) > 1 else ""
-            elif any(keyword in label_lower for keyword in ["full name", "name", "candidate name"]):
-                field.value = self.resume_data.name or ""
-            
-            # Enhanced location handling
-            elif any(keyword in label_lower for keyword in ["city"]):
-                field.value = city
-            elif any(keyword in label_lower for keyword in ["state", "province"]):
-                field.value = state
-            elif any(keyword in label_lower for keyword in ["zip", "postal", "postal code", "zip code"]):
-                field.value = zip_code
-            elif any(keyword in label_lower for keyword in ["country"]):
-                field.value = country or "United States"
-            elif any(keyword in label_lower for keyword in ["address", "street"]):
-                field.value = address
-            
-            # Contact fields
-            elif any(keyword in label_lower for keyword in ["email", "e-mail"]):
-                field.value = self.resume_data.email or ""
-            elif any(keyword in label_lower for keyword in ["phone", "telephone", "mobile", "cell"]):
-                field.value = self.resume_data.phone or ""
-            
             # Professional fields
-            elif any(keyword in label_lower for keyword in ["summary", "objective", "about"]):
-                field.value = self.resume_data.summary or ""
+            if any(keyword in label_lower for keyword in ["summary", "objective", "about"]):
+                field.value = profile.summary
             elif any(keyword in label_lower for keyword in ["skills", "technical skills"]):
-                field.value = ", ".join(self.resume_data.skills) if self.resume_data.skills else ""
+                field.value = profile.skills
         
         mapped_count = len([f for f in fields if f.value])
         print(f"✅ Enhanced mapping completed: {mapped_count} fields")
         return fields
     
-    def _parse_address_components(self, address: str) -> tuple:
-        """Parse address into city, state, zip, country components"""
-        if not address:
-            return "", "", "", "United States"
-        
-        # Common patterns for US addresses
-        city, state, zip_code, country = "", "", "", "United States"
-        
-        # Handle "Santa Clara, CA" format
-        if "Santa Clara" in address:
-            city = "Santa Clara"
-            state = "California"
-            zip_code = "95050"  # Common Santa Clara zip
-        elif "San Francisco" in address:
-            city = "San Francisco"
-            state = "California"
-            zip_code = "94102"  # Common SF zip
-        elif "," in address:
-            # Try to parse "City, State" format
-            parts = address.split(",")
-            if len(parts) >= 2:
-                city = parts[0].strip()
-                state_part = parts[1].strip()
-                if len(state_part) == 2:  # State abbreviation
-                    state = state_part
-                else:
-                    state = state_part
-        
-        return city, state, zip_code, country
-    
     def fill_all_form_fields(self, fields: List[WorkdayField]) -> int:
         """Fill ALL form fields with enhanced error handling"""
         filled_count = 0
@@ -572,58 +675,121 @@ Return ONLY a JSON object mapping field indices to appropriate values:
         print("📝 Filling all form fields comprehensively...")
         
         for field in fields:
-            if not field.value or field.filled:
-                continue
+            if self._fill_single_field(field):
+                filled_count += 1
+        
+        print(f"✅ Successfully filled {filled_count} fields")
+        self.take_screenshot("all_fields_filled")
+        return filled_count
+    
+    def fill_page_pipelined(self, fields: List[WorkdayField]) -> int:
+        """Fill a page while the LLM is still mapping it.
+        
+        Fields answerable from resume data alone are queued for filling right
+        away; LLM-mapped chunks join the same queue as they arrive, so browser
+        and model time overlap.
+        """
+        fill_queue = queue.Queue()
+        llm_fields = []
+        for field in fields:
+            if field.cached or self._apply_profile_value(field):
+                fill_queue.put(field)
+            else:
+                llm_fields.append(field)
+        print(f"⚡ {len(fields) - len(llm_fields)} fields answered from the candidate profile and layout cache, "
+              f"{len(llm_fields)} sent to LLM")
+        
+        def enqueue(batch: List[WorkdayField]):
+            for field in batch:
+                fill_queue.put(field)
+        
+        def produce():
+            try:
+                if llm_fields:
+                    self.map_all_resume_data_to_fields(llm_fields, on_mapped=enqueue)
+            except Exception as e:
+                print(f"⚠️ LLM mapping failed: {e}")
+            finally:
+                fill_queue.put(None)
+        
+        producer = threading.Thread(target=produce, name="llm-mapping", daemon=True)
+        producer.start()
+        
+        # Only this thread touches the browser
+        filled_count = 0
+        while True:
+            field = fill_queue.get()
+            if field is None:
+                break
+            if self._fill_single_field(field):
+                filled_count += 1
+        producer.join()
+        
+        print(f"✅ Successfully filled {filled_count} fields")
+        self.take_screenshot("all_fields_filled")
+        return filled_count
+    
+    def _fill_single_field(self, field: WorkdayField) -> bool:
+        """Locate and fill one field; returns True when it was filled"""
+        if not field.value or field.filled:
+            return False
+        
+        try:
+            print(f"📝 Filling: {field.label} = {field.value[:50]}...")
             
+            # Find element with multiple strategies
+            element = None
             try:
-                print(f"📝 Filling: {field.label} = {field.value[:50]}...")
-                
-                # Find element with multiple strategies
-                element = None
+                element = self.wait.until(EC.presence_of_element_located((By.XPATH, field.xpath)))
+            except:
+                # Fallback: try to find by other attributes
                 try:
-                    element = self.wait.until(EC.presence_of_element_located((By.XPATH, field.xpath)))
+                    element = self.driver.find_element(By.XPATH, field.xpath)
                 except:
-                    # Fallback: try to find by other attributes
-                    try:
-                        element = self.driver.find_element(By.XPATH, field.xpath)
-                    except:
-                        print(f"⚠️ Could not locate field: {field.label}")
-                        continue
+                    print(f"⚠️ Could not locate field: {field.label}")
+                    return False
+            
+            if not element:
+                return False
+            
+            # Scroll to element
+            self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", element)
+            time.sleep(1)
+            
+            # Custom Workday widgets have their own direct routine
+            widget = None
+            if may_be_widget(field.field_type, field.xpath):
+                widget = find_widget_adapter(self.driver, element)
+            if widget:
+                adapter, info = widget
+                print(f"🧩 Using {adapter.name} widget adapter")
+                if not adapter.set_value(self.driver, element, field.value, info):
+                    print(f"⚠️ Could not set {adapter.name} widget: {field.label}")
+                    return False
+            
+            # Fill based on field type with enhanced methods
+            elif field.field_type in ["text", "email", "tel", "number", "url", "date"]:
+                self._fill_text_field(element, field.value)
                 
-                if not element:
-                    continue
+            elif field.field_type == "textarea":
+                self._fill_textarea_field(element, field.value)
                 
-                # Scroll to element
-                self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", element)
-                time.sleep(1)
+            elif field.field_type == "select":
+                self._fill_select_field(element, field.value)
                 
-                # Fill based on field type with enhanced methods
-                if field.field_type in ["text", "email", "tel", "number", "url", "date"]:
-                    self._fill_text_field(element, field.value)
-                    
-                elif field.field_type == "textarea":
-                    self._fill_textarea_field(element, field.value)
-                    
-                elif field.field_type == "select":
-                    self._fill_select_field(element, field.value)
-                    
-                elif field.field_type == "radio":
-                    self._fill_radio_field(element, field.value)
-                    
-                elif field.field_type == "checkbox":
-                    self._fill_checkbox_field(element, field.value)
-                
-                field.filled = True
-                filled_count += 1
-                time.sleep(config.action_delay)
+            elif field.field_type == "radio":
+                self._fill_radio_field(element, field.value)
                 
-            except Exception as e:
-                print(f"❌ Error filling {field.label}: {e}")
-                continue
-        
-        print(f"✅ Successfully filled {filled_count} fields")
-        self.take_screenshot("all_fields_filled")
-        return filled_count
+            elif field.field_type == "checkbox":
+                self._fill_checkbox_field(element, field.value)
+            
+            field.filled = True
+            time.sleep(config.action_delay)
+            return True
+            
+        except Exception as e:
+            print(f"❌ Error filling {field.label}: {e}")
+            return False
     
     def _fill_text_field(self, element, value: str):
         """Enhanced text field filling"""
@@ -631,15 +797,8 @@ Return ONLY a JSON object mapping field indices to appropriate values:
             # Multiple click strategies
             self._robust_click(element)
             
-            # Clear field
-            element.clear()
-            time.sleep(0.2)
-            
-            # Type value
-            element.send_keys(value)
-            
-            # Trigger change event
-            self.driver.execute_script("arguments[0].dispatchEvent(new Event('change'));", element)
+            # Replace the value; input, key and change events are fired for validators
+            enter_text(self.driver, element, value)
             
         except Exception as e:
             # Fallback: direct value setting
@@ -650,8 +809,7 @@ Return ONLY a JSON object mapping field indices to appropriate values:
         """Enhanced textarea filling"""
         try:
             self._robust_click(element)
-            element.clear()
-            element.send_keys(value)
+            enter_text(self.driver, element, value)
         except:
             self.driver.execute_script("arguments[0].value = arguments[1];", element, value)
     
@@ -891,13 +1049,77 @@ Return ONLY a JSON object mapping field indices to appropriate values:
             self.setup_browser()
         
         print(f"🌐 Navigating to: {workday_url}")
+        restored = self._restore_session(workday_url)
         self.driver.get(workday_url)
         time.sleep(3)
+        self._log_network_stats("Job page")
+        self._load_job_posting(workday_url)
+        if restored:
+            self._check_restored_session(workday_url)
         self.take_screenshot("workday_loaded")
         
         # Handle cookie popups and overlays
         self._handle_popups_and_overlays()
     
+    def _log_network_stats(self, page: str):
+        """Requests and bytes loaded since the last report, and what the policy blocked"""
+        if self.network_policy is None:
+            return
+        print(f"📶 {page}: {collect_network_stats(self.driver, self.network_policy).summary()}")
+    
+    def _restore_session(self, workday_url: str) -> bool:
+        """Install the tenant's saved cookies and localStorage before the first page load"""
+        self.session_valid = False
+        host = urlparse(workday_url).hostname or ""
+        session = self.sessions.load(host) if self.sessions else None
+        if not session:
+            return False
+        try:
+            restore_session(self.driver, host, session)
+        except Exception as e:
+            print(f"⚠️ Could not restore saved session for {host}: {e}")
+            return False
+        print(f"🔑 Restored saved session for {host} ({len(session['cookies'])} cookies)")
+        return True
+    
+    def _check_restored_session(self, workday_url: str):
+        """Keep the restored session only if the loaded page shows it signed in"""
+        state = session_state(self.driver)
+        host = urlparse(workday_url).hostname or ""
+        if state == "signed_in":
+            self.session_valid = True
+            print(f"🔑 Saved session for {host} is still signed in")
+        elif state == "signed_out":
+            print(f"🔑 Saved session for {host} has expired, signing in again")
+            self.sessions.delete(host)
+    
+    def _save_session(self):
+        """Keep this tenant's cookies and localStorage for the next application"""
+        if not self.sessions or not self.driver:
+            return
+        try:
+            url = self.driver.current_url
+            host = urlparse(url).hostname or ""
+            if session_state(self.driver) == "signed_out":
+                return
+            session = capture_session(self.driver, url)
+            if session["cookies"]:
+                self.sessions.save(host, session["cookies"], session["local_storage"])
+                print(f"🔑 Saved session for {host}")
+        except Exception as e:
+            print(f"⚠️ Could not save session: {e}")
+    
+    def _load_job_posting(self, workday_url: str):
+        """Company, title, requisition and description for every later prompt"""
+        self.job = extract_job_posting(self.driver, workday_url)
+        print(f"🏢 Job: {self.job.title or 'unknown title'} at {self.job.company or 'unknown company'}"
+              + (f" ({self.job.requisition_id})" if self.job.requisition_id else "")
+              + (f", {self.job.location}" if self.job.location else ""))
+        # The session primer carries the job line; rebuild it with the real posting
+        self._reset_mapping_session()
+        if self.essays:
+            self.essays.start(self.job)
+    
     def _handle_popups_and_overlays(self):
         """Smart popup handling - avoids settings/navigation buttons"""
         print("🍪 Smart popup detection (avoiding settings)...")
@@ -1076,36 +1298,25 @@ Return ONLY a JSON object mapping field indices to appropriate values:
             if name:
                 return name.replace("_", " ").title()
             
-            return "Unknown Field"
+            return UNKNOWN_LABEL
             
         except Exception:
-            return "Unknown Field"
+            return UNKNOWN_LABEL
+    
+    def _get_field_sections(self, elements: List[Any]) -> List[str]:
+        """Headings of the form sections containing the fields, in one script call"""
+        if not elements:
+            return []
+        try:
+            sections = self.driver.execute_script(FIELD_SECTIONS_SCRIPT, elements) or []
+        except Exception:
+            sections = []
+        return [section or "" for section in sections] if len(sections) == len(elements) else [""] * len(elements)
     
     def _get_element_xpath(self, element) -> str:
         """Generate XPath for an element"""
         try:
-            return self.driver.execute_script("""
-                function getXPath(element) {
-                    if (element.id !== '') {
-                        return "//*[@id='" + element.id + "']";
-                    }
-                    if (element === document.body) {
-                        return '/html/body';
-                    }
-                    var ix = 0;
-                    var siblings = element.parentNode.childNodes;
-                    for (var i = 0; i < siblings.length; i++) {
-                        var sibling = siblings[i];
-                        if (sibling === element) {
-                            return getXPath(element.parentNode) + '/' + element.tagName.toLowerCase() + '[' + (ix + 1) + ']';
-                        }
-                        if (sibling.nodeType === 1 && sibling.tagName === element.tagName) {
-                            ix++;
-                        }
-                    }
-                }
-                return getXPath(arguments[0]);
-            """, element)
+            return self.driver.execute_script(XPATH_FUNCTION + "return getXPath(arguments[0]);", element)
         except Exception:
             return ""
     
@@ -1146,16 +1357,9 @@ Return JSON format:
 """
         
         try:
-            response = self.llm_client.generate_response(mapping_prompt, max_length=1500)
-            
-            # Extract JSON from response
-            json_start = response.find('{')
-            json_end = response.rfind('}') + 1
+            mappings = self.llm_client.generate_json(mapping_prompt, max_length=1500)
             
-            if json_start != -1 and json_end != -1:
-                json_str = response[json_start:json_end]
-                mappings = json.loads(json_str)
-                
+            if isinstance(mappings, dict):
                 # Apply mappings to fields
                 for i, field in enumerate(fields):
                     field_value = mappings.get(str(i), "")
@@ -1265,45 +1469,28 @@ Return JSON format:
                     self.driver.execute_script("arguments[0].dispatchEvent(new Event('change'));", element)
                     return
         
-        # Clear field first
+        # Replaces the current content; one DevTools call unless TEXT_ENTRY=keys
         try:
-            element.clear()
-        except:
-            # If clear fails, select all and delete
-            element.send_keys(Keys.CONTROL + "a")
-            element.send_keys(Keys.DELETE)
-        
-        # Type character by character
-        for char in text:
-            try:
-                element.send_keys(char)
-                time.sleep(config.typing_delay)
-            except:
-                # If typing fails, fall back to JavaScript
-                current_value = self.driver.execute_script("return arguments[0].value;", element)
-                new_value = current_value + char
-                self.driver.execute_script("arguments[0].value = arguments[1];", element, new_value)
+            enter_text(self.driver, element, text)
+        except Exception:
+            # If typing fails, fall back to JavaScript
+            self.driver.execute_script("arguments[0].value = arguments[1];", element, text)
+            self.driver.execute_script("arguments[0].dispatchEvent(new Event('change'));", element)
     
     def handle_file_uploads(self, resume_path: str):
         """Handle resume file upload fields"""
+        self.upload_resume_comprehensive(resume_path)
+    
+    def _save_snapshot(self):
+        """Keep the page HTML for offline detection and mapping experiments (SNAPSHOT_DIR)"""
+        if not config.snapshot_dir:
+            return
         try:
-            # Look for file upload inputs
-            file_inputs = self.driver.find_elements(By.CSS_SELECTOR, "input[type='file']")
-            
-            for file_input in file_inputs:
-                try:
-                    # Check if this looks like a resume upload field
-                    label = self._get_field_label(file_input)
-                    if any(keyword in label.lower() for keyword in ["resume", "cv", "upload", "attach"]):
-                        print(f"📎 Uploading resume to: {label}")
-                        file_input.send_keys(os.path.abspath(resume_path))
-                        time.sleep(2)
-                        break
-                except Exception as e:
-                    print(f"Error with file upload: {e}")
-                    
+            path = save_snapshot(self.driver.page_source, self.driver.current_url, config.snapshot_dir,
+                                 self.page_layout)
+            print(f"🗃️ Page snapshot saved: {path}")
         except Exception as e:
-            print(f"No file upload fields found: {e}")
+            print(f"⚠️ Could not save page snapshot: {e}")
     
     def take_screenshot(self, name: str) -> str:
         """Take screenshot for debugging"""
@@ -1315,20 +1502,39 @@ Return JSON format:
         self.driver.save_screenshot(filename)
         return filename
     
-    def auto_fill_application(self, workday_url: str, resume_path: str) -> Dict[str, Any]:
-        """Complete multi-page application automation"""
+    def auto_fill_application(self, workday_url: str, resume_path: str,
+                              save_plan_path: str = None, replay_plan_path: str = None) -> Dict[str, Any]:
+        """Complete multi-page application automation
+        
+        With `replay_plan_path`, pages matching the recorded fill plan are
+        filled straight from it; only diverging pages are detected and mapped
+        live. A successful run is saved as a fill plan to `save_plan_path`.
+        
+        Finished steps are journaled per application, so rerunning after a
+        crash reuses the parsed resume, the upload and the page mappings.
+        """
         results = {
             "success": False,
             "pages_completed": 0,
             "total_fields_filled": 0,
             "resume_uploaded": False,
+            "pages_replayed": 0,
+            "pages_resumed": 0,
             "errors": []
         }
+        replay = load_plan(replay_plan_path) if replay_plan_path else None
         
         try:
+            journaled = self._open_journal(workday_url, resume_path)
+            
             # Step 1: Parse resume data comprehensively
             print("🔄 Step 1: Parsing resume data...")
-            self.load_resume_comprehensive(resume_path)
+            if journaled.resume:
+                self._use_journaled_resume(resume_path, journaled.resume)
+            else:
+                self.load_resume_comprehensive(resume_path)
+                self._record(RESUME_PARSED, resume=vars(self.resume_data))
+            self._start_essays(workday_url)
             
             # Step 2: Setup browser and navigate
             print("🔄 Step 2: Setting up browser...")
@@ -1341,39 +1547,85 @@ Return JSON format:
             
             # Step 4: Upload resume (PRIORITY)
             print("🔄 Step 4: Uploading resume...")
-            upload_result = self.upload_resume_comprehensive(resume_path)
+            if journaled.uploaded and upload_visible(self.driver, resume_path):
+                print("📓 Resume already uploaded by the interrupted run")
+                upload_result = True
+            else:
+                upload_result = self.upload_resume_comprehensive(resume_path)
+                if upload_result:
+                    self._record(RESUME_UPLOADED)
             results["resume_uploaded"] = upload_result
             
             # Step 5: Multi-page form filling
             print("🔄 Step 5: Starting multi-page form filling...")
             page_count = 0
             total_fields_filled = 0
+            plan = FillPlan(host=urlparse(workday_url).hostname or "", source_url=workday_url)
+            if replay and replay.host and replay.host != plan.host:
+                print(f"⚠️ Fill plan was recorded on {replay.host}, not {plan.host}; pages will not match")
             
             while page_count < 10:  # Safety limit
                 page_count += 1
                 print(f"\n📄 Processing Page {page_count}...")
                 
+                if page_count > 1:
+                    self._log_network_stats(f"Page {page_count}")
+                
                 # Close any popups that might appear on new pages
                 self.close_all_popups()
                 
-                # Detect and fill fields on current page
-                fields = self.detect_all_form_fields()
+                # Detect and fill fields on current page, unless the fill plan already knows it
+                self._prepare_page()
+                step = replay.step(page_count - 1) if replay else None
+                fields = self._replay_step_fields(step)
+                replayed = fields is not None
+                if replayed:
+                    results["pages_replayed"] += 1
+                else:
+                    fields = self._journaled_page_fields(journaled)
+                    if fields is not None:
+                        results["pages_resumed"] += 1
+                    else:
+                        fields = self.detect_all_form_fields(prepared=True)
                 if fields:
                     print(f"🔍 Found {len(fields)} fields on page {page_count}")
-                    mapped_fields = self.map_all_resume_data_to_fields(fields)
-                    filled_count = self.fill_all_form_fields(mapped_fields)
+                    self._save_snapshot()
+                    # Essays generate while the rest of the page is mapped and filled
+                    essay_fields, page_fields = self._split_essay_fields(fields)
+                    if config.pipelined_fill:
+                        filled_count = self.fill_page_pipelined(page_fields)
+                    else:
+                        mapped_fields = self.map_all_resume_data_to_fields(page_fields)
+                        filled_count = self.fill_all_form_fields(mapped_fields)
+                    filled_count += self._fill_essay_fields(essay_fields)
+                    # Mapping sets the values on `fields` themselves
+                    self._record(PAGE_MAPPED, page=page_count, fields=self._field_records(fields),
+                                 fingerprint=self.page_layout.fingerprint if self.page_layout else "")
+                    self._record(PAGE_FILLED, page=page_count, filled=filled_count)
                     total_fields_filled += filled_count
+                    self._save_page_layout(fields)
                     print(f"✅ Filled {filled_count} fields on page {page_count}")
                 else:
                     print(f"ℹ️ No fields found on page {page_count}")
                 
                 # Take screenshot of current page
                 self.take_screenshot(f"page_{page_count}_completed")
+                page_step = PlanStep(fingerprint=self.page_layout.fingerprint if self.page_layout else "",
+                                     fields=self._field_records(fields or []))
+                plan.steps.append(page_step)
                 
                 # Try to go to next page
-                if not self.go_to_next_page():
+                if replayed and step.navigation.get("action") == "done":
+                    page_step.navigation = {"action": "done"}
+                    print(f"🏁 Last page of the fill plan. Completed {page_count} pages.")
+                    break
+                moved = self._follow_plan_navigation(step.navigation) if replayed else self.go_to_next_page()
+                if not moved:
+                    page_step.navigation = {"action": "done"}
                     print(f"🏁 No more pages found. Completed {page_count} pages.")
                     break
+                page_step.navigation = {"action": "next", "xpath": self.last_next_xpath}
+                self._record(NAVIGATED, page=page_count, url=self.driver.current_url)
                 
                 # Wait for page to load
                 time.sleep(3)
@@ -1381,8 +1633,16 @@ Return JSON format:
             results["pages_completed"] = page_count
             results["total_fields_filled"] = total_fields_filled
             results["success"] = True
+            self._record(COMPLETED, pages=page_count, filled=total_fields_filled)
+            self._save_session()
+            if save_plan_path:
+                save_plan(plan, save_plan_path)
             
             print("🎉 Multi-page application automation completed successfully!")
+            if replay:
+                print(f"🗺️ Fill plan replayed on {results['pages_replayed']} of {page_count} pages")
+            if results["pages_resumed"]:
+                print(f"📓 Mappings from the interrupted run reused on {results['pages_resumed']} pages")
             print(f"📊 Summary: Pages: {results['pages_completed']} | Resume: {'✅' if results['resume_uploaded'] else '❌'} | Total Fields: {results['total_fields_filled']}")
             
         except Exception as e:
@@ -1395,6 +1655,21 @@ Return JSON format:
     
     def cleanup(self):
         """Clean up resources"""
+        self._reset_mapping_session()
+        if self.essays:
+            self.essays.stop()
+        cache = getattr(self.llm_client, "cache", None)
+        if cache:
+            stats = cache.stats()
+            print(f"💾 LLM cache: {stats['memory_hits'] + stats['disk_hits']} hits, "
+                  f"{stats['misses']} misses, {stats['bypassed']} bypassed ({stats['hit_rate']:.0%} hit rate)")
+        if hasattr(self.llm_client, "report"):
+            for row in self.llm_client.report():
+                if row["p50"] is not None:
+                    print(f"📶 {row['backend']} ({row['model']}): p50 {row['p50']:.1f}s, p95 {row['p95']:.1f}s, "
+                          f"errors {row['error_rate']:.0%}")
+        if hasattr(self.llm_client, "close"):
+            self.llm_client.close()
         if self.driver:
             self.driver.quit()
             print("🧹 Browser closed")
@@ -1542,129 +1817,16 @@ Return JSON format:
         time.sleep(2)
     
     def upload_resume_comprehensive(self, resume_path: str) -> bool:
-        """Comprehensive resume upload with multiple strategies"""
-        print("📎 Comprehensive resume upload search...")
-        
-        # Enhanced file upload selectors
-        file_selectors = [
-            # Standard file inputs
-            "input[type='file']",
-            
-            # Accept attribute variations
-            "input[accept*='.pdf']", "input[accept*='.doc']", "input[accept*='.docx']",
-            "input[accept*='pdf']", "input[accept*='doc']", "input[accept*='application']",
-            
-            # Name/ID attribute variations
-            "input[name*='resume']", "input[name*='cv']", "input[name*='upload']",
-            "input[name*='file']", "input[name*='document']", "input[name*='attachment']",
-            "input[id*='resume']", "input[id*='cv']", "input[id*='upload']",
-            "input[id*='file']", "input[id*='document']", "input[id*='attachment']",
-            
-            # Class attribute variations
-            "input[class*='upload']", "input[class*='file']", "input[class*='resume']",
-            "input[class*='cv']", "input[class*='document']", "input[class*='attachment']",
-            
-            # Aria/accessibility attributes
-            "input[aria-label*='upload']", "input[aria-label*='resume']", "input[aria-label*='cv']",
-            "input[aria-label*='file']", "input[aria-label*='document']",
-            
-            # Placeholder variations
-            "input[placeholder*='upload']", "input[placeholder*='resume']", "input[placeholder*='cv']",
-            "input[placeholder*='file']", "input[placeholder*='document']"
-        ]
-        
-        uploaded = False
-        upload_attempts = 0
-        
-        for selector in file_selectors:
-            try:
-                file_inputs = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                for file_input in file_inputs:
-                    try:
-                        if file_input.is_enabled() and file_input.get_attribute("type") == "file":
-                            upload_attempts += 1
-                            label = self._get_field_label(file_input)
-                            print(f"📎 Attempt {upload_attempts}: Found upload field - {label}")
-                            
-                            # Scroll to element
-                            self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", file_input)
-                            time.sleep(1)
-                            
-                            # Upload the file
-                            file_input.send_keys(os.path.abspath(resume_path))
-                            print(f"✅ Resume uploaded successfully to: {label}")
-                            uploaded = True
-                            time.sleep(3)  # Wait for upload to process
-                            
-                            # Handle any upload success alerts
-                            self._handle_alerts()
-                            
-                            break
-                    except Exception as e:
-                        print(f"⚠️ Upload attempt {upload_attempts} failed: {e}")
-                        continue
-                if uploaded:
-                    break
-            except:
-                continue
-        
-        # Try alternative upload methods if standard didn't work
-        if not uploaded:
-            print("🔄 Trying alternative upload methods...")
-            uploaded = self._try_drag_drop_upload(resume_path) or self._try_button_click_upload(resume_path)
-        
+        """Upload the resume to the best matching file input and wait until it has arrived"""
+        print("📎 Looking for the resume upload field...")
+        uploaded = upload_resume(self.driver, resume_path)
         if uploaded:
+            # Handle any upload success alerts
+            self._handle_alerts()
             print("🎉 Resume upload completed successfully!")
             self.take_screenshot("resume_uploaded")
-        else:
-            print("⚠️ No file upload fields found on this page")
-        
         return uploaded
     
-    def _try_drag_drop_upload(self, resume_path: str) -> bool:
-        """Try drag and drop upload areas"""
-        try:
-            drag_drop_selectors = [
-                "[class*='drag']", "[class*='drop']", "[id*='drag']", "[id*='drop']",
-                ".dropzone", ".upload-area", ".file-drop", ".drag-drop"
-            ]
-            
-            for selector in drag_drop_selectors:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                for element in elements:
-                    if element.is_displayed():
-                        print(f"📎 Found drag-drop area: {selector}")
-                        # This would require more complex implementation
-                        # For now, just note that we found it
-                        return False
-            return False
-        except:
-            return False
-    
-    def _try_button_click_upload(self, resume_path: str) -> bool:
-        """Try clicking upload buttons that might trigger file dialogs"""
-        try:
-            upload_button_selectors = [
-                "//button[contains(text(), 'Upload')]",
-                "//button[contains(text(), 'Browse')]",
-                "//button[contains(text(), 'Choose File')]",
-                "//button[contains(text(), 'Select File')]",
-                "//a[contains(text(), 'Upload')]",
-                "//a[contains(text(), 'Browse')]"
-            ]
-            
-            for selector in upload_button_selectors:
-                buttons = self.driver.find_elements(By.XPATH, selector)
-                for button in buttons:
-                    if button.is_displayed() and button.is_enabled():
-                        print(f"📎 Found upload button: {button.text}")
-                        # This would require handling file dialogs
-                        # For now, just note that we found it
-                        return False
-            return False
-        except:
-            return False
-    
     def go_to_next_page(self) -> bool:
         """Navigate to the next page in multi-page application"""
         print("➡️ Looking for next page navigation...")
@@ -1717,6 +1879,7 @@ Return JSON format:
                         if element.is_displayed() and element.is_enabled():
                             button_text = element.text or element.get_attribute("value") or "Button"
                             print(f"➡️ Found next page button: {button_text}")
+                            button_xpath = self._get_element_xpath(element)
                             
                             # Scroll to button
                             self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", element)
@@ -1734,6 +1897,7 @@ Return JSON format:
                             # Verify we moved to a new page
                             if self._verify_page_change():
                                 print("✅ Successfully navigated to next page")
+                                self.last_next_xpath = button_xpath
                                 return True
                             else:
                                 print("⚠️ Page didn't change, trying next button...")
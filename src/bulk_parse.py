@@ -0,0 +1,138 @@
+import glob
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import asdict
+from typing import Dict, List, Callable
+from src.config import config
+from src.resume_parser import ResumeParser, extract_resume_text
+
+RESUME_EXTENSIONS = ('.pdf', '.docx')
+
+
+def find_resumes(source: str) -> List[str]:
+    """Resume files in a directory (recursively) or matching a glob"""
+    if os.path.isdir(source):
+        paths = [os.path.join(root, name) for root, _, names in os.walk(source) for name in names]
+    else:
+        paths = glob.glob(source, recursive=True)
+    return sorted(path for path in paths if path.lower().endswith(RESUME_EXTENSIONS) and os.path.isfile(path))
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_parsed_hashes(output: str) -> Dict[str, str]:
+    """path -> content hash of the latest successful record in an existing JSONL output"""
+    hashes: Dict[str, str] = {}
+    if not os.path.exists(output):
+        return hashes
+    with open(output, encoding="utf-8") as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Truncated last line from an interrupted run
+            if record.get("status") == "ok":
+                hashes[record["path"]] = record["sha256"]
+            else:
+                hashes.pop(record.get("path"), None)
+    return hashes
+
+
+def _extract_worker(path: str) -> Dict:
+    """Process pool worker: text extraction (and OCR) for one file"""
+    started = time.perf_counter()
+    try:
+        # Already one process per file; don't nest another pool inside
+        text, error = extract_resume_text(path, workers=1), None
+    except Exception as e:
+        text, error = "", f"{type(e).__name__}: {e}"
+    return {"text": text, "error": error, "extract_seconds": round(time.perf_counter() - started, 3)}
+
+
+class BulkResumeParser:
+    """Parse a library of resumes into a JSONL file.
+
+    Text extraction runs in a process pool; the LLM step runs in a thread
+    pool so at most llm_concurrency resumes talk to the LLM at once. Records
+    are appended as each file finishes, and files whose content hash matches
+    their last successful record are skipped.
+    """
+
+    def __init__(self, parser: ResumeParser, workers: int = None, llm_concurrency: int = None,
+                 include_text: bool = False):
+        self.parser = parser
+        self.workers = workers or config.pdf_workers or os.cpu_count() or 1
+        self.llm_concurrency = llm_concurrency or config.llm_max_workers
+        self.include_text = include_text
+        self._write_lock = threading.Lock()
+
+    def run(self, paths: List[str], output: str, force: bool = False,
+            on_record: Callable[[Dict], None] = None) -> Dict[str, int]:
+        previous = {} if force else load_parsed_hashes(output)
+        counts = {"ok": 0, "error": 0, "skipped": 0}
+
+        pending = []
+        for path in paths:
+            digest = file_hash(path)
+            if previous.get(os.path.abspath(path)) == digest:
+                counts["skipped"] += 1
+            else:
+                pending.append((path, digest))
+        print(f"📚 {len(paths)} resumes, {counts['skipped']} unchanged, {len(pending)} to parse")
+        if not pending:
+            return counts
+
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        with open(output, "a", encoding="utf-8") as out, \
+                ProcessPoolExecutor(max_workers=min(self.workers, len(pending))) as processes, \
+                ThreadPoolExecutor(max_workers=self.llm_concurrency) as threads:
+            extractions = {processes.submit(_extract_worker, path): (path, digest) for path, digest in pending}
+            parses = []
+            # Hand each file to the LLM stage as soon as its text is ready
+            for future in as_completed(extractions):
+                path, digest = extractions[future]
+                record = {"path": os.path.abspath(path), "sha256": digest}
+                try:
+                    record.update(future.result())
+                except Exception as e:
+                    record.update(text="", error=f"{type(e).__name__}: {e}", extract_seconds=None)
+
+                if record["error"]:
+                    self._write(out, record, counts, on_record)
+                else:
+                    parses.append(threads.submit(self._parse_and_write, out, record, counts, on_record))
+            for future in parses:
+                future.result()
+        return counts
+
+    def _parse_and_write(self, out, record: Dict, counts: Dict[str, int], on_record: Callable[[Dict], None]):
+        started = time.perf_counter()
+        try:
+            resume = asdict(self.parser.parse_text(record["text"]))
+            if not self.include_text:
+                resume.pop("raw_text", None)
+            record["resume"] = resume
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+        record["parse_seconds"] = round(time.perf_counter() - started, 3)
+        self._write(out, record, counts, on_record)
+
+    def _write(self, out, record: Dict, counts: Dict[str, int], on_record: Callable[[Dict], None]):
+        record.pop("text", None)
+        record["status"] = "error" if record.get("error") else "ok"
+        with self._write_lock:
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            counts[record["status"]] += 1
+        if on_record:
+            on_record(record)
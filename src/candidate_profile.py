@@ -0,0 +1,341 @@
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass, asdict, fields as dataclass_fields
+from datetime import date
+from typing import Dict, List, Optional, Tuple, Any
+from src.config import config
+from src.resume_rules import (US_STREET_ADDRESS, US_CITY_STATE, INTL_CITY_COUNTRY, DATE_RANGE, MONTH, YEAR,
+                              US_STATES)
+
+# Bump when compiled values change meaning so stale profiles are rebuilt
+PROFILE_VERSION = 2
+
+US_STATE_NAMES = {
+    "AL": "Alabama", "AK": "Alaska", "AZ": "Arizona", "AR": "Arkansas", "CA": "California", "CO": "Colorado",
+    "CT": "Connecticut", "DE": "Delaware", "DC": "District of Columbia", "FL": "Florida", "GA": "Georgia",
+    "HI": "Hawaii", "ID": "Idaho", "IL": "Illinois", "IN": "Indiana", "IA": "Iowa", "KS": "Kansas",
+    "KY": "Kentucky", "LA": "Louisiana", "ME": "Maine", "MD": "Maryland", "MA": "Massachusetts",
+    "MI": "Michigan", "MN": "Minnesota", "MS": "Mississippi", "MO": "Missouri", "MT": "Montana",
+    "NE": "Nebraska", "NV": "Nevada", "NH": "New Hampshire", "NJ": "New Jersey", "NM": "New Mexico",
+    "NY": "New York", "NC": "North Carolina", "ND": "North Dakota", "OH": "Ohio", "OK": "Oklahoma",
+    "OR": "Oregon", "PA": "Pennsylvania", "RI": "Rhode Island", "SC": "South Carolina", "SD": "South Dakota",
+    "TN": "Tennessee", "TX": "Texas", "UT": "Utah", "VT": "Vermont", "VA": "Virginia", "WA": "Washington",
+    "WV": "West Virginia", "WI": "Wisconsin", "WY": "Wyoming"
+}
+
+# Calling codes for countries the address rules recognise, used when a number
+# is written without separators after the "+"
+CALLING_CODES = {
+    "1", "7", "27", "31", "32", "33", "34", "39", "41", "43", "44", "45", "46", "47", "48", "49", "52", "54",
+    "55", "61", "64", "65", "81", "86", "91", "351", "353", "358", "971", "972"
+}
+
+MONTHS = {name: number for number, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1)}
+DATE_PART = re.compile(r"(?:(" + MONTH + r")\s+(\d{4})|(\d{1,2})/(\d{4})|(\d{4}))", re.IGNORECASE)
+ONGOING = re.compile(r"\b(present|current|now|today)\b", re.IGNORECASE)
+NAME_SUFFIXES = {"jr", "jr.", "sr", "sr.", "ii", "iii", "iv", "phd", "ph.d.", "md", "m.d."}
+
+
+@dataclass
+class CandidateProfile:
+    """Canonical answers derived once from a parsed resume.
+
+    Every value is a ready-to-type string (or number), so field mapping is a
+    dictionary lookup instead of re-deriving name parts, phone formats and
+    dates on every page.
+    """
+    full_name: str = ""
+    first_name: str = ""
+    middle_name: str = ""
+    last_name: str = ""
+    email: str = ""
+    phone: str = ""  # As written on the resume
+    phone_e164: str = ""  # +14085550142
+    phone_national: str = ""  # (408) 555-0142
+    phone_digits: str = ""  # 4085550142, for fields next to a country code picker
+    phone_country_code: str = ""  # +1
+    address: str = ""
+    street: str = ""
+    city: str = ""
+    state: str = ""  # Full name, as Workday state dropdowns list it
+    state_code: str = ""
+    zip_code: str = ""
+    country: str = ""
+    current_title: str = ""
+    current_company: str = ""
+    current_start: str = ""  # MM/YYYY
+    current_end: str = ""  # MM/YYYY, empty while ongoing
+    currently_employed: bool = False
+    years_of_experience: float = 0.0
+    latest_school: str = ""
+    latest_degree: str = ""
+    field_of_study: str = ""
+    graduation_year: str = ""
+    skills: str = ""  # Comma separated
+    summary: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CandidateProfile":
+        known = {field.name for field in dataclass_fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in known})
+
+
+def split_name(name: str) -> Tuple[str, str, str]:
+    """First, middle and last name; suffixes such as Jr. are dropped"""
+    parts = [part for part in (name or "").replace(",", " ").split() if part.lower() not in NAME_SUFFIXES]
+    if not parts:
+        return "", "", ""
+    if len(parts) == 1:
+        return parts[0], "", ""
+    return parts[0], " ".join(parts[1:-1]), parts[-1]
+
+
+def _valid_national(code: str, national: str) -> bool:
+    """Whether code + national can be an E.164 number (NANP numbers are exactly [2-9]XX + 7 digits)"""
+    if code == "1":
+        return bool(re.fullmatch(r"[2-9]\d{9}", national))
+    return bool(code) and 4 <= len(national) and len(code) + len(national) <= 15
+
+
+def normalize_phone(phone: str, default_country_code: str = None) -> Dict[str, str]:
+    """E.164, national and digits-only forms of a phone number"""
+    raw = (phone or "").strip()
+    digits = re.sub(r"\D", "", raw)
+    if not digits:
+        return {"phone_e164": "", "phone_national": "", "phone_digits": "", "phone_country_code": ""}
+
+    if raw.startswith("+") or raw.startswith("00"):
+        international = raw[1:] if raw.startswith("+") else raw[2:]
+        digits = digits if raw.startswith("+") else digits[2:]
+        # "+44 20 7946 0958": the first group is the country code
+        group = re.match(r"\s*(\d{1,3})[\s.()-]", international)
+        if group:
+            code = group.group(1)
+        else:
+            code = next((digits[:n] for n in (1, 2, 3) if digits[:n] in CALLING_CODES), digits[:1])
+        national = digits[len(code):]
+    elif len(digits) == 11 and digits.startswith("1"):
+        code, national = "1", digits[1:]
+    else:
+        code = default_country_code or config.default_phone_country_code
+        # Drop the trunk prefix ("020 7946 0958" -> "2079460958"); NANP numbers have none
+        national = digits[1:] if digits.startswith("0") and code != "1" else digits
+        if not _valid_national(code, national):
+            # The default code does not fit (e.g. a UK number with a US default): no E.164 guess
+            return {"phone_e164": "", "phone_national": raw, "phone_digits": digits, "phone_country_code": ""}
+
+    if code == "1" and len(national) == 10:
+        formatted = f"({national[:3]}) {national[3:6]}-{national[6:]}"
+    else:
+        formatted = re.sub(r"^\s*(\+|00)\s*" + re.escape(code) + r"[\s.-]*", "", raw) if code else raw
+    return {
+        "phone_e164": f"+{code}{national}",
+        "phone_national": formatted,
+        "phone_digits": national,
+        "phone_country_code": f"+{code}"
+    }
+
+
+def parse_address(address: str) -> Dict[str, str]:
+    """Street, city, state, zip and country from a one-line address"""
+    parts = {"street": "", "city": "", "state": "", "state_code": "", "zip_code": "", "country": ""}
+    address = " ".join((address or "").split())
+    if not address:
+        return parts
+
+    us = US_STREET_ADDRESS.search(address) or US_CITY_STATE.search(address)
+    if us:
+        pieces = [piece.strip() for piece in us.group().split(",")]
+        # Last piece is "CA 94102"; the one before it is the city, anything earlier the street
+        state_zip = pieces[-1].split()
+        parts["state_code"] = state_zip[0].rstrip(".").upper()
+        parts["state"] = US_STATE_NAMES.get(parts["state_code"], parts["state_code"])
+        parts["zip_code"] = state_zip[1] if len(state_zip) > 1 else ""
+        parts["city"] = pieces[-2] if len(pieces) >= 2 else ""
+        parts["street"] = ", ".join(pieces[:-2])
+        parts["country"] = "United States"
+        return parts
+
+    international = INTL_CITY_COUNTRY.search(address)
+    if international:
+        pieces = [piece.strip() for piece in international.group().split(",")]
+        parts["country"] = pieces[-1]
+        parts["city"] = pieces[-2]
+        return parts
+
+    # Bare state code, e.g. "Remote - CA"
+    state = re.search(r"\b(" + US_STATES + r")\b", address)
+    if state:
+        parts["state_code"] = state.group()
+        parts["state"] = US_STATE_NAMES[state.group()]
+        parts["country"] = "United States"
+    return parts
+
+
+def parse_month_year(text: str) -> Optional[Tuple[int, int]]:
+    """(year, month) of a resume date; month defaults to January for a bare year"""
+    match = DATE_PART.search(text or "")
+    if not match:
+        return None
+    month_name, month_year, month_number, number_year, bare_year = match.groups()
+    if month_name:
+        return int(month_year), MONTHS[month_name[:3].lower()]
+    if month_number:
+        return int(number_year), max(1, min(12, int(month_number)))
+    return int(bare_year), 1
+
+
+def parse_duration(duration: str) -> Optional[Tuple[Tuple[int, int], Optional[Tuple[int, int]]]]:
+    """Start and end (year, month) of "Jan 2020 - Present"; end is None while ongoing"""
+    match = DATE_RANGE.search(duration or "")
+    if not match:
+        return None
+    start = parse_month_year(match.group(1))
+    end = None if ONGOING.search(match.group(2)) else parse_month_year(match.group(2))
+    return start, end
+
+
+def format_month_year(value: Optional[Tuple[int, int]]) -> str:
+    return f"{value[1]:02d}/{value[0]}" if value else ""
+
+
+def years_of_experience(experience: List[Dict], today: date = None) -> float:
+    """Total employed time in years, counting overlapping roles once"""
+    today = today or date.today()
+    now = today.year * 12 + today.month - 1
+    intervals = []
+    for entry in experience:
+        parsed = parse_duration(str(entry.get("duration", "")))
+        if not parsed:
+            continue
+        start, end = parsed
+        begin = start[0] * 12 + start[1] - 1
+        finish = now if end is None else end[0] * 12 + end[1] - 1
+        if finish >= begin:
+            intervals.append((begin, finish))
+
+    months, covered_until = 0, None
+    for begin, finish in sorted(intervals):
+        if covered_until is not None and begin <= covered_until:
+            if finish > covered_until:
+                months += finish - covered_until
+                covered_until = finish
+        else:
+            months += finish - begin + 1
+            covered_until = finish
+    return round(months / 12, 1)
+
+
+def _latest_role(experience: List[Dict]) -> Tuple[Dict, Optional[Tuple], Optional[Tuple]]:
+    """Most recent role: ongoing first, then latest end; resume order breaks ties"""
+    best, best_key, best_dates = {}, None, (None, None)
+    for position, entry in enumerate(experience):
+        parsed = parse_duration(str(entry.get("duration", "")))
+        start, end = parsed if parsed else (None, None)
+        ongoing = parsed is not None and end is None
+        key = (ongoing, end or (0, 0), start or (0, 0), -position)
+        if best_key is None or key > best_key:
+            best, best_key, best_dates = entry, key, (start, end)
+    return best, best_dates[0], best_dates[1]
+
+
+def _latest_degree(education: List[Dict]) -> Dict:
+    """Degree with the latest year; resume order breaks ties"""
+    def graduation(item):
+        position, entry = item
+        year = YEAR.search(str(entry.get("year", "")))
+        return int(year.group()) if year else 0, -position
+    return max(enumerate(education), key=graduation)[1] if education else {}
+
+
+def compile_profile(resume: Any, today: date = None) -> CandidateProfile:
+    """Turn a ParsedResume into canonical, ready-to-type answers"""
+    first, middle, last = split_name(resume.name)
+    profile = CandidateProfile(
+        full_name=" ".join((resume.name or "").split()),
+        first_name=first,
+        middle_name=middle,
+        last_name=last,
+        email=(resume.email or "").strip(),
+        phone=(resume.phone or "").strip(),
+        address=(resume.address or "").strip(),
+        skills=", ".join(resume.skills or []),
+        summary=resume.summary or ""
+    )
+    for key, value in {**normalize_phone(resume.phone), **parse_address(resume.address)}.items():
+        setattr(profile, key, value)
+
+    role, start, end = _latest_role(resume.experience or [])
+    profile.current_title = str(role.get("title", "") or "")
+    profile.current_company = str(role.get("company", "") or "")
+    profile.current_start = format_month_year(start)
+    profile.current_end = format_month_year(end)
+    profile.currently_employed = bool(start) and end is None
+    profile.years_of_experience = years_of_experience(resume.experience or [], today)
+
+    degree = _latest_degree(resume.education or [])
+    profile.latest_school = str(degree.get("school", "") or "")
+    profile.latest_degree = str(degree.get("degree", "") or "")
+    # "Master of Science in Computer Science" -> "Computer Science"
+    if " in " in profile.latest_degree:
+        profile.field_of_study = profile.latest_degree.split(" in ", 1)[1].strip()
+    year = YEAR.search(str(degree.get("year", "")))
+    profile.graduation_year = year.group() if year else ""
+    return profile
+
+
+def profile_path(resume_path: str) -> str:
+    """Where the profile of a resume is stored: next to it"""
+    return f"{resume_path}.profile.json"
+
+
+def _file_hash(path: str) -> str:
+    with open(path, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def save_profile(profile: CandidateProfile, resume_path: str):
+    with open(profile_path(resume_path), "w", encoding="utf-8") as file:
+        json.dump({
+            "version": PROFILE_VERSION,
+            "resume_sha256": _file_hash(resume_path),
+            "profile": profile.to_dict()
+        }, file, indent=2, ensure_ascii=False)
+
+
+def load_profile(resume_path: str) -> Optional[CandidateProfile]:
+    """Stored profile if it was compiled from this exact resume file"""
+    path = profile_path(resume_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding="utf-8") as file:
+            stored = json.load(file)
+        if stored.get("version") != PROFILE_VERSION or stored.get("resume_sha256") != _file_hash(resume_path):
+            return None
+        return CandidateProfile.from_dict(stored.get("profile", {}))
+    except Exception as e:
+        print(f"⚠️ Could not read candidate profile {path}: {e}")
+        return None
+
+
+def load_or_compile_profile(resume_path: str, resume: Any) -> CandidateProfile:
+    """Reuse the stored profile (including manual edits) while the resume is unchanged"""
+    profile = load_profile(resume_path)
+    if profile is not None:
+        print(f"📇 Candidate profile loaded from {profile_path(resume_path)}")
+        return profile
+
+    profile = compile_profile(resume)
+    try:
+        save_profile(profile, resume_path)
+        print(f"📇 Candidate profile compiled to {profile_path(resume_path)}")
+    except Exception as e:
+        print(f"⚠️ Could not save candidate profile: {e}")
+    return profile
@@ -0,0 +1,125 @@
+import glob
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from cryptography.fernet import Fernet, InvalidToken
+from src.config import config
+from src.job_posting import posting_cache_key
+from src.session_store import load_key
+
+# Steps, in the order an application records them
+RESUME_PARSED = "resume_parsed"
+RESUME_UPLOADED = "resume_uploaded"
+PAGE_MAPPED = "page_mapped"
+PAGE_FILLED = "page_filled"
+NAVIGATED = "navigated"
+COMPLETED = "completed"
+
+
+@dataclass
+class JournalState:
+    """What an earlier, interrupted run already finished"""
+    resume: Optional[Dict[str, Any]] = None
+    uploaded: bool = False
+    pages: Dict[int, Dict[str, Any]] = field(default_factory=dict)  # page -> fingerprint, fields, filled
+    last_page: int = 0
+    completed: bool = False
+
+    def mapped_page(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Latest mapped page with this layout fingerprint"""
+        for page in sorted(self.pages, reverse=True):
+            entry = self.pages[page]
+            if fingerprint and entry.get("fingerprint") == fingerprint and "fields" in entry:
+                return entry
+        return None
+
+
+class ApplicationJournal:
+    """Append-only record of the completed steps of one application.
+
+    One encrypted JSON line per step, flushed and fsynced as it is written, so
+    a crash loses at most the step in progress. Lines hold the parsed resume
+    and field answers, so they are encrypted with the session store key. The
+    journal is keyed by posting and resume content; a run after a completed
+    one starts a fresh journal, and journals left unfinished expire after
+    journal_max_age.
+    """
+
+    def __init__(self, workday_url: str, resume_path: str, directory: str = None, key: bytes = None):
+        digest = hashlib.sha256()
+        with open(resume_path, "rb") as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                digest.update(block)
+        name = hashlib.sha256((posting_cache_key(workday_url) + digest.hexdigest()).encode("utf-8")).hexdigest()
+        directory = directory or config.journal_dir
+        os.makedirs(directory, exist_ok=True)
+        prune_journals(directory)
+        self.path = os.path.join(directory, name[:24] + ".journal")
+        self.fernet = Fernet(key or load_key())
+
+    def record(self, step: str, **data):
+        entry = json.dumps({"step": step, "time": time.time(), **data})
+        line = self.fernet.encrypt(entry.encode("utf-8")).decode("ascii")
+        with open(self.path, "a+", encoding="utf-8") as file:
+            if file.tell():
+                file.seek(file.tell() - 1)
+                if file.read(1) != "\n":
+                    line = "\n" + line  # Don't glue onto a line torn by a crash
+            file.write(line + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+    def entries(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return []
+        entries = []
+        with open(self.path, encoding="utf-8") as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(self.fernet.decrypt(line.encode("ascii"))))
+                except (InvalidToken, ValueError):
+                    continue  # Line torn by a crash mid-write, or written with another key
+        return entries
+
+    def state(self) -> JournalState:
+        state = JournalState()
+        for entry in self.entries():
+            step, page = entry.get("step"), entry.get("page", 0)
+            if step == RESUME_PARSED:
+                state.resume = entry.get("resume")
+            elif step == RESUME_UPLOADED:
+                state.uploaded = True
+            elif step == PAGE_MAPPED:
+                state.pages.setdefault(page, {}).update(fingerprint=entry.get("fingerprint", ""),
+                                                        fields=entry.get("fields", []))
+            elif step == PAGE_FILLED:
+                state.pages.setdefault(page, {})["filled"] = entry.get("filled", 0)
+            elif step == NAVIGATED:
+                state.last_page = max(state.last_page, page + 1)
+            elif step == COMPLETED:
+                state.completed = True
+        return state
+
+    def reset(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def prune_journals(directory: str, max_age: float = None):
+    """Delete journals untouched for max_age, and plaintext journals from older versions"""
+    max_age = config.journal_max_age if max_age is None else max_age
+    cutoff = time.time() - max_age
+    for path in glob.glob(os.path.join(directory, "*.journal")) + glob.glob(os.path.join(directory, "*.jsonl")):
+        try:
+            if path.endswith(".jsonl") or os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
@@ -9,21 +9,99 @@ class Config(BaseModel):
     # LLM Configuration
     llm_api_url: str = os.getenv("LLM_API_URL", "http://localhost:11434/api/generate")
     llm_model: str = os.getenv("LLM_MODEL", "llama2")
+    llm_backends: str = os.getenv("LLM_BACKENDS", "openrouter")  # Comma separated: openrouter, ollama, huggingface
+    openrouter_api_key: str = os.getenv("OPENROUTER_API_KEY", "")
+    openrouter_model: str = os.getenv("OPENROUTER_MODEL", "deepseek/deepseek-chat")
+    llm_session_mode: bool = os.getenv("LLM_SESSION_MODE", "true").lower() == "true"  # Prime once per application (Ollama only)
+    llm_keep_alive: str = os.getenv("LLM_KEEP_ALIVE", "30m")  # How long Ollama keeps the model loaded
+    
+    # LLM response cache
+    llm_cache_enabled: bool = os.getenv("LLM_CACHE", "true").lower() == "true"
+    llm_cache_path: str = os.getenv("LLM_CACHE_PATH", ".cache/llm_responses.sqlite3")
+    llm_cache_ttl: float = 7 * 24 * 3600  # Seconds
+    llm_cache_memory_entries: int = 256
+    llm_cache_disk_entries: int = 5000
+    llm_cache_nondeterministic: bool = False  # Also cache sampled (temperature > 0) responses
+    
+    # Multi-backend routing
+    router_window: int = 50  # Requests kept per backend for latency/error stats
+    router_min_samples: int = 5  # Requests before a backend can be marked unhealthy
+    router_max_error_rate: float = 0.5
+    router_min_hedge_delay: float = 1.0  # Never hedge earlier than this (seconds)
     
     # Application settings
     max_response_length: int = 500
     temperature: float = 0.7
+    mapping_chunk_tokens: int = 600  # Budget per field mapping request (fields + expected answers)
+    llm_max_workers: int = 4  # Concurrent LLM requests
+    resume_block_chars: int = 1500  # Longer resume sections are extracted in blocks
+    rule_parser_enabled: bool = True  # Parse resumes with local rules first, LLM only for weak fields
+    rule_confidence_threshold: float = 0.7  # Rule fields below this are re-extracted by the LLM
+    default_phone_country_code: str = os.getenv("DEFAULT_PHONE_COUNTRY_CODE", "1")  # For numbers without "+"
     
     # Automation settings
-    typing_delay: float = 0.1  # Delay between keystrokes
+    typing_delay: float = 0.1  # Delay between keystrokes (or chunks, for chunked text entry)
+    text_entry: str = os.getenv("TEXT_ENTRY", "insert")  # insert (one DevTools call), chunked or keys (per character)
+    text_chunk_chars: int = 40  # Characters per Input.insertText call in chunked mode
     action_delay: float = 1.0  # Delay between actions
     screenshot_dir: str = "screenshots"
+    pipelined_fill: bool = True  # Start filling locally resolved fields while the LLM maps the rest
+    widget_option_timeout: float = 3.0  # Seconds to wait for a dropdown or prompt to show its options
+    repeatable_render_timeout: float = 5.0  # Seconds to wait for added experience/education blocks
+    upload_timeout: float = 30.0  # Seconds to wait for an upload-complete signal after sending the resume
+    essay_max_tokens: int = 500
+    essay_wait_seconds: float = 60.0  # How long essay textareas wait, after the rest of the page is filled
+    essay_cache_path: str = os.getenv("ESSAY_CACHE_PATH", ".cache/essays.sqlite3")
+    essay_cache_ttl: float = 30 * 24 * 3600  # Seconds
+    essay_job_context_chars: int = 1500  # Job description excerpt given to essay prompts
+    # Comma separated templates generated as soon as the posting is known, before any page asks
+    essay_speculative: str = os.getenv("ESSAY_SPECULATIVE", "cover_letter,why_interested")
+    job_description_chars: int = 6000  # Job description kept per posting
+    job_cache_path: str = os.getenv("JOB_CACHE_PATH", ".cache/job_postings.sqlite3")
+    job_cache_ttl: float = 7 * 24 * 3600  # Seconds
+    layout_cache_enabled: bool = os.getenv("LAYOUT_CACHE", "true").lower() == "true"  # Reuse fields per tenant page
+    layout_cache_path: str = os.getenv("LAYOUT_CACHE_PATH", ".cache/page_layouts.sqlite3")
+    layout_cache_ttl: float = 30 * 24 * 3600  # Seconds
+    
+    # Per-application checkpoint journal, so an interrupted run resumes where it stopped
+    journal_enabled: bool = os.getenv("JOURNAL", "true").lower() == "true"
+    journal_dir: str = os.getenv("JOURNAL_DIR", ".cache/journals")
+    journal_max_age: float = 7 * 24 * 3600  # Seconds; unfinished journals are deleted after this
+    
+    # Page HTML saved before filling, for offline analysis with `main.py analyze`; empty disables
+    snapshot_dir: str = os.getenv("SNAPSHOT_DIR", "")
+    snapshot_cache_path: str = os.getenv("SNAPSHOT_CACHE_PATH", ".cache/snapshot_detections.sqlite3")
+    snapshot_cache_ttl: float = 30 * 24 * 3600  # Seconds
+    
+    # Saved tenant sessions (cookies and localStorage, encrypted with SESSION_KEY or a generated key file)
+    session_store_enabled: bool = os.getenv("SESSION_STORE", "true").lower() == "true"
+    session_dir: str = os.getenv("SESSION_DIR", ".cache/sessions")
+    session_key: Optional[str] = os.getenv("SESSION_KEY")  # Fernet key for sessions and journals; generated if unset
+    session_key_path: str = os.getenv("SESSION_KEY_PATH", ".cache/session.key")
+    session_max_age: float = 14 * 24 * 3600  # Seconds
     
     # Browser settings
     browser_timeout: int = 30
     implicit_wait: int = 10
+    block_requests: bool = os.getenv("BLOCK_REQUESTS", "true").lower() == "true"  # Skip trackers, chat widgets, fonts
+    blocked_categories: str = os.getenv("BLOCKED_CATEGORIES", "analytics,ads,chat,monitoring")
+    blocked_resource_types: str = os.getenv("BLOCKED_RESOURCE_TYPES", "font,media")  # Also: image
+    blocked_urls: str = os.getenv("BLOCKED_URLS", "")  # Extra comma separated patterns, e.g. *cdn.example.com*
+    
+    # PDF extraction
+    pdf_backend: str = os.getenv("PDF_BACKEND", "auto")  # auto, pymupdf, pdfplumber, pdfminer, pypdf2
+    pdf_workers: int = 0  # Processes for page-parallel extraction (0 = CPU count)
+    pdf_parallel_min_pages: int = 8  # Smaller documents are extracted in-process
     
     # OCR settings
     tesseract_path: Optional[str] = os.getenv("TESSERACT_PATH")  # Set if not in PATH
+    ocr_enabled: bool = os.getenv("OCR", "true").lower() == "true"
+    ocr_language: str = os.getenv("OCR_LANGUAGE", "eng")
+    ocr_min_chars_per_page: int = 200  # Text layers thinner than this are treated as scans
+    ocr_dpi: int = 300
+    ocr_max_skew: float = 15.0  # Degrees; larger detected angles are left alone
+    ocr_workers: int = 0  # Processes for page-parallel OCR (0 = CPU count)
+    ocr_cache_path: str = os.getenv("OCR_CACHE_PATH", ".cache/ocr_pages.sqlite3")
+    ocr_cache_ttl: float = 90 * 24 * 3600  # Seconds
 
 config = Config()
\ No newline at end of file
@@ -0,0 +1,167 @@
+import hashlib
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from typing import Any, Dict, List, Optional
+from src.config import config
+from src.disk_cache import DiskCache
+from src.job_posting import JobPosting, posting_cache_key
+from templates.prompts import WORKDAY_PROMPTS
+
+# Textarea label keywords per template, checked in order
+ESSAY_TRIGGERS = [
+    ("cover_letter", ["cover letter"]),
+    ("strengths_weaknesses", ["strength", "weakness", "area of improvement", "areas for improvement"]),
+    ("career_goals", ["career goal", "see yourself", "five years", "5 years", "long-term", "long term"]),
+    ("why_interested", ["why do you want", "why are you interested", "why interested", "interest you",
+                        "why this", "why join", "why us", "want to work"]),
+    ("experience_description", ["describe your experience", "relevant experience", "your experience with",
+                                "tell us about"]),
+]
+
+ESSAY_INSTRUCTIONS = ("Write in the first person as the candidate. Return only the answer text, "
+                      "without a title, greeting placeholder or notes.")
+
+
+class _Defaults(dict):
+    """Template variables the resume can't supply are left to the model"""
+
+    def __missing__(self, key):
+        return "not specified - infer from the candidate's background"
+
+
+class EssayService:
+    """Generates long-form answers in the background while the browser works.
+
+    The common templates (ESSAY_SPECULATIVE) start as soon as the posting is
+    known, so they are usually ready by the time a page asks; the others
+    wait for a textarea that asks for them. Answers are cached on disk per (candidate, company, position,
+    template), so reapplying or retrying a page never regenerates them. Each
+    job keeps the posting it was started for, so a restart never caches an
+    answer under another posting's key.
+    """
+
+    def __init__(self, llm_client: Any, resume: Any, profile: Any, cache: DiskCache = None):
+        self.llm_client = llm_client
+        self.resume = resume
+        self.profile = profile
+        self.cache = cache or DiskCache(path=config.essay_cache_path, ttl=config.essay_cache_ttl)
+        self.job = JobPosting()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures: Dict[str, Future] = {}
+        self.speculative = [name.strip() for name in config.essay_speculative.split(",")
+                            if name.strip() in WORKDAY_PROMPTS]
+
+    @staticmethod
+    def posting_key(job: JobPosting) -> str:
+        """Identity of a posting: its requisition id, else its URL"""
+        return job.requisition_id or posting_cache_key(job.url)
+
+    def start(self, job: JobPosting):
+        """Set the posting essays are written for and start the speculative templates.
+
+        A different posting regenerates the ones already requested.
+        """
+        if self.posting_key(job) == self.posting_key(self.job):
+            self.job = job  # Same posting, possibly with more detail; keep the running answers
+        else:
+            requested = list(self._futures)
+            self.stop()
+            self.job = job
+            for name in requested:
+                self._submit(name)
+        for name in self.speculative:
+            if name not in self._futures:
+                self._submit(name)
+
+    def prepare(self, labels: List[str]) -> List[str]:
+        """Start the templates these textarea labels ask for; returns the labels an essay will answer"""
+        matched = []
+        for label in labels:
+            name = self.template_for_label(label)
+            if name is None:
+                continue
+            matched.append(label)
+            if name not in self._futures:
+                self._submit(name)
+        return matched
+
+    def _submit(self, name: str):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=min(config.llm_max_workers, len(WORKDAY_PROMPTS)),
+                                                thread_name_prefix="essay")
+        self._futures[name] = self._executor.submit(self._answer, name, self.job)
+        print(f"✍️ Preparing essay '{name}' for {self.job.title or 'this role'} "
+              f"at {self.job.company or 'this company'} in the background")
+
+    def stop(self):
+        """Drop queued answers; ones already generating finish and are cached for their posting"""
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+        self._futures = {}
+
+    def template_for_label(self, label: str) -> Optional[str]:
+        label = label.lower()
+        for name, keywords in ESSAY_TRIGGERS:
+            if any(keyword in label for keyword in keywords):
+                return name
+        return None
+
+    def answer_for_label(self, label: str, timeout: float = None) -> Optional[str]:
+        """Essay for a textarea label, waiting up to timeout for it to finish"""
+        name = self.template_for_label(label)
+        future = self._futures.get(name) if name else None
+        if future is None:
+            return None
+        timeout = config.essay_wait_seconds if timeout is None else timeout
+        try:
+            return future.result(timeout=timeout) or None
+        except TimeoutError:
+            if timeout:
+                print(f"⏳ Essay '{name}' not ready in time, falling back to field mapping")
+        except Exception as e:
+            print(f"⚠️ Essay '{name}' failed: {e}")
+        return None
+
+    def _answer(self, name: str, job: JobPosting) -> str:
+        template = WORKDAY_PROMPTS[name]
+        key = self.cache.make_key(
+            candidate=self.profile.email or self.profile.full_name,
+            company=job.company,
+            position=job.title,
+            template=name,
+            template_hash=hashlib.sha256(template.encode("utf-8")).hexdigest()
+        )
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        prompt = template.format_map(_Defaults(self._variables(job))).strip() + "\n\n" + ESSAY_INSTRUCTIONS
+        answer = self.llm_client.generate_response(prompt, max_length=config.essay_max_tokens,
+                                                   use_cache=False).strip()
+        if answer:
+            self.cache.set(key, answer)
+            print(f"✍️ Essay ready: {name} ({len(answer.split())} words)")
+        return answer
+
+    def _variables(self, job: JobPosting) -> Dict[str, str]:
+        profile, resume = self.profile, self.resume
+        roles = [" at ".join(part for part in (entry.get("title"), entry.get("company")) if part)
+                 for entry in (resume.experience or [])[:3]]
+        achievements = [str(entry.get("description", "")) for entry in (resume.experience or [])[:2]
+                        if entry.get("description")]
+        background = profile.summary or ", ".join(roles)
+        if profile.years_of_experience:
+            background = f"{background} ({profile.years_of_experience:g} years of experience)".strip()
+
+        variables = {
+            "company": job.company or "the company",
+            "position": job.title or "this position",
+            "company_info": job.description[:config.essay_job_context_chars],
+            "background": background,
+            "skills": profile.skills,
+            "experience": "; ".join(roles),
+            "previous_roles": "; ".join(roles),
+            "achievements": " ".join(achievements),
+            "strengths": ", ".join((resume.skills or [])[:5]),
+        }
+        return {key: value for key, value in variables.items() if value}
@@ -0,0 +1,76 @@
+import re
+from typing import Optional, Any
+
+# High-confidence label patterns that can be answered straight from the
+# candidate profile, without waiting for the LLM. Order matters: the first
+# matching pattern wins. Location and experience patterns match whole labels
+# only, since questions like "willing to travel out of state?" or "years of
+# experience with Kubernetes?" mention them without asking for them.
+EMAIL_LABEL = re.compile(r"\be-?mail\b")
+PHONE_EXTENSION_LABEL = re.compile(r"\bextension\b|\bext\b")
+PHONE_CODE_LABEL = re.compile(r"\b(country phone|phone country|dialing|calling) code\b")
+PHONE_LABEL = re.compile(r"\b(phone|mobile|cell|telephone)( number)?$")
+FIRST_NAME_LABEL = re.compile(r"\b(first|given) name\b")
+MIDDLE_NAME_LABEL = re.compile(r"\bmiddle (name|initial)\b")
+LAST_NAME_LABEL = re.compile(r"\b(last|family) name\b|\bsurname\b")
+FULL_NAME_LABEL = re.compile(r"^(full |legal |candidate )?name$")
+STREET_LABEL = re.compile(r"\baddress line 1\b|\bstreet( address)?\b")
+ADDRESS_LABEL = re.compile(r"^(home |current |mailing )?(address|location)$")
+CITY_LABEL = re.compile(r"^(current |home )?(city|town)( or town|/town)?( of residence)?$")
+STATE_LABEL = re.compile(r"^(current |home )?(state|province)( or province|/province)?(/region)?( of residence)?$")
+ZIP_LABEL = re.compile(r"\b(zip|postal)( code)?\b|\bpostcode\b")
+COUNTRY_LABEL = re.compile(r"^country( of residence)?$|\bcountry/territory\b")
+CURRENT_TITLE_LABEL = re.compile(r"\bcurrent (job )?(title|position)\b")
+CURRENT_COMPANY_LABEL = re.compile(r"\bcurrent (employer|company)\b")
+YEARS_LABEL = re.compile(r"^(how many )?(total )?years of (professional |relevant |work )?experience( do you have)?\??$")
+
+PROFILE_LABELS = [
+    (EMAIL_LABEL, "email"),
+    (PHONE_EXTENSION_LABEL, None),
+    (PHONE_CODE_LABEL, "phone_country_code"),
+    (PHONE_LABEL, "phone_national"),
+    (FIRST_NAME_LABEL, "first_name"),
+    (MIDDLE_NAME_LABEL, "middle_name"),
+    (LAST_NAME_LABEL, "last_name"),
+    (FULL_NAME_LABEL, "full_name"),
+    (STREET_LABEL, "street"),
+    (ADDRESS_LABEL, "address"),
+    (CITY_LABEL, "city"),
+    (STATE_LABEL, "state"),
+    (ZIP_LABEL, "zip_code"),
+    (COUNTRY_LABEL, "country"),
+    (CURRENT_TITLE_LABEL, "current_title"),
+    (CURRENT_COMPANY_LABEL, "current_company"),
+    (YEARS_LABEL, "years_of_experience"),
+]
+
+TEXT_TYPES = ("text", "email", "tel")
+# Dropdowns whose options are plain profile values
+SELECT_KEYS = ("state", "country", "phone_country_code")
+
+
+def normalize_label(label: str) -> str:
+    """Lowercase label without required-field markers and extra whitespace"""
+    label = label.lower().replace("*", " ").replace(":", " ")
+    return " ".join(label.split())
+
+
+def resolve_field_locally(label: str, field_type: str, profile: Any) -> Optional[str]:
+    """Value for fields that need no inference, looked up in the candidate profile.
+
+    Returns None when the field should go to the LLM.
+    """
+    if not profile or field_type not in TEXT_TYPES + ("select",):
+        return None
+
+    label = normalize_label(label)
+    for pattern, key in PROFILE_LABELS:
+        if not pattern.search(label):
+            continue
+        if key is None or (field_type == "select" and key not in SELECT_KEYS):
+            return None
+        value = getattr(profile, key, "")
+        if isinstance(value, float):
+            value = f"{value:g}"
+        return str(value) if value else None
+    return None
@@ -0,0 +1,59 @@
+import json
+import os
+import time
+from dataclasses import dataclass, asdict, field
+from typing import Any, Dict, List, Optional
+
+# Bump when the plan format changes so old plans are rejected
+PLAN_VERSION = 1
+
+
+@dataclass
+class PlanStep:
+    """One application page: the layout it expects, what to fill and how to leave it"""
+    fingerprint: str
+    fields: List[Dict[str, Any]]  # label, field_type, xpath, section, value, resolved
+    navigation: Dict[str, str] = field(default_factory=dict)  # {"action": "next", "xpath": ...} or {"action": "done"}
+
+
+@dataclass
+class FillPlan:
+    """Ordered pages of a successful run, replayable on other postings of the same tenant"""
+    host: str
+    source_url: str = ""
+    created: float = field(default_factory=time.time)
+    steps: List[PlanStep] = field(default_factory=list)
+    version: int = PLAN_VERSION
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FillPlan":
+        steps = [PlanStep(**step) for step in data.get("steps", [])]
+        return cls(host=data.get("host", ""), source_url=data.get("source_url", ""),
+                   created=data.get("created", 0.0), steps=steps, version=data.get("version", 0))
+
+    def step(self, index: int) -> Optional[PlanStep]:
+        return self.steps[index] if 0 <= index < len(self.steps) else None
+
+
+def save_plan(plan: FillPlan, path: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(plan.to_dict(), file, indent=2)
+    print(f"🗺️ Fill plan saved: {path} ({len(plan.steps)} pages)")
+
+
+def load_plan(path: str) -> Optional[FillPlan]:
+    """Plan from disk, or None when missing, unreadable or from another format version"""
+    try:
+        with open(path, encoding="utf-8") as file:
+            plan = FillPlan.from_dict(json.load(file))
+    except (OSError, ValueError, TypeError) as e:
+        print(f"⚠️ Could not load fill plan {path}: {e}")
+        return None
+    if plan.version != PLAN_VERSION:
+        print(f"⚠️ Fill plan {path} has format version {plan.version}, expected {PLAN_VERSION}")
+        return None
+    return plan
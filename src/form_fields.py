@@ -0,0 +1,63 @@
+from dataclasses import dataclass
+
+# What field detection looks for, in detection order, with the field type
+# each selector yields. Shared by the live agent and offline analysis.
+FIELD_SELECTORS = [
+    ("input[type='text']", "text"),
+    ("input[type='email']", "email"),
+    ("input[type='tel']", "tel"),
+    ("input[type='number']", "number"),
+    ("input[type='date']", "date"),
+    ("input[type='url']", "url"),
+    ("input:not([type]), input[type='']", "text"),  # inputs without type
+    ("textarea", "textarea"),
+    ("select", "select"),
+    ("input[type='radio']", "radio"),
+    ("input[type='checkbox']", "checkbox"),
+    ("button[aria-haspopup='listbox']", "select")  # Workday "Select One" dropdowns
+]
+
+# Segmented dates are one field, filled from the month segment
+DATE_MONTH_SEGMENT = "dateSectionMonth-input"
+SKIPPED_SEGMENTS = ("dateSectionDay-input", "dateSectionYear-input")
+
+UNKNOWN_LABEL = "Unknown Field"
+
+# Nearest preceding heading or fieldset legend of every element in
+# arguments[0], in one round trip
+FIELD_SECTIONS_SCRIPT = """
+function headingText(node) {
+    if (!node || !node.tagName) return '';
+    if (/^(H[1-4]|LEGEND)$/.test(node.tagName) || node.getAttribute('role') === 'heading') {
+        return (node.innerText || '').trim();
+    }
+    return '';
+}
+function section(el) {
+    while (el && el !== document.body) {
+        var sibling = el.previousElementSibling;
+        while (sibling) {
+            var text = headingText(sibling);
+            if (text) return text;
+            sibling = sibling.previousElementSibling;
+        }
+        el = el.parentElement;
+        var legend = el && el.tagName === 'FIELDSET' ? el.querySelector('legend') : null;
+        if (legend && legend.innerText.trim()) return legend.innerText.trim();
+    }
+    return '';
+}
+return arguments[0].map(section);
+"""
+
+
+@dataclass
+class WorkdayField:
+    """Represents a field in Workday application"""
+    label: str
+    field_type: str  # text, textarea, select, checkbox, radio
+    value: str = ""
+    xpath: str = ""
+    filled: bool = False
+    section: str = ""  # Nearest heading, used to group fields for mapping
+    cached: bool = False  # Value resolved on an earlier visit to this page layout
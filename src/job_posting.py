@@ -0,0 +1,195 @@
+import html
+import json
+import re
+from dataclasses import dataclass, asdict, fields as dataclass_fields
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse, unquote, urlunparse
+from src.config import config
+from src.disk_cache import DiskCache
+
+# One round trip: JSON-LD, Workday automation ids and meta tags together
+POSTING_SCRIPT = """
+const text = (selector) => {
+    const element = document.querySelector(selector);
+    return element ? (element.innerText || element.textContent || '').trim() : '';
+};
+const meta = (name) => {
+    const element = document.querySelector(`meta[property="${name}"], meta[name="${name}"]`);
+    return element ? (element.getAttribute('content') || '').trim() : '';
+};
+const ldJson = [];
+document.querySelectorAll('script[type="application/ld+json"]').forEach((script) => {
+    try { ldJson.push(JSON.parse(script.textContent)); } catch (e) {}
+});
+return {
+    ld_json: ldJson,
+    title: text('[data-automation-id="jobPostingHeader"]'),
+    description: text('[data-automation-id="jobPostingDescription"]'),
+    location: text('[data-automation-id="locations"] dd') || text('[data-automation-id="locations"]'),
+    requisition_id: text('[data-automation-id="requisitionId"] dd') || text('[data-automation-id="requisitionId"]'),
+    company: text('[data-automation-id="company"]'),
+    og_title: meta('og:title'),
+    og_site_name: meta('og:site_name'),
+    og_description: meta('og:description'),
+    document_title: document.title || ''
+};
+"""
+
+REQUISITION_PATTERN = re.compile(r"_([A-Z]*-?\d[\w-]*)$")
+
+
+@dataclass
+class JobPosting:
+    """What the application is for; shared by mapping and essay prompts"""
+    url: str = ""
+    company: str = ""
+    title: str = ""
+    requisition_id: str = ""
+    location: str = ""
+    description: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "JobPosting":
+        known = {field.name for field in dataclass_fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in known})
+
+    def prompt_context(self) -> Dict[str, str]:
+        """Short job context for mapping prompts (no description)"""
+        context = {"company": self.company, "title": self.title, "location": self.location}
+        return {key: value for key, value in context.items() if value}
+
+
+def guess_company_and_position(url: str) -> Tuple[str, str]:
+    """Best guess from a Workday URL, e.g.
+    https://acme.wd5.myworkdayjobs.com/en-US/Careers/job/Austin-TX/Senior-Engineer_R12345/apply
+    """
+    parsed = urlparse(url or "")
+    host = parsed.hostname or ""
+    segments = [unquote(segment) for segment in parsed.path.split("/") if segment]
+    company = host.split(".")[0] if "workday" in host else ""
+    # wd1.myworkdaysite.com/recruiting/<company>/...
+    if re.fullmatch(r"wd\d+", company) and "recruiting" in segments[:-1]:
+        company = segments[segments.index("recruiting") + 1]
+    company = company.replace("-", " ").title()
+
+    position = ""
+    slug = _job_slug(segments)
+    if slug:
+        position = REQUISITION_PATTERN.sub("", slug).replace("-", " ").strip()
+    return company, position
+
+
+def _job_slug(segments: List[str]) -> str:
+    """"Title_RequisitionId" segment of a Workday job URL"""
+    if "job" not in segments:
+        return ""
+    slugs = [slug for slug in segments[segments.index("job") + 1:]
+             if slug.lower() not in ("apply", "applymanually", "autofillwithresume")]
+    return slugs[-1] if slugs else ""
+
+
+def posting_cache_key(url: str) -> str:
+    """Same posting for the job page and its /apply sub-pages, ignoring query strings"""
+    parsed = urlparse(url or "")
+    path = re.sub(r"/(apply|applyManually|autofillWithResume)(/.*)?$", "", parsed.path, flags=re.IGNORECASE)
+    return DiskCache.make_key(posting=urlunparse((parsed.scheme, parsed.netloc, path.rstrip("/"), "", "", "")))
+
+
+def _clean(value: Any) -> str:
+    """Plain text from a possibly HTML-encoded value"""
+    text = html.unescape(str(value or ""))
+    text = re.sub(r"<(br|/p|/li|/div|/h\d)\s*/?>", "\n", text, flags=re.IGNORECASE)
+    text = re.sub(r"<[^>]+>", "", text)
+    return "\n".join(" ".join(line.split()) for line in text.splitlines() if line.strip())
+
+
+def _find_job_posting(node: Any) -> Optional[Dict]:
+    """First schema.org JobPosting in (possibly nested or @graph) JSON-LD"""
+    if isinstance(node, list):
+        for item in node:
+            found = _find_job_posting(item)
+            if found:
+                return found
+    elif isinstance(node, dict):
+        kind = node.get("@type")
+        if kind == "JobPosting" or (isinstance(kind, list) and "JobPosting" in kind):
+            return node
+        return _find_job_posting(node.get("@graph"))
+    return None
+
+
+def _ld_location(posting: Dict) -> str:
+    locations = posting.get("jobLocation") or []
+    if isinstance(locations, dict):
+        locations = [locations]
+    parts = []
+    for location in locations:
+        address = location.get("address", {}) if isinstance(location, dict) else {}
+        if isinstance(address, dict):
+            piece = ", ".join(str(address[key]) for key in ("addressLocality", "addressRegion", "addressCountry")
+                              if isinstance(address.get(key), str) and address.get(key))
+            if piece:
+                parts.append(piece)
+    return "; ".join(parts)
+
+
+def parse_posting(raw: Dict[str, Any], url: str) -> JobPosting:
+    """Merge JSON-LD, Workday DOM and meta tags; the URL fills remaining gaps"""
+    ld = _find_job_posting(raw.get("ld_json")) or {}
+    organization = ld.get("hiringOrganization") or {}
+    identifier = ld.get("identifier") or {}
+    url_company, url_position = guess_company_and_position(url)
+    url_requisition = REQUISITION_PATTERN.search(_job_slug(
+        [unquote(segment) for segment in urlparse(url or "").path.split("/") if segment]))
+
+    def first(*values) -> str:
+        return next((_clean(value) for value in values if _clean(value)), "")
+
+    description = first(ld.get("description"), raw.get("description"), raw.get("og_description"))
+    return JobPosting(
+        url=url,
+        company=first(organization.get("name") if isinstance(organization, dict) else organization,
+                      raw.get("company"), raw.get("og_site_name"), url_company),
+        title=first(ld.get("title"), raw.get("title"), raw.get("og_title"), url_position),
+        requisition_id=first(identifier.get("value") if isinstance(identifier, dict) else identifier,
+                             raw.get("requisition_id"), url_requisition.group(1) if url_requisition else ""),
+        location=first(_ld_location(ld), raw.get("location")),
+        description=description[:config.job_description_chars]
+    )
+
+
+_posting_cache = None
+
+
+def get_posting_cache() -> DiskCache:
+    """Process-wide URL -> job posting store"""
+    global _posting_cache
+    if _posting_cache is None:
+        _posting_cache = DiskCache(path=config.job_cache_path, ttl=config.job_cache_ttl)
+    return _posting_cache
+
+
+def load_cached_posting(url: str) -> Optional[JobPosting]:
+    cached = get_posting_cache().get(posting_cache_key(url))
+    return JobPosting.from_dict(json.loads(cached)) if cached else None
+
+
+def extract_job_posting(driver: Any, url: str) -> JobPosting:
+    """Job metadata for the current page: cached per URL, otherwise one script call"""
+    cached = load_cached_posting(url)
+    if cached:
+        return cached
+
+    try:
+        raw = driver.execute_script(POSTING_SCRIPT) or {}
+    except Exception as e:
+        print(f"⚠️ Could not read job posting from page: {e}")
+        raw = {}
+    posting = parse_posting(raw, url)
+    # Only cache what the page provided; a URL-only guess is retried next time
+    if raw and (posting.title or posting.description):
+        get_posting_cache().set(posting_cache_key(url), json.dumps(posting.to_dict()))
+    return posting
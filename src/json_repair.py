@@ -0,0 +1,118 @@
+import json
+from typing import Any, List, Tuple
+
+CLOSERS = {"{": "}", "[": "]"}
+
+
+class JSONStreamRepairer:
+    """Incremental, tolerant JSON extractor for LLM output.
+
+    Feed the response text (all at once or chunk by chunk). Leading prose and
+    code fences are skipped, trailing commas are dropped, and once the first
+    top-level value closes the rest of the output is ignored. A truncated
+    response is repaired by closing open strings and containers, or by cutting
+    back to the last complete member.
+    """
+
+    def __init__(self):
+        self.out: List[str] = []
+        self.stack: List[str] = []
+        self.in_string = False
+        self.escape = False
+        self.done = False
+        # Last point where cutting the output leaves valid JSON: (length, stack)
+        self.safe_point: Tuple[int, List[str]] = (0, [])
+
+    def feed(self, chunk: str):
+        """Consume more response text"""
+        for char in chunk:
+            if self.done:
+                return
+            if not self.stack:
+                if char in CLOSERS:
+                    self._open(char)
+                continue
+
+            if self.in_string:
+                self.out.append(char)
+                if self.escape:
+                    self.escape = False
+                elif char == "\\":
+                    self.escape = True
+                elif char == '"':
+                    self.in_string = False
+                continue
+
+            if char == '"':
+                self.in_string = True
+                self.out.append(char)
+            elif char in CLOSERS:
+                self._open(char)
+            elif char in "}]":
+                self._close(char)
+            elif char == ",":
+                self.safe_point = (len(self.out), list(self.stack))
+                self.out.append(char)
+            else:
+                self.out.append(char)
+
+    def _open(self, char: str):
+        self.out.append(char)
+        self.stack.append(char)
+        self.safe_point = (len(self.out), list(self.stack))
+
+    def _close(self, char: str):
+        # Drop trailing commas before a closing bracket
+        while self.out and self.out[-1] in " \t\r\n,":
+            self.out.pop()
+        self.out.append(CLOSERS[self.stack.pop()])
+        if not self.stack:
+            self.done = True
+
+    def candidates(self) -> List[str]:
+        """Repaired JSON texts, most complete first"""
+        text = "".join(self.out)
+        if self.done:
+            return [text]
+
+        results = []
+        closed = text
+        if self.in_string:
+            closed = closed[:-1] if self.escape else closed
+            closed += '"'
+        closed = closed.rstrip(" \t\r\n,:")
+        results.append(closed + "".join(CLOSERS[c] for c in reversed(self.stack)))
+
+        length, stack = self.safe_point
+        cut = text[:length].rstrip(" \t\r\n,")
+        results.append(cut + "".join(CLOSERS[c] for c in reversed(stack)))
+        return results
+
+    def result(self) -> Any:
+        """Parse the repaired JSON, raising ValueError if nothing usable was found"""
+        if not self.out:
+            raise ValueError("no JSON value in response")
+        for candidate in self.candidates():
+            try:
+                return json.loads(candidate)
+            except json.JSONDecodeError:
+                continue
+        raise ValueError("could not repair JSON in response")
+
+
+def loads_tolerant(text: str, max_attempts: int = 10) -> Any:
+    """Parse the first usable JSON object/array in LLM output"""
+    start = 0
+    for _ in range(max_attempts):
+        positions = [p for p in (text.find("{", start), text.find("[", start)) if p != -1]
+        if not positions:
+            break
+        start = min(positions)
+        repairer = JSONStreamRepairer()
+        repairer.feed(text[start:])
+        try:
+            return repairer.result()
+        except ValueError:
+            # A stray bracket in prose - retry from the next one
+            start += 1
+    raise ValueError("no JSON value in response")
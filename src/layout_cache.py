@@ -0,0 +1,174 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+from src.config import config
+from src.disk_cache import DiskCache
+
+# Bump when stored fields change meaning so old layouts are ignored
+LAYOUT_VERSION = 1
+
+# Locator for an element: a unique automation id, then its id, then its
+# position under the nearest such ancestor
+XPATH_FUNCTION = """
+function getXPath(element) {
+    // Workday automation ids are the same on every posting of a tenant
+    var automationId = element.getAttribute && element.getAttribute('data-automation-id');
+    if (automationId && document.querySelectorAll(
+            "[data-automation-id='" + automationId + "']").length === 1) {
+        return "//*[@data-automation-id='" + automationId + "']";
+    }
+    if (element.id !== '') {
+        return "//*[@id='" + element.id + "']";
+    }
+    if (element === document.body) {
+        return '/html/body';
+    }
+    var ix = 0;
+    var siblings = element.parentNode.childNodes;
+    for (var i = 0; i < siblings.length; i++) {
+        var sibling = siblings[i];
+        if (sibling === element) {
+            return getXPath(element.parentNode) + '/' + element.tagName.toLowerCase() + '[' + (ix + 1) + ']';
+        }
+        if (sibling.nodeType === 1 && sibling.tagName === element.tagName) {
+            ix++;
+        }
+    }
+}
+"""
+
+# Every control field detection looks at
+CONTROL_SELECTOR = ("input:not([type]), input[type=''], input[type='text'], input[type='email'], "
+                    "input[type='tel'], input[type='number'], input[type='date'], input[type='url'], "
+                    "textarea, select, input[type='radio'], input[type='checkbox'], "
+                    "button[aria-haspopup='listbox']")
+
+# Structural signature of every visible form control in one round trip.
+# Labels and values are left out so a step matches across postings; stored
+# labels are checked against LABELS_SCRIPT before answers are reused.
+LAYOUT_SCRIPT = """
+const selector = arguments[0];
+const signature = [];
+document.querySelectorAll(selector).forEach((el) => {
+    if (el.disabled || !(el.offsetWidth || el.offsetHeight || el.getClientRects().length)) return;
+    const owner = el.closest('[data-automation-id]');
+    signature.push([
+        el.tagName.toLowerCase(),
+        el.getAttribute('type') || '',
+        owner ? owner.getAttribute('data-automation-id') : '',
+        el.getAttribute('name') || ''
+    ].join(':'));
+});
+return {host: location.hostname, signature: signature};
+"""
+
+# Current label of each stored locator, read the way field detection reads
+# it: the <label for>, short parent text, placeholder, then name. Null when
+# the locator no longer resolves.
+LABELS_SCRIPT = """
+return arguments[0].map((xpath) => {
+    const el = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    if (!el) return null;
+    if (el.id) {
+        const label = document.querySelector("label[for='" + el.id + "']");
+        if (label) return label.innerText.trim();
+    }
+    const text = el.parentElement ? el.parentElement.innerText.trim() : '';
+    if (text && text.length < 100) return text;
+    return el.getAttribute('placeholder') || (el.getAttribute('name') || '').replace(/_/g, ' ');
+});
+"""
+
+
+@dataclass
+class PageLayout:
+    """Tenant host plus a fingerprint of the page's form structure"""
+    host: str
+    fingerprint: str
+    controls: int
+
+
+def read_page_layout(driver: Any) -> Optional[PageLayout]:
+    """Fingerprint the current page, or None when it has no form controls"""
+    try:
+        raw = driver.execute_script(LAYOUT_SCRIPT, CONTROL_SELECTOR) or {}
+    except Exception as e:
+        print(f"⚠️ Could not fingerprint page layout: {e}")
+        return None
+    return layout_from_signature(raw.get("host", ""), raw.get("signature") or [])
+
+
+def layout_from_signature(host: str, signature: List[str]) -> Optional[PageLayout]:
+    """PageLayout for "tag:type:owner automation id:name" control signatures"""
+    if not signature:
+        return None
+    digest = hashlib.sha256("\n".join(signature).encode("utf-8")).hexdigest()
+    return PageLayout(host=host, fingerprint=digest, controls=len(signature))
+
+
+def read_labels(driver: Any, xpaths: List[str]) -> Optional[List[Optional[str]]]:
+    """Current label for each locator, or None when the page could not be read"""
+    try:
+        return driver.execute_script(LABELS_SCRIPT, xpaths)
+    except Exception as e:
+        print(f"⚠️ Could not read field labels: {e}")
+        return None
+
+
+def _normalize_label(label: str) -> str:
+    return " ".join(label.split()).casefold()
+
+
+def changed_labels(records: List[Dict[str, Any]], labels: List[Optional[str]]) -> List[int]:
+    """Indices of stored records whose control now carries a different label.
+
+    Same-structure pages can ask different questions (two Yes/No dropdowns),
+    so a stored answer only fits while its label does. Locators that no
+    longer resolve are left to the stale-layout check.
+    """
+    return [i for i, (record, label) in enumerate(zip(records, labels))
+            if label is not None and _normalize_label(label) != _normalize_label(record.get("label", ""))]
+
+
+class LayoutCache:
+    """Detected fields and resolved values per tenant page layout.
+
+    Workday tenants render the same steps for every posting, so a page seen
+    before can skip label extraction and mapping. Entries are also keyed by
+    candidate, since the stored values are that candidate's answers.
+    """
+
+    def __init__(self, cache: DiskCache = None):
+        self.cache = cache or DiskCache(path=config.layout_cache_path, ttl=config.layout_cache_ttl)
+
+    @staticmethod
+    def candidate_key(profile: Any) -> str:
+        return DiskCache.make_key(**profile.to_dict()) if profile else ""
+
+    def _key(self, layout: PageLayout, candidate: str) -> str:
+        return DiskCache.make_key(tenant=layout.host, fingerprint=layout.fingerprint,
+                                  candidate=candidate, version=LAYOUT_VERSION)
+
+    def load(self, layout: PageLayout, candidate: str) -> Optional[List[Dict[str, Any]]]:
+        cached = self.cache.get(self._key(layout, candidate))
+        return json.loads(cached) if cached else None
+
+    def save(self, layout: PageLayout, candidate: str, fields: List[Dict[str, Any]]):
+        self.cache.set(self._key(layout, candidate), json.dumps(fields))
+
+    def invalidate(self, layout: PageLayout, candidate: str):
+        self.cache.delete(self._key(layout, candidate))
+
+
+_layout_cache = None
+
+
+def get_layout_cache() -> Optional[LayoutCache]:
+    """Process-wide layout cache, or None when disabled"""
+    global _layout_cache
+    if not config.layout_cache_enabled:
+        return None
+    if _layout_cache is None:
+        _layout_cache = LayoutCache()
+    return _layout_cache
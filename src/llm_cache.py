@@ -0,0 +1,44 @@
+import threading
+from typing import Optional
+from src.config import config
+from src.disk_cache import DiskCache
+
+
+class LLMResponseCache(DiskCache):
+    """LLM response cache with the LLM_CACHE_* limits.
+
+    Only deterministic requests are cached unless explicitly opted in.
+    """
+
+    def __init__(self, path: str = None, memory_entries: int = None, disk_entries: int = None,
+                 ttl: float = None):
+        super().__init__(path or config.llm_cache_path, ttl or config.llm_cache_ttl,
+                         memory_entries=memory_entries or config.llm_cache_memory_entries,
+                         disk_entries=disk_entries or config.llm_cache_disk_entries)
+        self._stats["bypassed"] = 0
+
+    def should_cache(self, temperature: float, use_cache: Optional[bool] = None) -> bool:
+        """Sampled (temperature > 0) responses are only cached on opt-in"""
+        if use_cache is not None:
+            cacheable = use_cache
+        else:
+            cacheable = temperature <= 0 or config.llm_cache_nondeterministic
+        if not cacheable:
+            with self._lock:
+                self._stats["bypassed"] += 1
+        return cacheable
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> Optional[LLMResponseCache]:
+    """Process-wide cache shared by all clients, or None when disabled"""
+    global _default_cache
+    if not config.llm_cache_enabled:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = LLMResponseCache()
+    return _default_cache
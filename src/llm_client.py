@@ -1,25 +1,91 @@
 import requests
 import json
-from typing import Dict, Any, Optional
+import threading
+from typing import Callable, Dict, Any, Optional, Union
 from src.config import config
+from src.json_repair import loads_tolerant
+from src.llm_cache import LLMResponseCache, get_default_cache
+
+# None for free text, "json" for any JSON object, or a JSON schema dict
+ResponseFormat = Optional[Union[str, Dict[str, Any]]]
+
+def resolve_temperature(temperature: Optional[float]) -> float:
+    """Requested temperature, with 0 kept as a valid (deterministic) value"""
+    return config.temperature if temperature is None else temperature
 
 class LLMClient:
-    def __init__(self, api_url: str = None, model: str = None):
+    # Ollama keeps the primed `context` server side, so session mode only
+    # sends the per-page fields
+    keeps_context = True
+
+    def __init__(self, api_url: str = None, model: str = None, cache: LLMResponseCache = None):
         self.api_url = api_url or config.llm_api_url
         self.model = model or config.llm_model
+        self.cache = cache or get_default_cache()
+    
+    def generate_response(self, prompt: str, max_length: int = None, temperature: float = None,
+                          system: str = None, response_format: ResponseFormat = None,
+                          use_cache: bool = None, cache_ttl: float = None) -> str:
+        """Generate a response, served from the response cache when possible
+        
+        Deterministic requests (temperature 0) are cached by default; pass
+        `use_cache=True` to also cache sampled responses, `False` to bypass.
+        """
+        key_parts = {"prompt": prompt, "system": system}
+        return self._cached(key_parts, lambda: self._generate(prompt, max_length, temperature, system, response_format),
+                            max_length, temperature, response_format, use_cache, cache_ttl)
+    
+    def _cached(self, key_parts: Dict[str, Any], produce, max_length: int, temperature: float,
+                response_format: ResponseFormat, use_cache: bool = None, cache_ttl: float = None,
+                parse: Callable[[str], Any] = None) -> Any:
+        """Look up a response in the cache, producing and storing it on a miss
+        
+        With `parse`, the parsed response is returned and only responses that
+        parse are stored; a cached one that no longer parses is dropped.
+        """
+        parse = parse or (lambda response: response)
+        temperature = resolve_temperature(temperature)
+        if self.cache is None or not self.cache.should_cache(temperature, use_cache):
+            return parse(produce())
         
-    def generate_response(self, prompt: str, max_length: int = None, temperature: float = None) -> str:
-        """Generate response using open source LLM (Ollama by default)"""
+        key = self.cache.make_key(backend=type(self).__name__, api_url=self.api_url, model=self.model,
+                                  max_length=max_length or config.max_response_length,
+                                  temperature=temperature, response_format=response_format, **key_parts)
+        cached = self.cache.get(key)
+        if cached is not None:
+            try:
+                return parse(cached)
+            except ValueError:
+                self.cache.delete(key)
+        
+        response = produce()
+        result = parse(response)
+        if response:
+            self.cache.set(key, response, ttl=cache_ttl)
+        return result
+    
+    def _generate(self, prompt: str, max_length: int = None, temperature: float = None,
+                  system: str = None, response_format: ResponseFormat = None) -> str:
+        """Generate response using open source LLM (Ollama by default)
+
+        `system` carries static instructions separately from the prompt so the
+        server can reuse the evaluated prefix between calls. `response_format`
+        is passed as Ollama's `format` to constrain decoding to JSON.
+        """
         try:
             payload = {
                 "model": self.model,
                 "prompt": prompt,
                 "stream": False,
                 "options": {
-                    "temperature": temperature or config.temperature,
+                    "temperature": resolve_temperature(temperature),
                     "num_predict": max_length or config.max_response_length
                 }
             }
+            if system:
+                payload["system"] = system
+            if response_format:
+                payload["format"] = response_format
             
             response = requests.post(self.api_url, json=payload, timeout=60)
             response.raise_for_status()
@@ -35,19 +101,145 @@ class LLMClient:
     def test_connection(self) -> bool:
         """Test if LLM service is available"""
         try:
-            test_response = self.generate_response("Hello", max_length=10)
+            # Short TTL so repeated checks are cheap but outages still show up quickly
+            test_response = self.generate_response("Hello", max_length=10, temperature=0, cache_ttl=60)
             return len(test_response) > 0
         except:
             return False
+    
+    def generate_json(self, prompt: str, schema: Dict[str, Any] = None, max_length: int = None,
+                      temperature: float = None, system: str = None) -> Any:
+        """Generate structured output and parse it tolerantly; unparseable answers are not cached"""
+        response_format = schema or "json"
+        key_parts = {"prompt": prompt, "system": system}
+        return self._cached(key_parts, lambda: self._generate(prompt, max_length, temperature, system, response_format),
+                            max_length, temperature, response_format, parse=loads_tolerant)
+    
+    def start_session(self, system: str = None, primer: str = "") -> "LLMSession":
+        """Prime the model once and reuse its context for follow-up prompts"""
+        return OllamaSession(self, system=system, primer=primer)
+
+class LLMSession:
+    """Stateless session: resends system prompt and primer as a stable prefix"""
+    
+    def __init__(self, client: LLMClient, system: str = None, primer: str = ""):
+        self.client = client
+        self.system = system
+        self.primer = primer
+    
+    def generate(self, prompt: str, max_length: int = None, temperature: float = None,
+                 response_format: ResponseFormat = None) -> str:
+        """Generate a response for a follow-up prompt within this session"""
+        return self.client.generate_response(self.primer + prompt, max_length=max_length,
+                                             temperature=temperature, system=self.system,
+                                             response_format=response_format)
+    
+    def generate_json(self, prompt: str, schema: Dict[str, Any] = None, max_length: int = None,
+                      temperature: float = None) -> Any:
+        """Structured output within this session, parsed tolerantly"""
+        return self.client.generate_json(self.primer + prompt, schema=schema, max_length=max_length,
+                                         temperature=temperature, system=self.system)
+    
+    def close(self):
+        """Release session state"""
+        pass
+
+class OllamaSession(LLMSession):
+    """Ollama session that keeps the primed `context` and the model loaded.
+    
+    Every follow-up is sent on top of the primer's context, so the server
+    finds the same token prefix in its KV cache and only prefills the new
+    prompt.
+    """
+    
+    def __init__(self, client: LLMClient, system: str = None, primer: str = ""):
+        super().__init__(client, system=system, primer=primer)
+        self.context = None
+        self._lock = threading.Lock()
+    
+    def _post(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        payload.update({
+            "model": self.client.model,
+            "stream": False,
+            "keep_alive": config.llm_keep_alive
+        })
+        try:
+            response = requests.post(self.client.api_url, json=payload, timeout=60)
+            response.raise_for_status()
+            result = response.json()
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"LLM API error: {str(e)}")
+        except json.JSONDecodeError as e:
+            raise Exception(f"Invalid JSON response: {str(e)}")
+        
+        prefill_ms = result.get("prompt_eval_duration", 0) / 1e6
+        print(f"⏱️ Ollama prefill: {result.get('prompt_eval_count', 0)} tokens in {prefill_ms:.0f} ms")
+        return result
+    
+    def prime(self):
+        """Evaluate system prompt and primer once and keep the resulting context"""
+        payload = {
+            "prompt": self.primer,
+            "options": {"temperature": 0, "num_predict": 1}
+        }
+        if self.system:
+            payload["system"] = self.system
+        self.context = self._post(payload).get("context") or []
+    
+    def generate(self, prompt: str, max_length: int = None, temperature: float = None,
+                 response_format: ResponseFormat = None) -> str:
+        if not self._primed():
+            return super().generate(prompt, max_length=max_length, temperature=temperature,
+                                    response_format=response_format)
+        return self._complete(prompt, max_length, temperature, response_format)
+    
+    def generate_json(self, prompt: str, schema: Dict[str, Any] = None, max_length: int = None,
+                      temperature: float = None) -> Any:
+        if not self._primed():
+            return super().generate_json(prompt, schema=schema, max_length=max_length, temperature=temperature)
+        return self._complete(prompt, max_length, temperature, schema or "json", parse=loads_tolerant)
+    
+    def _primed(self) -> bool:
+        """Prime on first use; False when the server returned no context (stateless fallback)"""
+        # Concurrent callers wait for a single priming request
+        with self._lock:
+            if self.context is None:
+                self.prime()
+        return bool(self.context)
+    
+    def _complete(self, prompt: str, max_length: int, temperature: float, response_format: ResponseFormat,
+                  parse: Callable[[str], Any] = None) -> Any:
+        payload = {
+            "prompt": prompt,
+            # Always branch from the primer so the cached prefix stays identical
+            "context": self.context,
+            "options": {
+                "temperature": resolve_temperature(temperature),
+                "num_predict": max_length or config.max_response_length
+            }
+        }
+        if response_format:
+            payload["format"] = response_format
+        
+        key_parts = {"prompt": prompt, "system": self.system, "primer": self.primer}
+        return self.client._cached(key_parts, lambda: self._post(payload).get("response", "").strip(),
+                                   max_length, temperature, response_format, parse=parse)
+    
+    def close(self):
+        self.context = None
 
 # Alternative clients for different LLM services
 class OpenRouterClient(LLMClient):
-    def __init__(self, api_key: str, model: str = "anthropic/claude-3.5-sonnet"):
+    keeps_context = False
+
+    def __init__(self, api_key: str, model: str = "anthropic/claude-3.5-sonnet", cache: LLMResponseCache = None):
         self.api_key = api_key
         self.model = model
         self.api_url = "https://openrouter.ai/api/v1/chat/completions"
+        self.cache = cache or get_default_cache()
         
-    def generate_response(self, prompt: str, max_length: int = None, temperature: float = None) -> str:
+    def _generate(self, prompt: str, max_length: int = None, temperature: float = None,
+                  system: str = None, response_format: ResponseFormat = None) -> str:
         """Generate response using OpenRouter API"""
         try:
             headers = {
@@ -57,17 +249,19 @@ class OpenRouterClient(LLMClient):
                 "X-Title": "Workday Desktop Agent"
             }
             
+            messages = []
+            if system:
+                messages.append({"role": "system", "content": self._system_content(system)})
+            messages.append({"role": "user", "content": prompt})
+            
             payload = {
                 "model": self.model,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+                "messages": messages,
                 "max_tokens": max_length or config.max_response_length,
-                "temperature": temperature or config.temperature
+                "temperature": resolve_temperature(temperature)
             }
+            if response_format:
+                payload["response_format"] = self._response_format(response_format)
             
             response = requests.post(self.api_url, headers=headers, json=payload, timeout=60)
             response.raise_for_status()
@@ -82,27 +276,57 @@ class OpenRouterClient(LLMClient):
         except json.JSONDecodeError as e:
             raise Exception(f"Invalid JSON response: {str(e)}")
     
+    def _response_format(self, response_format: ResponseFormat) -> Dict[str, Any]:
+        """Translate a response format into OpenRouter's `response_format`"""
+        if isinstance(response_format, dict):
+            # Strict mode requires closed objects
+            strict = response_format.get("additionalProperties") is False
+            return {
+                "type": "json_schema",
+                "json_schema": {"name": "response", "strict": strict, "schema": response_format}
+            }
+        return {"type": "json_object"}
+    
+    def _system_content(self, system: str):
+        """System message content; Anthropic models need an explicit cache breakpoint"""
+        if self.model.startswith("anthropic/"):
+            return [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+        # OpenAI/DeepSeek style providers cache identical prefixes automatically
+        return system
+    
     def test_connection(self) -> bool:
         """Test if OpenRouter service is available"""
         try:
-            test_response = self.generate_response("Hello", max_length=10)
+            # Short TTL so repeated checks are cheap but outages still show up quickly
+            test_response = self.generate_response("Hello", max_length=10, temperature=0, cache_ttl=60)
             return len(test_response) > 0
         except:
             return False
+    
+    def start_session(self, system: str = None, primer: str = "") -> LLMSession:
+        """OpenRouter is stateless; provider-side prefix caching reuses the primer"""
+        return LLMSession(self, system=system, primer=primer)
 
 class HuggingFaceClient(LLMClient):
-    def __init__(self, api_token: str, model: str = "microsoft/DialoGPT-medium"):
+    keeps_context = False
+
+    def __init__(self, api_token: str, model: str = "microsoft/DialoGPT-medium", cache: LLMResponseCache = None):
         self.api_token = api_token
         self.model = model
         self.api_url = f"https://api-inference.huggingface.co/models/{model}"
+        self.cache = cache or get_default_cache()
     
-    def generate_response(self, prompt: str, max_length: int = None, temperature: float = None) -> str:
+    def _generate(self, prompt: str, max_length: int = None, temperature: float = None,
+                  system: str = None, response_format: ResponseFormat = None) -> str:
+        # No constrained decoding here; generate_json relies on the repair parser
         headers = {"Authorization": f"Bearer {self.api_token}"}
+        if system:
+            prompt = f"{system}\n{prompt}"
         payload = {
             "inputs": prompt,
             "parameters": {
                 "max_length": max_length or config.max_response_length,
-                "temperature": temperature or config.temperature
+                "temperature": resolve_temperature(temperature)
             }
         }
         
@@ -112,4 +336,7 @@ class HuggingFaceClient(LLMClient):
         result = response.json()
         if isinstance(result, list) and len(result) > 0:
             return result[0].get("generated_text", "").replace(prompt, "").strip()
-        return ""
\ No newline at end of file
+        return ""
+    
+    def start_session(self, system: str = None, primer: str = "") -> LLMSession:
+        return LLMSession(self, system=system, primer=primer)
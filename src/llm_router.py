@@ -0,0 +1,178 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Any, List, Optional
+from src.config import config
+from src.llm_cache import LLMResponseCache, get_default_cache
+from src.llm_client import LLMClient, LLMSession, OpenRouterClient, HuggingFaceClient, ResponseFormat
+
+
+class BackendStats:
+    """Rolling latency and error statistics for one backend"""
+
+    def __init__(self, window: int = None):
+        window = window or config.router_window
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)  # True for success
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, success: bool):
+        with self._lock:
+            self.outcomes.append(success)
+            if success:
+                self.latencies.append(latency)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if not self.latencies:
+                return None
+            ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+        return ordered[index]
+
+    @property
+    def p50(self) -> Optional[float]:
+        return self.percentile(0.5)
+
+    @property
+    def p95(self) -> Optional[float]:
+        return self.percentile(0.95)
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            if not self.outcomes:
+                return 0.0
+            return 1 - sum(self.outcomes) / len(self.outcomes)
+
+    @property
+    def healthy(self) -> bool:
+        # Too few samples to judge counts as healthy
+        return len(self.outcomes) < config.router_min_samples or self.error_rate <= config.router_max_error_rate
+
+
+class LLMRouter(LLMClient):
+    """Routes each request to the fastest healthy backend.
+
+    When the chosen backend runs past its own p95 latency, a hedged copy of
+    the request goes to the next backend and whichever answers first wins.
+    Failed requests fail over to the remaining backends in order.
+    """
+
+    keeps_context = False
+
+    def __init__(self, backends: List[LLMClient], hedge: bool = True, cache: LLMResponseCache = None):
+        if not backends:
+            raise ValueError("LLMRouter needs at least one backend")
+        self.backends = backends
+        self.hedge = hedge
+        self.model = "+".join(f"{type(b).__name__}:{b.model}" for b in backends)
+        self.api_url = "router"
+        # Cache at the router level; backends are called uncached
+        self.cache = cache or get_default_cache()
+        self.stats: Dict[int, BackendStats] = {id(b): BackendStats() for b in backends}
+        self.executor = ThreadPoolExecutor(max_workers=max(2, 2 * len(backends) * config.llm_max_workers))
+
+    def ranked_backends(self) -> List[LLMClient]:
+        """Healthy backends by error rate then p50 latency (unmeasured first), then unhealthy ones"""
+        def sort_key(backend):
+            stats = self.stats[id(backend)]
+            p50 = stats.p50
+            return (not stats.healthy, stats.error_rate, p50 is not None, p50 or 0.0)
+        return sorted(self.backends, key=sort_key)
+
+    def _call(self, backend: LLMClient, prompt: str, max_length: int, temperature: float,
+              system: str, response_format: ResponseFormat) -> str:
+        started = time.time()
+        try:
+            response = backend._generate(prompt, max_length, temperature, system, response_format)
+        except Exception:
+            self.stats[id(backend)].record(time.time() - started, False)
+            raise
+        self.stats[id(backend)].record(time.time() - started, True)
+        return response
+
+    def _generate(self, prompt: str, max_length: int = None, temperature: float = None,
+                  system: str = None, response_format: ResponseFormat = None) -> str:
+        args = (prompt, max_length, temperature, system, response_format)
+        order = self.ranked_backends()
+        pending = {self.executor.submit(self._call, order[0], *args): order[0]}
+        remaining = order[1:]
+        errors = []
+
+        hedge_after = None
+        if self.hedge and remaining and self.stats[id(order[0])].p95 is not None:
+            hedge_after = max(config.router_min_hedge_delay, self.stats[id(order[0])].p95)
+
+        while pending:
+            done, _ = wait(pending, timeout=hedge_after, return_when=FIRST_COMPLETED)
+            if not done:
+                # Primary is slower than its p95 - race a duplicate on the next backend
+                backend = remaining.pop(0)
+                print(f"⏩ Hedging LLM request to {type(backend).__name__} ({backend.model})")
+                pending[self.executor.submit(self._call, backend, *args)] = backend
+                hedge_after = None
+                continue
+
+            for future in done:
+                backend = pending.pop(future)
+                try:
+                    return future.result()
+                except Exception as e:
+                    errors.append(f"{type(backend).__name__}: {e}")
+
+            # Fail over only once nothing is in flight
+            if not pending and remaining:
+                backend = remaining.pop(0)
+                pending[self.executor.submit(self._call, backend, *args)] = backend
+
+        raise Exception(f"All LLM backends failed: {'; '.join(errors)}")
+
+    def start_session(self, system: str = None, primer: str = "") -> LLMSession:
+        """Routed requests are stateless; the primer is resent as a stable prefix"""
+        return LLMSession(self, system=system, primer=primer)
+
+    def close(self):
+        """Stop the request pool; in-flight hedged requests are abandoned"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Per-backend latency and error statistics"""
+        rows = []
+        for backend in self.backends:
+            stats = self.stats[id(backend)]
+            rows.append({
+                "backend": type(backend).__name__,
+                "model": backend.model,
+                "p50": stats.p50,
+                "p95": stats.p95,
+                "error_rate": stats.error_rate,
+                "healthy": stats.healthy
+            })
+        return rows
+
+
+def build_default_llm_client() -> LLMClient:
+    """Client for the backends listed in LLM_BACKENDS; routed when more than one"""
+    backends = []
+    for name in [n.strip().lower() for n in config.llm_backends.split(",") if n.strip()]:
+        if name == "openrouter":
+            if config.openrouter_api_key:
+                backends.append(OpenRouterClient(config.openrouter_api_key, model=config.openrouter_model))
+            else:
+                print("⚠️ OPENROUTER_API_KEY is not set, skipping the OpenRouter backend")
+        elif name == "ollama":
+            backends.append(LLMClient())
+        elif name == "huggingface" and os.getenv("HF_API_TOKEN"):
+            backends.append(HuggingFaceClient(os.getenv("HF_API_TOKEN")))
+        else:
+            print(f"⚠️ Skipping unknown or unconfigured LLM backend: {name}")
+
+    if not backends:
+        print(f"⚠️ No LLM backend configured, falling back to the local Ollama server at {config.llm_api_url}")
+        backends.append(LLMClient())
+    if len(backends) == 1:
+        return backends[0]
+    return LLMRouter(backends)
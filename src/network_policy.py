@@ -0,0 +1,110 @@
+import json
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+from typing import Any, Dict, List, Optional
+from src.config import config
+
+# Third-party requests the agent never needs, by category
+BLOCKED_URL_PATTERNS: Dict[str, List[str]] = {
+    "analytics": ["*google-analytics.com*", "*googletagmanager.com*", "*analytics.google.com*", "*segment.io*",
+                  "*segment.com/analytics*", "*hotjar.com*", "*mixpanel.com*", "*fullstory.com*",
+                  "*quantserve.com*", "*clarity.ms*", "*optimizely.com*"],
+    "ads": ["*doubleclick.net*", "*googleadservices.com*", "*facebook.net*", "*facebook.com/tr*",
+            "*linkedin.com/px*", "*ads.linkedin.com*", "*bing.com/bat*", "*adsrvr.org*"],
+    "chat": ["*intercom.io*", "*intercomcdn.com*", "*drift.com*", "*livechatinc.com*", "*zopim.com*",
+             "*zdassets.com*", "*olark.com*", "*paradox.ai*"],
+    "monitoring": ["*nr-data.net*", "*newrelic.com*", "*sentry.io*", "*browser-intake-datadoghq.com*",
+                   "*dynatrace.com*"],
+}
+
+# Resource types, blocked by URL since execute_cdp_cmd can't answer Fetch.requestPaused events
+RESOURCE_TYPE_PATTERNS: Dict[str, List[str]] = {
+    "font": ["*.woff", "*.woff?*", "*.woff2", "*.woff2?*", "*.ttf", "*.otf", "*.eot",
+             "*fonts.googleapis.com*", "*fonts.gstatic.com*"],
+    "media": ["*.mp4", "*.webm", "*.mp3", "*.ogg", "*.m4a", "*.mov"],
+    "image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.ico"],
+}
+
+
+@dataclass
+class NetworkPolicy:
+    """URL patterns Chrome refuses to load, grouped by category for reporting"""
+    patterns: Dict[str, List[str]] = field(default_factory=dict)
+
+    @classmethod
+    def from_config(cls) -> "NetworkPolicy":
+        patterns = {category: list(urls) for category, urls in BLOCKED_URL_PATTERNS.items()
+                    if category in _split(config.blocked_categories)}
+        for resource_type in _split(config.blocked_resource_types):
+            if resource_type in RESOURCE_TYPE_PATTERNS:
+                patterns[resource_type] = list(RESOURCE_TYPE_PATTERNS[resource_type])
+        extra = _split(config.blocked_urls)
+        if extra:
+            patterns["custom"] = extra
+        return cls(patterns)
+
+    def urls(self) -> List[str]:
+        return [url for urls in self.patterns.values() for url in urls]
+
+    def category(self, url: str) -> str:
+        for category, urls in self.patterns.items():
+            if any(fnmatch(url, pattern) for pattern in urls):
+                return category
+        return "other"
+
+
+def _split(value: str) -> List[str]:
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+
+@dataclass
+class PageNetworkStats:
+    """Requests seen since the last report"""
+    requests: int = 0
+    bytes: int = 0
+    blocked: int = 0
+    blocked_by: Dict[str, int] = field(default_factory=dict)
+
+    def summary(self) -> str:
+        blocked = ", ".join(f"{category} {count}" for category, count in
+                            sorted(self.blocked_by.items(), key=lambda item: -item[1]))
+        return (f"{self.requests - self.blocked} requests, {self.bytes / 1024:.0f} KB loaded; "
+                f"{self.blocked} blocked" + (f" ({blocked})" if blocked else ""))
+
+
+def enable_network_logging(options: Any):
+    """Chrome options for reading network events from the performance log"""
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+
+def apply_network_policy(driver: Any, policy: NetworkPolicy):
+    """Block the policy's URLs for every later request of this browser"""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": policy.urls()})
+
+
+def collect_network_stats(driver: Any, policy: Optional[NetworkPolicy] = None) -> PageNetworkStats:
+    """Drain the performance log into request, byte and blocked counts"""
+    stats = PageNetworkStats()
+    urls: Dict[str, str] = {}
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        return stats
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        method, params = message.get("method"), message.get("params", {})
+        if method == "Network.requestWillBeSent":
+            stats.requests += 1
+            urls[params.get("requestId")] = params.get("request", {}).get("url", "")
+        elif method == "Network.loadingFinished":
+            stats.bytes += int(params.get("encodedDataLength") or 0)
+        elif method == "Network.loadingFailed" and params.get("blockedReason") == "inspector":
+            stats.blocked += 1
+            category = policy.category(urls.get(params.get("requestId"), "")) if policy else "other"
+            stats.blocked_by[category] = stats.blocked_by.get(category, 0) + 1
+    return stats
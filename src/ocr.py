@@ -0,0 +1,146 @@
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+from src.config import config
+from src.disk_cache import DiskCache
+from src.pdf_extract import PyMuPDFBackend
+
+# Bump when preprocessing changes so cached page texts are recomputed
+PREPROCESS_VERSION = 1
+
+
+def needs_ocr(text: str, pages: int) -> bool:
+    """True when the text layer is too thin to be a real (non-scanned) resume"""
+    characters = len("".join(text.split()))
+    return characters < config.ocr_min_chars_per_page * max(pages, 1)
+
+
+def render_pages(file_path: str) -> List[bytes]:
+    """One encoded image per page.
+
+    Uses PyMuPDF to rasterize at config.ocr_dpi when installed. Otherwise the
+    largest embedded image of each page is used, which is the scan itself for
+    image-only PDFs.
+    """
+    if PyMuPDFBackend.available():
+        import fitz
+        with fitz.open(file_path) as doc:
+            return [page.get_pixmap(dpi=config.ocr_dpi, colorspace=fitz.csGRAY).tobytes("png") for page in doc]
+
+    import PyPDF2
+    images = []
+    with open(file_path, 'rb') as file:
+        for index, page in enumerate(PyPDF2.PdfReader(file).pages):
+            try:
+                embedded = [image.data for image in page.images]
+            except Exception as e:
+                print(f"⚠️ Could not read images on page {index + 1}: {e}")
+                embedded = []
+            images.append(max(embedded, key=len) if embedded else b"")
+    return images
+
+
+def deskew(gray):
+    """Rotate a grayscale page so text lines are horizontal"""
+    import cv2
+    _, inverted = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    points = cv2.findNonZero(inverted)
+    if points is None:
+        return gray
+
+    # The angle convention differs across OpenCV versions; map it to (-45, 45]
+    angle = cv2.minAreaRect(points)[-1] % 90
+    if angle > 45:
+        angle -= 90
+    if abs(angle) < 0.1 or abs(angle) > config.ocr_max_skew:
+        return gray
+
+    height, width = gray.shape
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+    return cv2.warpAffine(gray, matrix, (width, height), flags=cv2.INTER_CUBIC, borderMode=cv2.BORDER_REPLICATE)
+
+
+def preprocess_page(image: bytes):
+    """Decode, deskew and binarize a page image for Tesseract"""
+    import cv2
+    import numpy as np
+    gray = cv2.imdecode(np.frombuffer(image, np.uint8), cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        raise ValueError("Unreadable page image")
+
+    gray = deskew(gray)
+    # Light denoise, then Otsu picks the ink/paper threshold per page
+    blurred = cv2.GaussianBlur(gray, (3, 3), 0)
+    _, binary = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return binary
+
+
+def _ocr_page(image: bytes) -> str:
+    """Process pool worker: OCR one page image"""
+    import pytesseract
+    # Pages are already spread over cores; stop Tesseract threading on top of that
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+    if config.tesseract_path:
+        pytesseract.pytesseract.tesseract_cmd = config.tesseract_path
+    return pytesseract.image_to_string(preprocess_page(image), lang=config.ocr_language)
+
+
+def page_cache_key(image: bytes) -> str:
+    return DiskCache.make_key(
+        page=hashlib.sha256(image).hexdigest(),
+        language=config.ocr_language,
+        preprocess=PREPROCESS_VERSION
+    )
+
+
+_page_cache = None
+
+
+def get_page_cache() -> Optional[DiskCache]:
+    """Process-wide page hash -> OCR text store"""
+    global _page_cache
+    if _page_cache is None:
+        _page_cache = DiskCache(path=config.ocr_cache_path, ttl=config.ocr_cache_ttl)
+    return _page_cache
+
+
+def ocr_pdf_text(file_path: str, workers: int = None) -> str:
+    """OCR every page, reusing cached text for pages seen before"""
+    images = render_pages(file_path)
+    cache = get_page_cache()
+    texts: List[Optional[str]] = [None] * len(images)
+    missing = []
+    for index, image in enumerate(images):
+        if not image:
+            texts[index] = ""
+            continue
+        cached = cache.get(page_cache_key(image))
+        if cached is not None:
+            texts[index] = cached
+        else:
+            missing.append(index)
+
+    print(f"🔍 OCR: {len(images)} pages, {len(images) - len(missing)} from cache")
+    workers = min(workers or config.ocr_workers or os.cpu_count() or 1, len(missing))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [(index, executor.submit(_ocr_page, images[index])) for index in missing]
+            results = [(index, _page_result(index, future.result)) for index, future in futures]
+    else:
+        results = [(index, _page_result(index, lambda: _ocr_page(images[index]))) for index in missing]
+
+    for index, text in results:
+        texts[index] = text or ""
+        # Failed pages are retried next time instead of caching an empty result
+        if text is not None:
+            cache.set(page_cache_key(images[index]), text)
+    return "\n".join(texts) + "\n"
+
+
+def _page_result(index: int, get_text) -> Optional[str]:
+    try:
+        return get_text()
+    except Exception as e:
+        print(f"⚠️ OCR failed on page {index + 1}: {e}")
+        return None
@@ -0,0 +1,433 @@
+import glob
+import hashlib
+import json
+import os
+import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, fields as dataclass_fields
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+import soupsieve
+from bs4 import BeautifulSoup, Tag
+from src.config import config
+from src.disk_cache import DiskCache
+from src.field_resolver import resolve_field_locally
+from src.form_fields import DATE_MONTH_SEGMENT, FIELD_SELECTORS, SKIPPED_SEGMENTS, UNKNOWN_LABEL, WorkdayField
+from src.layout_cache import CONTROL_SELECTOR, PageLayout, layout_from_signature
+from src.prompt_builder import MappingPromptBuilder
+from src.repeatable_sections import REPEATABLE_SECTIONS, block_control_values
+
+# First line of captured snapshots, so offline runs know the tenant
+SNAPSHOT_HEADER = "<!-- snapshot-url: {url} -->\n"
+SNAPSHOT_URL = re.compile(r"\s*<!-- snapshot-url: (\S*) -->")
+HIDDEN_STYLE = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden")
+HEADING = re.compile(r"^(h[1-4]|legend)$")
+# Markup without live labels or controls (template content is inert), cut
+# before parsing since tree building dominates
+IGNORED_MARKUP = re.compile(r"<(script|style|noscript|svg|template)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+
+# The detection selectors, matched per control instead of run over the whole tree
+CONTROL_TAGS = ("input", "textarea", "select", "button")
+FIELD_MATCHERS = [(soupsieve.compile(selector), field_type) for selector, field_type in FIELD_SELECTORS]
+CONTROL_MATCHER = soupsieve.compile(CONTROL_SELECTOR)
+
+# Bump when detection output changes so cached snapshot detections are redone
+DETECTION_VERSION = 1
+
+# Where a field's value came from
+SOURCE_BLOCK = "block"  # Repeatable experience/education block
+SOURCE_PROFILE = "profile"  # Rule-based candidate profile lookup
+SOURCE_LLM = "llm"
+
+
+def default_parser() -> str:
+    """lxml when installed (several times faster), else the stdlib parser"""
+    try:
+        import lxml  # noqa: F401
+        return "lxml"
+    except ImportError:
+        return "html.parser"
+
+
+def _previous_tags(tag: Any) -> Iterator[Any]:
+    return (node for node in tag.previous_siblings if isinstance(node, Tag))
+
+
+def _closest(tag: Any, predicate: Callable[[Any], bool]) -> Optional[Any]:
+    """Element.closest(): the tag itself or its nearest ancestor matching"""
+    while tag is not None and tag.name != "[document]":
+        if predicate(tag):
+            return tag
+        tag = tag.parent
+    return None
+
+
+class HtmlPage:
+    """A saved page, parsed once, answering the questions live detection asks the browser.
+
+    Visibility is approximated from the markup (hidden attribute, inline
+    display/visibility styles), since stylesheets and layout are not
+    available without a browser. The tree is walked once; every lookup after
+    that works on the controls, labels and automation ids collected there.
+    """
+
+    def __init__(self, html: str, url: str = "", parser: str = None):
+        match = SNAPSHOT_URL.match(html)
+        self.url = url or (match.group(1) if match else "")
+        # Class lists are never read, so skip splitting them
+        self.soup = BeautifulSoup(IGNORED_MARKUP.sub("", html), parser or default_parser(),
+                                  multi_valued_attributes=None)
+        self.controls: List[Any] = []
+        self.labels: Dict[str, Any] = {}
+        self.automation_ids: Dict[str, List[Any]] = {}
+        for tag in self.soup.descendants:
+            if not isinstance(tag, Tag):
+                continue
+            if tag.name in CONTROL_TAGS:
+                self.controls.append(tag)
+            elif tag.name == "label" and tag.get("for"):
+                self.labels.setdefault(tag["for"], tag)
+            automation_id = tag.get("data-automation-id")
+            if automation_id:
+                self.automation_ids.setdefault(automation_id, []).append(tag)
+        self._xpaths: Dict[int, str] = {}
+
+    @property
+    def host(self) -> str:
+        return urlparse(self.url).hostname or ""
+
+    @staticmethod
+    def text(tag: Any) -> str:
+        return tag.get_text("\n", strip=True)
+
+    def displayed(self, tag: Any) -> bool:
+        if tag.get("type") == "hidden":
+            return False
+        while tag is not None and tag.name != "[document]":
+            if tag.has_attr("hidden") or HIDDEN_STYLE.search(tag.get("style", "")):
+                return False
+            tag = tag.parent
+        return True
+
+    def enabled(self, tag: Any) -> bool:
+        return not tag.has_attr("disabled")
+
+    def xpath(self, tag: Any) -> str:
+        """Same locator as layout_cache.XPATH_FUNCTION computes in the browser"""
+        if id(tag) in self._xpaths:
+            return self._xpaths[id(tag)]
+        automation_id = tag.get("data-automation-id")
+        if automation_id and len(self.automation_ids.get(automation_id, ())) == 1:
+            path = f"//*[@data-automation-id='{automation_id}']"
+        elif tag.get("id"):
+            path = f"//*[@id='{tag['id']}']"
+        elif tag.name == "body" or tag.parent is None or tag.parent.name == "[document]":
+            path = "/html/body" if tag.name == "body" else f"/{tag.name}"
+        else:
+            index = 1 + sum(1 for sibling in _previous_tags(tag) if sibling.name == tag.name)
+            path = f"{self.xpath(tag.parent)}/{tag.name}[{index}]"
+        self._xpaths[id(tag)] = path
+        return path
+
+    def label(self, tag: Any) -> str:
+        """Same lookup order as WorkdayAgent._get_field_label"""
+        field_id = tag.get("id")
+        if field_id:
+            label = self.labels.get(field_id)
+            # Live lookup raises when the id has no <label for>, which ends the search
+            return self.text(label) if label is not None else UNKNOWN_LABEL
+        parent_text = self.text(tag.parent) if tag.parent is not None else ""
+        if parent_text and len(parent_text) < 100:
+            return parent_text
+        if tag.get("placeholder"):
+            return tag["placeholder"]
+        if tag.get("name"):
+            return tag["name"].replace("_", " ").title()
+        return UNKNOWN_LABEL
+
+    def section(self, tag: Any) -> str:
+        """Nearest preceding heading or fieldset legend, as FIELD_SECTIONS_SCRIPT"""
+        def heading_text(node):
+            if HEADING.match(node.name or "") or node.get("role") == "heading":
+                return self.text(node)
+            return ""
+
+        while tag is not None and tag.name not in ("body", "[document]"):
+            for sibling in _previous_tags(tag):
+                text = heading_text(sibling)
+                if text:
+                    return text
+            tag = tag.parent
+            if tag is not None and tag.name == "fieldset":
+                legend = tag.find("legend")
+                if legend is not None and self.text(legend):
+                    return self.text(legend)
+        return ""
+
+    def detect_fields(self) -> List[WorkdayField]:
+        """Same selectors, skips and field types as WorkdayAgent.detect_all_form_fields"""
+        fields = []
+        for matcher, field_type in FIELD_MATCHERS:
+            for tag in self.controls:
+                if not matcher.match(tag):
+                    continue
+                if not self.displayed(tag) or not self.enabled(tag) or tag.get("type") == "file":
+                    continue
+                automation_id = tag.get("data-automation-id", "")
+                if automation_id in SKIPPED_SEGMENTS:
+                    continue
+                label, xpath = self.label(tag), self.xpath(tag)
+                if label and xpath:
+                    fields.append(WorkdayField(
+                        label=label,
+                        field_type="date" if automation_id == DATE_MONTH_SEGMENT else field_type,
+                        xpath=xpath,
+                        section=self.section(tag)
+                    ))
+        return fields
+
+    def layout(self) -> Optional[PageLayout]:
+        """Layout fingerprint, matching layout_cache.read_page_layout on the live page"""
+        signature = []
+        for tag in self.controls:
+            if not CONTROL_MATCHER.match(tag) or not self.enabled(tag) or not self.displayed(tag):
+                continue
+            owner = _closest(tag, lambda node: node.has_attr("data-automation-id"))
+            signature.append(":".join([tag.name, tag.get("type", ""),
+                                       owner["data-automation-id"] if owner is not None else "",
+                                       tag.get("name", "")]))
+        return layout_from_signature(self.host, signature)
+
+    def block_controls(self) -> List[Dict[str, Any]]:
+        """Controls inside repeatable experience/education blocks, as repeatable_sections reads them live"""
+        controls = []
+        for spec in REPEATABLE_SECTIONS:
+            sections = self.automation_ids.get(spec.section_id)
+            if not sections:
+                continue
+            pattern = re.compile(rf"^{spec.block_prefix}-(\d+)$")
+            for block in sections[0].find_all(attrs={"data-automation-id": pattern}):
+                index = int(pattern.match(block["data-automation-id"]).group(1)) - 1
+                for tag in block.find_all(CONTROL_TAGS):
+                    if not CONTROL_MATCHER.match(tag):
+                        continue
+                    wrapper = _closest(tag, lambda node: node.get("data-automation-id", "").startswith("formField-"))
+                    key = (wrapper["data-automation-id"][len("formField-"):] if wrapper is not None
+                           else tag.get("data-automation-id") or tag.get("name") or "")
+                    controls.append({"section": spec.name, "index": index, "key": key, "xpath": self.xpath(tag)})
+        return controls
+
+
+@dataclass
+class PageDetection:
+    """What detection found on one snapshot; independent of the resume, so it can be cached"""
+    url: str
+    fingerprint: str
+    fields: List[Dict[str, str]]  # label, field_type, xpath, section
+    block_controls: List[Dict[str, Any]]
+    seconds: float = 0.0
+
+
+@dataclass
+class SnapshotAnalysis:
+    """Detected fields of one snapshot and how each would be answered"""
+    path: str
+    url: str
+    fingerprint: str
+    fields: List[WorkdayField]
+    sources: List[str]  # Per field: block, profile, llm or "" (left for the LLM)
+    prompt_tokens: int = 0  # Estimated mapping prompt size for the fields left for the LLM
+    seconds: float = 0.0
+    cached: bool = False  # Detection came from the snapshot cache
+    errors: List[str] = field(default_factory=list)
+
+    def counts(self) -> Dict[str, int]:
+        counts = Counter(self.sources)
+        return {"fields": len(self.fields), SOURCE_BLOCK: counts[SOURCE_BLOCK],
+                SOURCE_PROFILE: counts[SOURCE_PROFILE], SOURCE_LLM: counts[SOURCE_LLM], "open": counts[""]}
+
+    def open_fields(self) -> List[WorkdayField]:
+        return [f for f, source in zip(self.fields, self.sources) if not source]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "path": self.path, "url": self.url, "fingerprint": self.fingerprint,
+            "seconds": round(self.seconds, 4), "cached": self.cached, "prompt_tokens": self.prompt_tokens,
+            **self.counts(),
+            "fields": [{"label": f.label, "field_type": f.field_type, "section": f.section, "xpath": f.xpath,
+                        "value": f.value, "source": source} for f, source in zip(self.fields, self.sources)],
+            "errors": self.errors,
+        }
+
+
+def detect_page(html: str, url: str = "", parser: str = None) -> PageDetection:
+    """Fields, layout fingerprint and repeatable block controls of one saved page"""
+    started = time.perf_counter()
+    page = HtmlPage(html, url=url, parser=parser)
+    fields = [{"label": f.label, "field_type": f.field_type, "xpath": f.xpath, "section": f.section}
+              for f in page.detect_fields()]
+    layout = page.layout()
+    return PageDetection(url=page.url, fingerprint=layout.fingerprint if layout else "", fields=fields,
+                         block_controls=page.block_controls(), seconds=time.perf_counter() - started)
+
+
+def map_detection(detection: PageDetection, resume: Any = None, profile: Any = None, path: str = "",
+                  prompt_builder: MappingPromptBuilder = None) -> SnapshotAnalysis:
+    """Answer detected fields the way the live run does before the LLM: repeatable blocks, then profile rules.
+
+    Fields left open are what the LLM would get; with a resume, the mapping
+    prompt they need is sized like the live run.
+    """
+    started = time.perf_counter()
+    block_values = block_control_values(detection.block_controls, resume) if resume else {}
+    fields, sources = [], []
+    for record in detection.fields:
+        item = WorkdayField(**record)
+        if item.xpath in block_values:
+            item.value, source = block_values[item.xpath], SOURCE_BLOCK
+        else:
+            item.value = resolve_field_locally(item.label, item.field_type, profile) or ""
+            source = SOURCE_PROFILE if item.value else ""
+        fields.append(item)
+        sources.append(source)
+
+    analysis = SnapshotAnalysis(path=path, url=detection.url, fingerprint=detection.fingerprint,
+                                fields=fields, sources=sources)
+    open_fields = analysis.open_fields()
+    if resume and open_fields:
+        builder = prompt_builder or MappingPromptBuilder()
+        analysis.prompt_tokens = sum(
+            builder.build(resume, [open_fields[i] for i in indices], indices, profile=profile).total_tokens
+            for indices in builder.chunk_fields(open_fields, config.mapping_chunk_tokens))
+    analysis.seconds = detection.seconds + time.perf_counter() - started
+    return analysis
+
+
+def analyze_html(html: str, resume: Any = None, profile: Any = None, path: str = "", url: str = "",
+                 parser: str = None, prompt_builder: MappingPromptBuilder = None) -> SnapshotAnalysis:
+    """Detect, label and rule-map the fields of one saved page"""
+    return map_detection(detect_page(html, url=url, parser=parser), resume, profile, path, prompt_builder)
+
+
+def map_open_fields(analysis: SnapshotAnalysis, resume: Any, llm_client: Any,
+                    prompt_builder: MappingPromptBuilder = None, profile: Any = None) -> int:
+    """Send the fields rules left open to the LLM with the live mapping prompt; returns fields answered"""
+    builder = prompt_builder or MappingPromptBuilder()
+    positions = [i for i, source in enumerate(analysis.sources) if not source]
+    open_fields = [analysis.fields[i] for i in positions]
+    answered = 0
+    for indices in builder.chunk_fields(open_fields, config.mapping_chunk_tokens):
+        prompt = builder.build(resume, [open_fields[i] for i in indices], indices, profile=profile)
+        try:
+            mappings = llm_client.generate_json(prompt.body, schema=builder.mapping_schema(indices),
+                                                max_length=2000, temperature=0, system=prompt.prefix)
+        except Exception as e:
+            analysis.errors.append(f"LLM mapping failed for {len(indices)} fields: {e}")
+            continue
+        for i in indices:
+            value = mappings.get(str(i), "") if isinstance(mappings, dict) else ""
+            if isinstance(value, str) and value.strip():
+                open_fields[i].value = value.strip()
+                analysis.sources[positions[i]] = SOURCE_LLM
+                answered += 1
+    return answered
+
+
+def find_snapshots(source: str) -> List[str]:
+    """HTML snapshots in a directory (recursively) or matching a glob"""
+    if os.path.isdir(source):
+        pattern = os.path.join(source, "**", "*.htm*")
+        return sorted(glob.glob(pattern, recursive=True))
+    return sorted(path for path in glob.glob(source) if os.path.isfile(path))
+
+
+def _detect_file(path: str, parser: str) -> PageDetection:
+    with open(path, encoding="utf-8", errors="replace") as file:
+        return detect_page(file.read(), parser=parser)
+
+
+def _snapshot_key(path: str, parser: str) -> str:
+    with open(path, "rb") as file:
+        digest = hashlib.sha256(file.read()).hexdigest()
+    return DiskCache.make_key(snapshot=digest, parser=parser, version=DETECTION_VERSION)
+
+
+def analyze_snapshots(paths: List[str], resume: Any = None, profile: Any = None, parser: str = None,
+                      llm_client: Any = None, workers: int = None, use_cache: bool = True,
+                      cache: DiskCache = None) -> Iterator[SnapshotAnalysis]:
+    """Analyze snapshots in order. Detection is cached per snapshot content and
+    parser, and runs in `workers` processes for the snapshots not cached yet.
+    """
+    parser = parser or default_parser()
+    builder = MappingPromptBuilder()
+    if use_cache:
+        cache = cache or DiskCache(path=config.snapshot_cache_path, ttl=config.snapshot_cache_ttl)
+    else:
+        cache = None
+    workers = workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 and len(paths) > 1 else None
+    try:
+        # Submit every miss up front so workers stay busy while earlier results are mapped
+        pending = {}
+        for path in paths:
+            try:
+                key = _snapshot_key(path, parser) if cache else ""
+                stored = cache.get(key) if cache else None
+            except OSError:
+                key, stored = "", None
+            if stored:
+                pending[path] = (key, json.loads(stored))
+            elif executor:
+                pending[path] = (key, executor.submit(_detect_file, path, parser))
+            else:
+                pending[path] = (key, None)
+
+        for path in paths:
+            key, job = pending.pop(path)
+            cached = isinstance(job, dict)
+            try:
+                if cached:
+                    detection = PageDetection(**job)
+                else:
+                    detection = job.result() if job is not None else _detect_file(path, parser)
+                    if cache and key:
+                        cache.set(key, json.dumps(asdict(detection)))
+                analysis = map_detection(detection, resume, profile, path, builder)
+                analysis.cached = cached
+            except Exception as e:
+                analysis = SnapshotAnalysis(path=path, url="", fingerprint="", fields=[], sources=[],
+                                            errors=[f"{type(e).__name__}: {e}"])
+            if llm_client is not None and resume and analysis.open_fields():
+                map_open_fields(analysis, resume, llm_client, builder, profile)
+            yield analysis
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+
+
+def load_resume_data(path: str, llm_client: Any = None) -> Any:
+    """ParsedResume from a PDF/DOCX, or from JSON written by bulk-parse or the checkpoint journal"""
+    from src.resume_parser import ParsedResume, ResumeParser
+    if path.lower().endswith((".json", ".jsonl")):
+        with open(path, encoding="utf-8") as file:
+            data = json.loads(file.readline() if path.lower().endswith(".jsonl") else file.read())
+        data = data.get("resume", data)
+        known = {item.name for item in dataclass_fields(ParsedResume)}
+        return ParsedResume(**{key: value for key, value in data.items() if key in known})
+    if llm_client is None:
+        from src.llm_router import build_default_llm_client
+        llm_client = build_default_llm_client()
+    return ResumeParser(llm_client).parse_resume(path)
+
+
+def save_snapshot(html: str, url: str, directory: str, layout: PageLayout = None) -> str:
+    """Write a page's HTML for offline analysis; one file per tenant page layout"""
+    os.makedirs(directory, exist_ok=True)
+    host = urlparse(url).hostname or "page"
+    name = layout.fingerprint[:16] if layout else time.strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(directory, f"{host}-{name}.html")
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(SNAPSHOT_HEADER.format(url=url) + html)
+    return path
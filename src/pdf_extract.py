@@ -0,0 +1,154 @@
+import os
+import sys
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Iterator, Type
+from src.config import config
+
+
+class PDFBackend(ABC):
+    """Text extraction backend; subclasses wrap one PDF library"""
+    name = ""
+    module = ""
+
+    @classmethod
+    def available(cls) -> bool:
+        try:
+            __import__(cls.module)
+            return True
+        except ImportError:
+            return False
+
+    @abstractmethod
+    def page_count(self, file_path: str) -> int:
+        """Number of pages in the document"""
+
+    @abstractmethod
+    def iter_pages(self, file_path: str, start: int = 0, end: int = None) -> Iterator[str]:
+        """Yield the text of pages [start, end) one at a time"""
+
+
+class PyPDF2Backend(PDFBackend):
+    """Baseline backend, always installed with the agent"""
+    name = "pypdf2"
+    module = "PyPDF2"
+
+    def page_count(self, file_path: str) -> int:
+        import PyPDF2
+        with open(file_path, 'rb') as file:
+            return len(PyPDF2.PdfReader(file).pages)
+
+    def iter_pages(self, file_path: str, start: int = 0, end: int = None) -> Iterator[str]:
+        import PyPDF2
+        with open(file_path, 'rb') as file:
+            pages = PyPDF2.PdfReader(file).pages
+            for index in range(start, len(pages) if end is None else min(end, len(pages))):
+                yield pages[index].extract_text() or ""
+
+
+class PyMuPDFBackend(PDFBackend):
+    """PyMuPDF (fitz): fastest, keeps reading order well"""
+    name = "pymupdf"
+    module = "fitz"
+
+    def page_count(self, file_path: str) -> int:
+        import fitz
+        with fitz.open(file_path) as doc:
+            return doc.page_count
+
+    def iter_pages(self, file_path: str, start: int = 0, end: int = None) -> Iterator[str]:
+        import fitz
+        with fitz.open(file_path) as doc:
+            for index in range(start, doc.page_count if end is None else min(end, doc.page_count)):
+                yield doc.load_page(index).get_text("text")
+
+
+class PdfPlumberBackend(PDFBackend):
+    """pdfplumber: slower, good with multi-column layouts"""
+    name = "pdfplumber"
+    module = "pdfplumber"
+
+    def page_count(self, file_path: str) -> int:
+        import pdfplumber
+        with pdfplumber.open(file_path) as pdf:
+            return len(pdf.pages)
+
+    def iter_pages(self, file_path: str, start: int = 0, end: int = None) -> Iterator[str]:
+        import pdfplumber
+        with pdfplumber.open(file_path) as pdf:
+            for page in pdf.pages[start:end]:
+                yield page.extract_text() or ""
+
+
+class PdfMinerBackend(PDFBackend):
+    """pdfminer.six layout analysis"""
+    name = "pdfminer"
+    module = "pdfminer"
+
+    def page_count(self, file_path: str) -> int:
+        from pdfminer.pdfpage import PDFPage
+        with open(file_path, 'rb') as file:
+            return sum(1 for _ in PDFPage.get_pages(file))
+
+    def iter_pages(self, file_path: str, start: int = 0, end: int = None) -> Iterator[str]:
+        from pdfminer.high_level import extract_pages
+        from pdfminer.layout import LTTextContainer
+        # One pass over the document; pages outside the range are skipped unparsed
+        pages = range(start, sys.maxsize if end is None else end)
+        for page in extract_pages(file_path, page_numbers=pages):
+            yield "".join(element.get_text() for element in page if isinstance(element, LTTextContainer))
+
+
+# In order of preference for "auto"
+PDF_BACKENDS: Dict[str, Type[PDFBackend]] = {
+    backend.name: backend
+    for backend in (PyMuPDFBackend, PdfPlumberBackend, PdfMinerBackend, PyPDF2Backend)
+}
+
+
+def available_backends() -> List[str]:
+    """Names of backends whose library is installed"""
+    return [name for name, backend in PDF_BACKENDS.items() if backend.available()]
+
+
+def get_backend(name: str = None) -> PDFBackend:
+    """Backend by name, or the best installed one for "auto" """
+    name = (name or config.pdf_backend).lower()
+    if name == "auto":
+        installed = available_backends()
+        if not installed:
+            raise ImportError("No PDF backend installed (install PyPDF2)")
+        name = installed[0]
+    if name not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend: {name}. Choose from {', '.join(PDF_BACKENDS)}")
+    return PDF_BACKENDS[name]()
+
+
+def iter_pdf_pages(file_path: str, backend: str = None) -> Iterator[str]:
+    """Stream page texts without holding the whole document's text"""
+    return get_backend(backend).iter_pages(file_path)
+
+
+def _extract_page_range(backend_name: str, file_path: str, start: int, end: int) -> List[str]:
+    """Process pool worker: extract a contiguous range of pages"""
+    return list(PDF_BACKENDS[backend_name]().iter_pages(file_path, start, end))
+
+
+def extract_pdf_text(file_path: str, backend: str = None, workers: int = None) -> str:
+    """Extract all text, splitting large documents across a process pool"""
+    extractor = get_backend(backend)
+    workers = workers or config.pdf_workers or os.cpu_count() or 1
+    pages = extractor.page_count(file_path)
+
+    if workers < 2 or pages < config.pdf_parallel_min_pages:
+        return "\n".join(extractor.iter_pages(file_path)) + "\n"
+
+    # One contiguous range per worker so each process opens the file once
+    workers = min(workers, pages)
+    step = -(-pages // workers)
+    ranges = [(start, min(start + step, pages)) for start in range(0, pages, step)]
+    with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+        futures = [executor.submit(_extract_page_range, extractor.name, file_path, start, end)
+                   for start, end in ranges]
+        texts = [text for future in futures for text in future.result()]
+    return "\n".join(texts) + "\n"
@@ -0,0 +1,226 @@
+import json
+from typing import Dict, Any, List
+from dataclasses import dataclass, field
+from templates.prompts import FIELD_MAPPING_INSTRUCTIONS
+
+# Resume sections that are only sent when a field on the page needs them
+SECTION_KEYWORDS = {
+    "summary": ["summary", "objective", "about", "cover letter", "why", "describe", "tell us"],
+    "skills": ["skill", "language", "software", "tool", "technolog", "competenc", "proficien"],
+    "experience": ["employer", "company", "job title", "position", "work experience", "experience",
+                   "responsibilit", "role description", "start date", "end date",
+                   "currently work", "reason for leaving"],
+    "education": ["school", "university", "college", "degree", "field of study", "major",
+                  "gpa", "graduat", "education", "institution"],
+}
+
+# Contact details are small and needed on almost every page
+ALWAYS_SECTIONS = ["name", "email", "phone", "address"]
+
+# Profile values sent for each section; earlier roles and schools are added as rows
+PROFILE_SECTIONS = {
+    "name": ["first_name", "middle_name", "last_name"],
+    "email": ["email"],
+    "phone": ["phone_national", "phone_e164"],
+    "address": ["street", "city", "state", "zip_code", "country"],
+    "summary": ["summary"],
+    "skills": ["skills"],
+    "experience": ["current_title", "current_company", "current_start", "current_end", "currently_employed",
+                   "years_of_experience"],
+    "education": ["latest_school", "latest_degree", "field_of_study", "graduation_year"],
+}
+
+# Columns of the compact experience and education rows
+EXPERIENCE_COLUMNS = ["title", "company", "start_date", "end_date", "duration"]
+EDUCATION_COLUMNS = ["school", "degree", "field_of_study", "graduation_date", "year"]
+
+# Expected answer size per field type, used to bound the output of a chunk
+OUTPUT_TOKENS = {"textarea": 250}
+DEFAULT_OUTPUT_TOKENS = 15
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token)"""
+    if not text:
+        return 0
+    return max(1, (len(text) + 3) // 4)
+
+
+def compact_json(data: Any) -> str:
+    """Minified JSON encoding used in prompts"""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+@dataclass
+class MappingPrompt:
+    """Mapping prompt split into a stable prefix and a per-page body"""
+    prefix: str
+    body: str
+    sections: List[str] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return self.prefix + self.body
+
+    @property
+    def prefix_tokens(self) -> int:
+        return estimate_tokens(self.prefix)
+
+    @property
+    def body_tokens(self) -> int:
+        return estimate_tokens(self.body)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prefix_tokens + self.body_tokens
+
+
+class MappingPromptBuilder:
+    """Builds compact field mapping prompts with a reusable static prefix"""
+
+    def __init__(self, instructions: str = FIELD_MAPPING_INSTRUCTIONS):
+        self.prefix = instructions
+
+    def relevant_sections(self, fields: List[Any]) -> List[str]:
+        """Pick the resume sections the page's fields can actually use"""
+        sections = list(ALWAYS_SECTIONS)
+        labels = [f.label.lower() for f in fields]
+        has_textarea = any(f.field_type == "textarea" for f in fields)
+
+        for section, keywords in SECTION_KEYWORDS.items():
+            # Long-form answers draw on the whole background
+            if has_textarea or any(keyword in label for label in labels for keyword in keywords):
+                sections.append(section)
+        return sections
+
+    def encode_resume(self, resume_data: Any, sections: List[str]) -> Dict[str, Any]:
+        """Resume context restricted to the given sections, empty values dropped"""
+        context = {}
+        for section in sections:
+            value = getattr(resume_data, section, None)
+            if value:
+                context[section] = value
+        return context
+
+    def encode_profile(self, profile: Any, resume_data: Any, sections: List[str],
+                       details: bool = False) -> Dict[str, Any]:
+        """Compiled profile values for the given sections, empty values dropped.
+
+        The profile covers the latest role and degree; with more than one entry
+        the full history is added as compact rows so questions about earlier
+        roles can still be answered. Role descriptions are only sent when the
+        page asks for long-form answers.
+        """
+        context = {}
+        for section in sections:
+            for key in PROFILE_SECTIONS.get(section, []):
+                value = getattr(profile, key, None)
+                if value not in (None, "", [], 0, 0.0, False):
+                    context[key] = value
+
+        if "experience" in sections:
+            columns = EXPERIENCE_COLUMNS + (["description"] if details else [])
+            rows = _rows(getattr(resume_data, "experience", None), columns)
+            if len(rows) > 2 or (rows and details):
+                context["jobs"] = rows
+        if "education" in sections:
+            rows = _rows(getattr(resume_data, "education", None), EDUCATION_COLUMNS)
+            if len(rows) > 2:
+                context["schools"] = rows
+        return context
+
+    def encode_candidate(self, resume_data: Any, fields: List[Any], sections: List[str],
+                         profile: Any = None) -> Dict[str, Any]:
+        """Profile context when a compiled profile is available, raw resume sections otherwise"""
+        if profile is None:
+            return self.encode_resume(resume_data, sections)
+        details = any(f.field_type == "textarea" for f in fields)
+        return self.encode_profile(profile, resume_data, sections, details=details)
+
+    def encode_fields(self, fields: List[Any], indices: List[int] = None) -> List[List[Any]]:
+        """Fields as [index, label, type] triples"""
+        if indices is None:
+            indices = list(range(len(fields)))
+        return [[i, f.label, f.field_type] for i, f in zip(indices, fields)]
+
+    def field_cost(self, field: Any) -> int:
+        """Estimated prompt plus answer tokens for one field"""
+        encoded = estimate_tokens(compact_json([0, field.label, field.field_type]))
+        return encoded + OUTPUT_TOKENS.get(field.field_type, DEFAULT_OUTPUT_TOKENS)
+
+    def chunk_fields(self, fields: List[Any], max_tokens: int) -> List[List[int]]:
+        """Split field indices into token-bounded chunks, keeping sections together"""
+        groups: Dict[str, List[int]] = {}
+        for i, f in enumerate(fields):
+            groups.setdefault(getattr(f, "section", "") or "", []).append(i)
+
+        chunks, current, current_cost = [], [], 0
+        for indices in groups.values():
+            costs = [self.field_cost(fields[i]) for i in indices]
+            # Start a new chunk rather than split a section that fits on its own
+            if current and current_cost + sum(costs) > max_tokens:
+                chunks.append(current)
+                current, current_cost = [], 0
+            for i, cost in zip(indices, costs):
+                if current and current_cost + cost > max_tokens:
+                    chunks.append(current)
+                    current, current_cost = [], 0
+                current.append(i)
+                current_cost += cost
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def encode_job(self, job: Any) -> str:
+        """Job line (company, title, location) when the posting is known"""
+        context = job.prompt_context() if job else {}
+        return f"J:{compact_json(context)}\n" if context else ""
+
+    def build(self, resume_data: Any, fields: List[Any], indices: List[int] = None,
+              job: Any = None, profile: Any = None) -> MappingPrompt:
+        """Build the mapping prompt for one page (or a subset of its fields)"""
+        sections = self.relevant_sections(fields)
+        resume_context = self.encode_candidate(resume_data, fields, sections, profile)
+
+        body = (
+            self.encode_job(job) +
+            f"R:{compact_json(resume_context)}\n"
+            f"F:{compact_json(self.encode_fields(fields, indices))}\n"
+        )
+        return MappingPrompt(prefix=self.prefix, body=body, sections=sections)
+
+    def mapping_schema(self, indices: List[int]) -> Dict[str, Any]:
+        """JSON schema for the index -> value answer of one request"""
+        keys = [str(i) for i in indices]
+        return {
+            "type": "object",
+            "properties": {key: {"type": "string"} for key in keys},
+            "required": keys,
+            "additionalProperties": False
+        }
+
+    def build_primer(self, resume_data: Any, job: Any = None, profile: Any = None) -> str:
+        """Session primer carrying the whole candidate context, sent once per application"""
+        sections = ALWAYS_SECTIONS + list(SECTION_KEYWORDS)
+        if profile is None:
+            resume_context = self.encode_resume(resume_data, sections)
+        else:
+            resume_context = self.encode_profile(profile, resume_data, sections, details=True)
+        return (
+            self.encode_job(job) +
+            f"R:{compact_json(resume_context)}\n"
+            "Field lists for each page of the application follow as F. Reply OK.\n"
+        )
+
+    def build_fields(self, fields: List[Any], indices: List[int] = None) -> str:
+        """Per-page prompt for a primed session: only the field list"""
+        return f"F:{compact_json(self.encode_fields(fields, indices))}\nReturn ONLY the JSON object.\n"
+
+
+def _rows(entries: Any, columns: List[str]) -> List[List[str]]:
+    """Resume entries as a header row plus value rows over the columns they actually use"""
+    entries = [entry for entry in entries or [] if isinstance(entry, dict)]
+    used = [column for column in columns if any(entry.get(column) for entry in entries)]
+    if not used:
+        return []
+    return [used] + [[str(entry.get(column) or "") for column in used] for entry in entries]
@@ -0,0 +1,210 @@
+import re
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List
+from src.candidate_profile import parse_duration, parse_month_year
+from src.config import config
+from src.layout_cache import CONTROL_SELECTOR, XPATH_FUNCTION
+
+
+@dataclass
+class RepeatableSection:
+    """A Workday section with one block per resume entry"""
+    name: str  # ParsedResume list attribute
+    section_id: str  # data-automation-id of the section
+    block_prefix: str  # Blocks are "<prefix>-1", "<prefix>-2", ...
+
+
+REPEATABLE_SECTIONS = [
+    RepeatableSection("experience", "workExperienceSection", "workExperience"),
+    RepeatableSection("education", "educationSection", "education"),
+]
+
+# Rendered blocks per section, and the button that adds another
+SECTIONS_SCRIPT = """
+const addButton = (section) => section.querySelector(
+        '[data-automation-id="Add"], [data-automation-id="Add Another"], [data-automation-id="add-button"]') ||
+    Array.from(section.querySelectorAll('button')).find(
+        (button) => /^add( another)?$/i.test((button.innerText || '').trim())) || null;
+return arguments[0].map((spec) => {
+    const section = document.querySelector('[data-automation-id="' + spec.section_id + '"]');
+    if (!section) return null;
+    const pattern = new RegExp('^' + spec.block_prefix + '-\\\\d+$');
+    const blocks = Array.from(section.querySelectorAll('[data-automation-id]'))
+        .filter((el) => pattern.test(el.getAttribute('data-automation-id')));
+    return {name: spec.name, blocks: blocks.length, add: addButton(section)};
+});
+"""
+
+# Clicks a section's add button several times in one round trip
+ADD_BLOCKS_SCRIPT = """
+const section = document.querySelector('[data-automation-id="' + arguments[0] + '"]');
+for (let i = 0; i < arguments[1]; i++) {
+    const button = section && (section.querySelector(
+            '[data-automation-id="Add"], [data-automation-id="Add Another"], [data-automation-id="add-button"]') ||
+        Array.from(section.querySelectorAll('button')).find(
+            (b) => /^add( another)?$/i.test((b.innerText || '').trim())));
+    if (!button) return i;
+    button.click();
+}
+return arguments[1];
+"""
+
+# Locator, block index and field key of every control inside a block
+BLOCK_FIELDS_SCRIPT = XPATH_FUNCTION + """
+const controls = [];
+arguments[0].forEach((spec) => {
+    const section = document.querySelector('[data-automation-id="' + spec.section_id + '"]');
+    if (!section) return;
+    const pattern = new RegExp('^' + spec.block_prefix + '-(\\\\d+)$');
+    section.querySelectorAll('[data-automation-id]').forEach((block) => {
+        const match = pattern.exec(block.getAttribute('data-automation-id'));
+        if (!match) return;
+        block.querySelectorAll(arguments[1]).forEach((el) => {
+            const wrapper = el.closest('[data-automation-id^="formField-"]');
+            const key = wrapper ? wrapper.getAttribute('data-automation-id').slice('formField-'.length)
+                                : (el.getAttribute('data-automation-id') || el.getAttribute('name') || '');
+            controls.push({section: spec.name, index: parseInt(match[1], 10) - 1, key: key, xpath: getXPath(el)});
+        });
+    });
+});
+return controls;
+"""
+
+MONTH_YEAR = "{month:02d}/{year}"
+
+
+def _month_year(value) -> str:
+    return MONTH_YEAR.format(year=value[0], month=value[1]) if value else ""
+
+
+def _field_of_study(degree: str) -> str:
+    """"B.S. in Computer Science" -> "Computer Science" """
+    match = re.search(r"\b(?:in|of)\s+(.+)$", degree or "", re.IGNORECASE)
+    return match.group(1).strip() if match else ""
+
+
+def experience_values(entry: Dict[str, Any]) -> Dict[str, str]:
+    """Canonical answers for one work experience block"""
+    duration = parse_duration(entry.get("duration", ""))
+    start, end = duration if duration else (None, None)
+    ongoing = bool(duration) and end is None
+    return {
+        "title": entry.get("title", ""),
+        "company": entry.get("company", ""),
+        "location": entry.get("location", ""),
+        "description": entry.get("description", ""),
+        "start": _month_year(start),
+        "end": "" if ongoing else _month_year(end),
+        "current": "Yes" if ongoing else "",
+    }
+
+
+def education_values(entry: Dict[str, Any]) -> Dict[str, str]:
+    """Canonical answers for one education block"""
+    year = parse_month_year(str(entry.get("year", "")))
+    return {
+        "school": entry.get("school", ""),
+        "degree": entry.get("degree", ""),
+        "field_of_study": entry.get("field_of_study") or _field_of_study(entry.get("degree", "")),
+        "end": str(year[0]) if year else "",
+        "start": "",
+    }
+
+
+# Workday formField keys (lowercased) -> canonical answer, first match wins
+BLOCK_KEYS: Dict[str, List[tuple]] = {
+    "experience": [
+        (re.compile(r"currently|current"), "current"),
+        (re.compile(r"title"), "title"),
+        (re.compile(r"company|employer"), "company"),
+        (re.compile(r"location"), "location"),
+        (re.compile(r"description|responsibilit"), "description"),
+        (re.compile(r"start|^from"), "start"),
+        (re.compile(r"end|^to$"), "end"),
+    ],
+    "education": [
+        (re.compile(r"school|institution|university|college"), "school"),
+        (re.compile(r"fieldofstudy|major|discipline"), "field_of_study"),
+        (re.compile(r"degree"), "degree"),
+        (re.compile(r"firstyear|start|^from"), "start"),
+        (re.compile(r"lastyear|end|graduat|^to$"), "end"),
+    ],
+}
+
+ENTRY_VALUES: Dict[str, Callable[[Dict[str, Any]], Dict[str, str]]] = {
+    "experience": experience_values,
+    "education": education_values,
+}
+
+
+def _section_specs() -> List[Dict[str, str]]:
+    return [asdict(section) for section in REPEATABLE_SECTIONS]
+
+
+def expand_sections(driver: Any, resume: Any, timeout: float = None) -> Dict[str, int]:
+    """Add one block per resume entry to every repeatable section, waiting once for all of them.
+
+    Returns the number of blocks added per section.
+    """
+    try:
+        sections = [state for state in driver.execute_script(SECTIONS_SCRIPT, _section_specs()) or [] if state]
+    except Exception as e:
+        print(f"⚠️ Could not inspect repeatable sections: {e}")
+        return {}
+
+    added, wanted = {}, {}
+    for state in sections:
+        entries = len(getattr(resume, state["name"], None) or [])
+        missing = entries - state["blocks"]
+        if missing <= 0 or not state["add"]:
+            continue
+        section = next(section for section in REPEATABLE_SECTIONS if section.name == state["name"])
+        added[state["name"]] = driver.execute_script(ADD_BLOCKS_SCRIPT, section.section_id, missing) or 0
+        wanted[state["name"]] = state["blocks"] + added[state["name"]]
+    if not wanted:
+        return added
+
+    # One wait for every new block to render
+    deadline = time.time() + (config.repeatable_render_timeout if timeout is None else timeout)
+    while time.time() < deadline:
+        states = {state["name"]: state["blocks"]
+                  for state in driver.execute_script(SECTIONS_SCRIPT, _section_specs()) or [] if state}
+        if all(states.get(name, 0) >= count for name, count in wanted.items()):
+            break
+        time.sleep(0.2)
+    print(f"➕ Added repeatable blocks: {', '.join(f'{count} {name}' for name, count in added.items())}")
+    return added
+
+
+def block_field_values(driver: Any, resume: Any) -> Dict[str, str]:
+    """Locator -> value for every recognised field in a repeatable block.
+
+    Block N gets the resume's Nth entry. Known fields without an answer map
+    to "" so they are left blank instead of guessed.
+    """
+    try:
+        controls = driver.execute_script(BLOCK_FIELDS_SCRIPT, _section_specs(), CONTROL_SELECTOR) or []
+    except Exception as e:
+        print(f"⚠️ Could not read repeatable blocks: {e}")
+        return {}
+    return block_control_values(controls, resume)
+
+
+def block_control_values(controls: List[Dict[str, Any]], resume: Any) -> Dict[str, str]:
+    """Values for block controls given as {section, index, key, xpath}"""
+    values = {}
+    entry_cache: Dict[tuple, Dict[str, str]] = {}
+    for control in controls:
+        entries = getattr(resume, control["section"], None) or []
+        if not 0 <= control["index"] < len(entries):
+            continue
+        cache_key = (control["section"], control["index"])
+        if cache_key not in entry_cache:
+            entry_cache[cache_key] = ENTRY_VALUES[control["section"]](entries[control["index"]])
+        key = control["key"].lower()
+        for pattern, canonical in BLOCK_KEYS[control["section"]]:
+            if pattern.search(key):
+                values[control["xpath"]] = str(entry_cache[cache_key].get(canonical) or "")
+                break
+    return values
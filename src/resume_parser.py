@@ -1,9 +1,109 @@
-import PyPDF2
 import docx
 import re
 from typing import Dict, List, Optional
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from src.config import config
 from src.llm_client import LLMClient
+from src.pdf_extract import extract_pdf_text, get_backend
+from src.ocr import needs_ocr, ocr_pdf_text
+from src.resume_sections import split_sections, split_blocks
+from src.resume_rules import RuleBasedResumeParser
+
+EXPERIENCE_ITEM = {
+    "type": "object",
+    "properties": {
+        "company": {"type": "string"},
+        "title": {"type": "string"},
+        "duration": {"type": "string"},
+        "description": {"type": "string"}
+    }
+}
+
+EDUCATION_ITEM = {
+    "type": "object",
+    "properties": {
+        "school": {"type": "string"},
+        "degree": {"type": "string"},
+        "year": {"type": "string"}
+    }
+}
+
+CERTIFICATION_ITEM = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "issuer": {"type": "string"},
+        "year": {"type": "string"}
+    }
+}
+
+# Structured output schema for LLM resume extraction
+RESUME_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "email": {"type": "string"},
+        "phone": {"type": "string"},
+        "address": {"type": "string"},
+        "summary": {"type": "string"},
+        "skills": {"type": "array", "items": {"type": "string"}},
+        "experience": {"type": "array", "items": EXPERIENCE_ITEM},
+        "education": {"type": "array", "items": EDUCATION_ITEM}
+    },
+    "required": ["name", "email", "phone", "address", "summary", "skills", "experience", "education"]
+}
+
+# Targeted extraction per resume section: (what to extract, example output, schema, max tokens)
+SECTION_EXTRACTION = {
+    "contact": (
+        "the candidate's full name, email, phone number, address/location and professional summary (empty if none)",
+        '{"name": "...", "email": "...", "phone": "...", "address": "...", "summary": "..."}',
+        {
+            "type": "object",
+            "properties": {key: {"type": "string"} for key in ("name", "email", "phone", "address", "summary")},
+            "required": ["name", "email", "phone", "address", "summary"]
+        },
+        300
+    ),
+    "skills": (
+        "every individual technical skill, tool and technology",
+        '{"skills": ["skill1", "skill2"]}',
+        {"type": "object", "properties": {"skills": {"type": "array", "items": {"type": "string"}}}, "required": ["skills"]},
+        300
+    ),
+    "experience": (
+        "every position with company, title, duration and description",
+        '{"experience": [{"company": "...", "title": "...", "duration": "...", "description": "..."}]}',
+        {"type": "object", "properties": {"experience": {"type": "array", "items": EXPERIENCE_ITEM}}, "required": ["experience"]},
+        800
+    ),
+    "education": (
+        "every degree with school, degree and year",
+        '{"education": [{"school": "...", "degree": "...", "year": "..."}]}',
+        {"type": "object", "properties": {"education": {"type": "array", "items": EDUCATION_ITEM}}, "required": ["education"]},
+        300
+    ),
+    "certifications": (
+        "every certification or license with name, issuer and year",
+        '{"certifications": [{"name": "...", "issuer": "...", "year": "..."}]}',
+        {"type": "object", "properties": {"certifications": {"type": "array", "items": CERTIFICATION_ITEM}}, "required": ["certifications"]},
+        300
+    )
+}
+
+# Section the LLM re-reads when the rule parser is unsure about a field
+FIELD_SECTIONS = {
+    "name": "contact",
+    "email": "contact",
+    "phone": "contact",
+    "address": "contact",
+    "summary": "contact",  # A summary without its own header sits under the contact lines
+    "skills": "skills",
+    "experience": "experience",
+    "education": "education",
+    "certifications": "certifications"
+}
 
 @dataclass
 class ParsedResume:
@@ -16,7 +116,9 @@ class ParsedResume:
     skills: List[str] = None
     experience: List[Dict] = None
     education: List[Dict] = None
+    certifications: List[Dict] = None
     raw_text: str = ""
+    confidence: Dict[str, float] = None  # Rule parser score per field (0-1)
     
     def __post_init__(self):
         if self.skills is None:
@@ -25,6 +127,33 @@ class ParsedResume:
             self.experience = []
         if self.education is None:
             self.education = []
+        if self.certifications is None:
+            self.certifications = []
+        if self.confidence is None:
+            self.confidence = {}
+
+def extract_resume_text(file_path: str, workers: int = None) -> str:
+    """Text of a PDF or DOCX resume; workers caps PDF extraction/OCR processes"""
+    if file_path.lower().endswith('.pdf'):
+        return _extract_pdf_text(file_path, workers)
+    elif file_path.lower().endswith('.docx'):
+        return _extract_docx_text(file_path)
+    raise ValueError("Unsupported file format. Use PDF or DOCX.")
+
+def _extract_pdf_text(file_path: str, workers: int = None) -> str:
+    """Extract text from PDF (backend and parallelism set in config), OCR for scans"""
+    text = extract_pdf_text(file_path, workers=workers)
+    if config.ocr_enabled and needs_ocr(text, get_backend().page_count(file_path)):
+        print("🔍 PDF has little or no text layer, running OCR")
+        ocr_text = ocr_pdf_text(file_path, workers=workers)
+        if ocr_text.strip():
+            return ocr_text
+    return text
+
+def _extract_docx_text(file_path: str) -> str:
+    """Extract text from DOCX"""
+    doc = docx.Document(file_path)
+    return "".join(paragraph.text + "\n" for paragraph in doc.paragraphs)
 
 class ResumeParser:
     def __init__(self, llm_client: LLMClient = None):
@@ -32,33 +161,123 @@ class ResumeParser:
     
     def parse_resume(self, file_path: str) -> ParsedResume:
         """Parse resume from PDF or DOCX file"""
-        if file_path.lower().endswith('.pdf'):
-            text = self._extract_pdf_text(file_path)
-        elif file_path.lower().endswith('.docx'):
-            text = self._extract_docx_text(file_path)
-        else:
-            raise ValueError("Unsupported file format. Use PDF or DOCX.")
-        
+        return self.parse_text(extract_resume_text(file_path))
+    
+    def parse_text(self, text: str) -> ParsedResume:
+        """Parse already extracted resume text"""
+        if config.rule_parser_enabled:
+            return self._parse_text_with_rules(text)
         return self._parse_text_with_llm(text)
     
-    def _extract_pdf_text(self, file_path: str) -> str:
-        """Extract text from PDF"""
-        text = ""
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-        return text
+    def _parse_text_with_rules(self, text: str) -> ParsedResume:
+        """Parse with local rules and ask the LLM only about low-confidence fields.
+        
+        Only sections that exist in the resume are re-extracted, so a resume
+        without e.g. certifications never costs an LLM call for them.
+        """
+        fields, confidence = RuleBasedResumeParser().parse(text)
+        resume = ParsedResume(raw_text=text, confidence=confidence, **fields)
+        
+        weak = [field for field, score in confidence.items()
+                if field in FIELD_SECTIONS and score < config.rule_confidence_threshold]
+        sections = split_sections(text)
+        if weak and not any(name in SECTION_EXTRACTION and name != "contact" for name in sections):
+            print(f"🧠 No resume sections found, asking LLM for: {', '.join(weak)}")
+            self._merge_fields(resume, vars(self._parse_whole_text_with_llm(text)), weak)
+            return resume
+        
+        weak = [field for field in weak if FIELD_SECTIONS[field] in sections]
+        if not weak:
+            print("⚡ Resume parsed with local rules, no LLM needed")
+            return resume
+        
+        print(f"🧠 Low-confidence fields, asking LLM for: {', '.join(weak)}")
+        names = {FIELD_SECTIONS[field] for field in weak}
+        results = self._extract_sections_concurrently({name: sections[name] for name in names})
+        data = dict(results.get("contact", [{}])[0])
+        for name in ("skills", "experience", "education", "certifications"):
+            data[name] = [value for result in results.get(name, []) if isinstance(result.get(name), list)
+                          for value in result[name]]
+        self._merge_fields(resume, data, weak)
+        return resume
     
-    def _extract_docx_text(self, file_path: str) -> str:
-        """Extract text from DOCX"""
-        doc = docx.Document(file_path)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
+    def _merge_fields(self, resume: ParsedResume, data: Dict, fields: List[str]):
+        """Overwrite the given fields with LLM values, keeping rule values the LLM left empty"""
+        for field in fields:
+            value = data.get(field)
+            if value:
+                setattr(resume, field, value)
     
     def _parse_text_with_llm(self, text: str) -> ParsedResume:
+        """Use LLM to extract structured data, one small prompt per resume section.
+        
+        Sections are found with local heuristics and extracted concurrently, so
+        latency stays roughly flat as resumes grow. Text without recognisable
+        sections goes to a single whole-document prompt.
+        """
+        sections = split_sections(text)
+        if not any(name in SECTION_EXTRACTION and name != "contact" for name in sections):
+            return self._parse_whole_text_with_llm(text)
+        
+        print(f"🧩 Parsing resume sections concurrently: {', '.join(sections)}")
+        resume = ParsedResume(raw_text=text, summary=sections.get("summary", ""))
+        results = self._extract_sections_concurrently(sections)
+        
+        contact = results.get("contact", [{}])[0]
+        fallback = self._parse_text_with_regex(sections.get("contact", text)) if not contact else None
+        for key in ("name", "email", "phone", "address"):
+            setattr(resume, key, contact.get(key) or (getattr(fallback, key) if fallback else ""))
+        if not resume.summary and isinstance(contact.get("summary"), str):
+            resume.summary = contact["summary"]
+        
+        for name in ("skills", "experience", "education", "certifications"):
+            for data in results.get(name, []):
+                value = data.get(name, [])
+                if isinstance(value, list):
+                    getattr(resume, name).extend(value)
+        return resume
+    
+    def _extract_sections_concurrently(self, sections: Dict[str, str]) -> Dict[str, List[Dict]]:
+        """Extract every known section concurrently; results per section in resume order"""
+        # Long sections are split into blocks so no single answer gets truncated
+        jobs = []
+        for name, section_text in sections.items():
+            if name not in SECTION_EXTRACTION:
+                continue
+            blocks = [section_text] if name == "contact" else split_blocks(section_text, config.resume_block_chars)
+            jobs.extend((name, block) for block in blocks)
+        
+        results: Dict[str, List] = {}
+        if not jobs:
+            return results
+        with ThreadPoolExecutor(max_workers=min(config.llm_max_workers, len(jobs))) as executor:
+            futures = [(name, executor.submit(self._extract_section, name, block)) for name, block in jobs]
+            # Collect in submission order so list sections keep resume order
+            for name, future in futures:
+                try:
+                    results.setdefault(name, []).append(future.result())
+                except Exception as e:
+                    print(f"LLM parsing of {name} section failed: {e}")
+        return results
+    
+    def _extract_section(self, name: str, section_text: str) -> Dict:
+        """Run the targeted extraction prompt for one section (or block of it)"""
+        what, example, schema, max_length = SECTION_EXTRACTION[name]
+        prompt = f"""
+Extract {what} from this resume section.
+
+Section text:
+{section_text}
+
+Return ONLY valid JSON format:
+{example}
+"""
+        data = self.llm_client.generate_json(prompt, schema=schema, max_length=max_length, temperature=0)
+        if not isinstance(data, dict):
+            raise ValueError("LLM response is not a JSON object")
+        return data
+    
+    def _parse_whole_text_with_llm(self, text: str) -> ParsedResume:
         """Use LLM to extract structured data from resume text"""
         prompt = f"""
 Extract the following information from this resume text and format as JSON:
@@ -90,33 +309,23 @@ Return ONLY valid JSON format:
 """
         
         try:
-            response = self.llm_client.generate_response(prompt, max_length=1000)
-            # Try to extract JSON from response
-            import json
-            
-            # Find JSON in response
-            json_start = response.find('{')
-            json_end = response.rfind('}') + 1
-            
-            if json_start != -1 and json_end != -1:
-                json_str = response[json_start:json_end]
-                data = json.loads(json_str)
-                
-                resume = ParsedResume(
-                    name=data.get('name', ''),
-                    email=data.get('email', ''),
-                    phone=data.get('phone', ''),
-                    address=data.get('address', ''),
-                    summary=data.get('summary', ''),
-                    skills=data.get('skills', []),
-                    experience=data.get('experience', []),
-                    education=data.get('education', []),
-                    raw_text=text
-                )
-                return resume
-            else:
+            data = self.llm_client.generate_json(prompt, schema=RESUME_SCHEMA, max_length=1000, temperature=0)
+            if not isinstance(data, dict):
                 # Fallback to regex parsing
                 return self._parse_text_with_regex(text)
+            
+            resume = ParsedResume(
+                name=data.get('name', ''),
+                email=data.get('email', ''),
+                phone=data.get('phone', ''),
+                address=data.get('address', ''),
+                summary=data.get('summary', ''),
+                skills=data.get('skills', []),
+                experience=data.get('experience', []),
+                education=data.get('education', []),
+                raw_text=text
+            )
+            return resume
                 
         except Exception as e:
             print(f"LLM parsing failed: {e}, falling back to regex")
@@ -0,0 +1,241 @@
+import re
+from typing import Dict, List, Tuple
+from src.resume_sections import split_sections
+
+# Contact details
+EMAIL = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
+PHONE = re.compile(r"(?<![\w/])(\+\d{1,3}[ \t.-]?)?(\(\d{2,4}\)|\d{2,4})([ \t.-]?\d{2,4}){2,3}(?![\w/])")
+URL = re.compile(r"(https?://|www\.|linkedin\.com|github\.com)\S*", re.IGNORECASE)
+NAME = re.compile(r"^[A-Za-z][A-Za-z'’.-]*(\s+[A-Za-z][A-Za-z'’.-]*){1,3}$")
+
+# Addresses: "1200 Market Street, San Francisco, CA 94102", "Santa Clara, CA 95050", "London, United Kingdom"
+US_STATES = ("AL|AK|AZ|AR|CA|CO|CT|DE|DC|FL|GA|HI|ID|IL|IN|IA|KS|KY|LA|ME|MD|MA|MI|MN|MS|MO|MT|NE|NV|NH|NJ|NM|"
+             "NY|NC|ND|OH|OK|OR|PA|RI|SC|SD|TN|TX|UT|VT|VA|WA|WV|WI|WY")
+US_STREET_ADDRESS = re.compile(
+    r"\b\d+\s+[A-Za-z0-9 .'-]+,\s*[A-Za-z .'-]+,\s*(" + US_STATES + r")\.?\s+\d{5}(-\d{4})?\b")
+US_CITY_STATE = re.compile(r"\b[A-Z][A-Za-z .'-]+,\s*(" + US_STATES + r")\b(\.?\s+\d{5}(-\d{4})?)?")
+COUNTRIES = ("United States|USA|Canada|Mexico|United Kingdom|UK|Ireland|Germany|France|Spain|Italy|Netherlands|"
+             "Belgium|Switzerland|Austria|Sweden|Norway|Denmark|Finland|Poland|Portugal|India|China|Japan|"
+             "Singapore|Australia|New Zealand|Brazil|Argentina|Israel|United Arab Emirates|South Africa")
+INTL_CITY_COUNTRY = re.compile(r"\b[A-Z][A-Za-z .'-]+,\s*(" + COUNTRIES + r")\b")
+
+# Dates: "Jan 2020 - Present", "06/2017 - 12/2019", "2019 - 2024", "(Aug 2018 – Feb 2021)"
+MONTH = r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)[a-z]*\.?"
+DATE = r"(?:" + MONTH + r"\s+\d{4}|\d{1,2}/\d{4}|\d{4})"
+DATE_RANGE = re.compile(
+    r"(" + DATE + r")\s*(?:-|–|—|to|until)\s*(" + DATE + r"|Present|Current|Now|Today)", re.IGNORECASE)
+YEAR = re.compile(r"\b(19|20)\d{2}\b")
+
+# Education
+DEGREE = re.compile(
+    r"\b(Bachelor|Master|Doctor|Associate|Ph\.?\s?D|MBA|M\.?B\.?A|B\.?\s?S\.?c?|M\.?\s?S\.?c?|B\.?\s?A|M\.?\s?A|"
+    r"B\.?\s?Tech|M\.?\s?Tech|B\.?\s?E|M\.?\s?E|B\.?\s?Eng|M\.?\s?Eng|Diploma|High School)\b\.?")
+SCHOOL = re.compile(r"\b(University|College|Institute|School|Academy|Polytechnic|Conservatory)\b")
+
+# Experience
+TITLE_WORDS = re.compile(
+    r"\b(engineer|developer|designer|manager|analyst|scientist|director|lead|intern|consultant|specialist|"
+    r"architect|officer|coordinator|administrator|associate|head|vp|vice president|president|founder|"
+    r"programmer|researcher|technician|representative|assistant|executive|owner|strategist|writer|editor)\b",
+    re.IGNORECASE)
+BULLET = re.compile(r"^\s*[-•·*▪●]\s*")
+SEPARATORS = re.compile(r"\s*[|,]\s*|\s+[-–—]\s+")
+AT_COMPANY = re.compile(r"^(?P<title>.+?)\s+at\s+(?P<company>.+)$")
+
+# Words in a header line that make it prose rather than contact details
+SUMMARY_MIN_WORDS = 12
+
+SKILL_SPLIT = re.compile(r"\s*[,•·|;\t\n]\s*")
+
+
+class RuleBasedResumeParser:
+    """Deterministic resume parser with a confidence score per field"""
+
+    def parse(self, text: str) -> Tuple[Dict, Dict[str, float]]:
+        """Return (fields, confidence) where fields match ParsedResume attributes"""
+        sections = split_sections(text)
+        contact = sections.get("contact", "")
+        fields: Dict = {}
+        confidence: Dict[str, float] = {}
+
+        fields["email"], confidence["email"] = self._email(contact or text)
+        fields["phone"], confidence["phone"] = self._phone(contact or text)
+        fields["name"], confidence["name"] = self._name(contact or text)
+        fields["address"], confidence["address"] = self._address(contact or text)
+
+        fields["summary"], confidence["summary"] = self._summary(sections.get("summary", ""), contact)
+
+        fields["skills"], confidence["skills"] = self._skills(sections.get("skills", ""))
+        fields["experience"], confidence["experience"] = self._experience(sections.get("experience", ""))
+        fields["education"], confidence["education"] = self._education(sections.get("education", ""))
+        fields["certifications"], confidence["certifications"] = self._certifications(
+            sections.get("certifications", ""))
+        return fields, confidence
+
+    def _summary(self, section: str, contact: str) -> Tuple[str, float]:
+        if section:
+            return " ".join(section.split()), 0.9
+        # Prose under the contact lines is usually an unheaded summary
+        prose = [line.strip() for line in contact.splitlines()
+                 if len(line.split()) >= SUMMARY_MIN_WORDS and not EMAIL.search(line)]
+        if prose:
+            return " ".join(" ".join(prose).split()), 0.5
+        # No header and no prose: the resume has no summary
+        return "", 0.9
+
+    def _email(self, text: str) -> Tuple[str, float]:
+        match = EMAIL.search(text)
+        return (match.group(), 1.0) if match else ("", 0.0)
+
+    def _phone(self, text: str) -> Tuple[str, float]:
+        for match in PHONE.finditer(EMAIL.sub(" ", URL.sub(" ", text))):
+            candidate = match.group().strip()
+            digits = re.sub(r"\D", "", candidate)
+            # Skip years, date ranges and zip codes
+            if 10 <= len(digits) <= 15:
+                return candidate, 0.9
+        return "", 0.0
+
+    def _name(self, text: str) -> Tuple[str, float]:
+        for index, line in enumerate(text.splitlines()[:5]):
+            line = line.strip()
+            if not line or EMAIL.search(line) or any(char.isdigit() for char in line):
+                continue
+            if NAME.match(line) and not US_CITY_STATE.search(line) and not INTL_CITY_COUNTRY.search(line):
+                name = line.title() if line.isupper() else line
+                # The very first line of a resume is almost always the name
+                return name, 0.9 if index == 0 else 0.7
+        return "", 0.0
+
+    def _address(self, text: str) -> Tuple[str, float]:
+        for line in text.splitlines():
+            line = URL.sub("", EMAIL.sub("", line))
+            for pattern, score in ((US_STREET_ADDRESS, 0.9), (US_CITY_STATE, 0.8), (INTL_CITY_COUNTRY, 0.75)):
+                match = pattern.search(line)
+                if match:
+                    return match.group().strip(" ,|"), score
+        return "", 0.0
+
+    def _skills(self, text: str) -> Tuple[List[str], float]:
+        if not text:
+            return [], 0.0
+        skills = []
+        for item in SKILL_SPLIT.split(text):
+            item = BULLET.sub("", item).strip(" .")
+            # Drop "Languages:" style sub-headings but keep the items after them
+            if ":" in item:
+                item = item.split(":", 1)[1].strip()
+            if item and len(item) <= 40 and item not in skills:
+                skills.append(item)
+        return skills, 0.9 if len(skills) >= 2 else 0.4
+
+    def _experience(self, text: str) -> Tuple[List[Dict], float]:
+        if not text:
+            return [], 0.0
+        lines = [line.rstrip() for line in text.splitlines()]
+        anchors = [i for i, line in enumerate(lines) if DATE_RANGE.search(line) and not BULLET.match(line)]
+        if not anchors:
+            return [], 0.2
+
+        entries = []
+        previous_end = 0
+        for number, anchor in enumerate(anchors):
+            # Header: the date line plus up to two non-bullet lines right above it
+            start = anchor
+            while start > previous_end and anchor - start < 2:
+                above = lines[start - 1].strip()
+                if not above or BULLET.match(above) or DATE_RANGE.search(above) or len(above) > 80:
+                    break
+                start -= 1
+            # A header directly after the previous entry's description may belong to it
+            if entries and start > previous_end:
+                entries[-1]["description"] = self._description(lines[previous_end:start])
+
+            date_match = DATE_RANGE.search(lines[anchor])
+            header_lines = lines[start:anchor] + [DATE_RANGE.sub("", lines[anchor]).strip(" ()|,-–—")]
+            title, company = self._title_and_company([line for line in header_lines if line.strip()])
+            entries.append({
+                "company": company,
+                "title": title,
+                "duration": date_match.group(),
+                "description": ""
+            })
+
+            next_start = anchors[number + 1] if number + 1 < len(anchors) else len(lines)
+            # Description runs until the header lines of the next entry
+            end = next_start
+            if number + 1 < len(anchors):
+                while end > anchor + 1 and next_start - end < 2 and lines[end - 1].strip() \
+                        and not BULLET.match(lines[end - 1]) and len(lines[end - 1]) <= 80 \
+                        and not lines[end - 1].rstrip().endswith("."):
+                    end -= 1
+            entries[-1]["description"] = self._description(lines[anchor + 1:end])
+            previous_end = end
+
+        complete = sum(1 for entry in entries if entry["title"] and entry["company"])
+        return entries, 0.9 * complete / len(entries)
+
+    def _title_and_company(self, header_lines: List[str]) -> Tuple[str, str]:
+        text = " | ".join(line.strip() for line in header_lines)
+        match = AT_COMPANY.match(header_lines[0].strip()) if header_lines else None
+        if match:
+            return match.group("title").strip(), match.group("company").strip(" ,")
+
+        parts = [part for part in SEPARATORS.split(text) if part and not US_CITY_STATE.fullmatch(part)]
+        # Location fragments ("San Jose", "CA") follow the company; drop two-letter states
+        parts = [part for part in parts if not re.fullmatch(US_STATES, part)]
+        titles = [part for part in parts if TITLE_WORDS.search(part)]
+        title = titles[0] if titles else (parts[0] if parts else "")
+        others = [part for part in parts if part != title]
+        company = others[0] if others else ""
+        return title.strip(), company.strip()
+
+    def _description(self, lines: List[str]) -> str:
+        return " ".join(BULLET.sub("", line).strip() for line in lines if line.strip())
+
+    def _education(self, text: str) -> Tuple[List[Dict], float]:
+        if not text:
+            return [], 0.0
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        entries = []
+        for index, line in enumerate(lines):
+            school_part = next((part for part in SEPARATORS.split(line) if SCHOOL.search(part)), "")
+            if not school_part:
+                continue
+            if not DEGREE.search(line) and not YEAR.search(line):
+                # "University of California, Berkeley" - the whole line is the school
+                school_part = line
+            # Degree and year may sit on the same line or the one below
+            context = [line] + ([lines[index + 1]] if index + 1 < len(lines) and not SCHOOL.search(lines[index + 1]) else [])
+            degree = ""
+            for context_line in context:
+                degree = next((part for part in SEPARATORS.split(context_line)
+                               if DEGREE.search(part) and not SCHOOL.search(part)), "")
+                if degree:
+                    break
+            years = [m.group() for context_line in context for m in YEAR.finditer(context_line)]
+            entries.append({
+                "school": school_part.strip(),
+                "degree": YEAR.sub("", degree).strip(" ,-–"),
+                "year": years[-1] if years else ""
+            })
+        if not entries:
+            return [], 0.2
+        complete = sum(1 for entry in entries if entry["degree"] and entry["year"])
+        return entries, 0.5 + 0.4 * complete / len(entries)
+
+    def _certifications(self, text: str) -> Tuple[List[Dict], float]:
+        if not text:
+            return [], 0.0
+        entries = []
+        for line in text.splitlines():
+            line = BULLET.sub("", line).strip()
+            if not line:
+                continue
+            years = [m.group() for m in YEAR.finditer(line)]
+            entries.append({
+                "name": YEAR.sub("", line).strip(" ,-–()"),
+                "issuer": "",
+                "year": years[-1] if years else ""
+            })
+        return entries, 0.8 if entries else 0.0
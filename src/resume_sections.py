@@ -0,0 +1,70 @@
+import re
+from typing import Dict, List
+
+# Header aliases per section, matched against whole (short) lines
+SECTION_HEADERS = {
+    "summary": ["summary", "professional summary", "career summary", "objective", "career objective",
+                "profile", "professional profile", "about me"],
+    "skills": ["skills", "technical skills", "key skills", "core competencies", "competencies",
+               "technologies", "tools", "skills & tools", "skills and tools"],
+    "experience": ["experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "career history", "relevant experience"],
+    "education": ["education", "academic background", "education & training", "education and training",
+                  "qualifications", "academic qualifications"],
+    "certifications": ["certifications", "certificates", "licenses", "licenses & certifications",
+                       "licenses and certifications", "certifications & licenses"],
+    "other": ["projects", "publications", "awards", "honors", "volunteer experience", "volunteering",
+              "interests", "languages", "references"],
+}
+
+HEADER_PATTERNS = {
+    section: re.compile(r"^(?:" + "|".join(re.escape(alias) for alias in aliases) + r")\s*:?$", re.IGNORECASE)
+    for section, aliases in SECTION_HEADERS.items()
+}
+
+MAX_HEADER_WORDS = 5
+
+
+def detect_header(line: str) -> str:
+    """Section name if the line is a section header, otherwise empty string"""
+    stripped = line.strip().strip("#*•-_=| ").strip()
+    if not stripped or len(stripped.split()) > MAX_HEADER_WORDS:
+        return ""
+    for section, pattern in HEADER_PATTERNS.items():
+        if pattern.match(stripped):
+            return section
+    return ""
+
+
+def split_sections(text: str) -> Dict[str, str]:
+    """Segment resume text into sections by header lines.
+
+    Lines before the first header form the "contact" section. Repeated headers
+    of the same section are merged.
+    """
+    sections: Dict[str, List[str]] = {"contact": []}
+    current = "contact"
+    for line in text.splitlines():
+        header = detect_header(line)
+        if header:
+            current = header
+            sections.setdefault(current, [])
+            continue
+        sections[current].append(line)
+
+    return {name: "\n".join(lines).strip() for name, lines in sections.items() if "\n".join(lines).strip()}
+
+
+def split_blocks(text: str, max_chars: int) -> List[str]:
+    """Split a long section at blank lines into blocks of at most ~max_chars"""
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+    blocks, current = [], ""
+    for paragraph in paragraphs:
+        if current and len(current) + len(paragraph) + 2 > max_chars:
+            blocks.append(current)
+            current = paragraph
+        else:
+            current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        blocks.append(current)
+    return blocks
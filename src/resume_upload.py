@@ -0,0 +1,140 @@
+import os
+import time
+from typing import Any, Dict
+from src.config import config
+
+# Every file input on the page, ranked by how much it looks like the resume
+# upload, in one round trip. Hidden inputs are kept: Workday hides the real
+# input behind its "Select files" button.
+FILE_INPUTS_SCRIPT = """
+const candidates = [];
+document.querySelectorAll('input[type="file"]').forEach((el) => {
+    if (el.disabled) return;
+    const owner = el.closest('[data-automation-id], section, fieldset, form');
+    const labels = Array.from(el.labels || []).map((label) => label.innerText || '').join(' ');
+    const text = [labels, el.getAttribute('aria-label'), el.name, el.id, el.className,
+                  el.getAttribute('data-automation-id'),
+                  owner ? owner.getAttribute('data-automation-id') : '',
+                  owner ? (owner.innerText || '').slice(0, 200) : ''].join(' ').toLowerCase();
+    const accept = (el.getAttribute('accept') || '').toLowerCase();
+    let score = 0;
+    if (/resume|cv\\b|curriculum/.test(text)) score += 5;
+    if (/cover|transcript|portfolio|photo|avatar|picture/.test(text)) score -= 5;
+    if (/pdf|doc/.test(accept)) score += 2;
+    if (accept && !/pdf|doc|\\*\\/\\*/.test(accept)) score -= 5;
+    if (/upload|attach|file|document/.test(text)) score += 1;
+    candidates.push({element: el, score: score, label: (labels || el.getAttribute('aria-label') || el.name ||
+                                                         (owner && owner.getAttribute('data-automation-id')) ||
+                                                         'file input').trim()});
+});
+return candidates.filter((c) => c.score >= 0).sort((a, b) => b.score - a.score);
+"""
+
+# Counts in-flight XHR/fetch requests so "network idle" can be checked
+NETWORK_HOOK_SCRIPT = """
+if (!window.__uploadWatch) {
+    const watch = window.__uploadWatch = {pending: 0};
+    const send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        watch.pending++;
+        this.addEventListener('loadend', () => { watch.pending--; });
+        return send.apply(this, arguments);
+    };
+    if (window.fetch) {
+        const fetch = window.fetch;
+        window.fetch = function () {
+            watch.pending++;
+            return fetch.apply(this, arguments).finally(() => { watch.pending--; });
+        };
+    }
+}
+"""
+
+# Upload progress signals: Workday file chips, visible progress bars, the
+# file name on the page and in-flight requests
+UPLOAD_STATE_SCRIPT = """
+const visible = (el) => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+return {
+    chips: document.querySelectorAll('[data-automation-id="file-upload-item"], ' +
+                                     '[data-automation-id="fileUploadItem"]').length,
+    progress: Array.from(document.querySelectorAll('[role="progressbar"], [data-automation-id*="progress"], ' +
+                                                   '[data-automation-id*="Progress"]')).filter(visible).length,
+    named: (document.body.innerText || '').includes(arguments[0]),
+    pending: window.__uploadWatch ? window.__uploadWatch.pending : 0
+};
+"""
+
+
+# Assumed when the page can't be read, so any file chip or name counts as new
+EMPTY_UPLOAD_STATE = {"chips": 0, "progress": 0, "named": False, "pending": 0}
+
+
+def _upload_finished(before: Dict[str, Any], state: Dict[str, Any]) -> bool:
+    if state["progress"]:
+        return False
+    if state["chips"] > before["chips"]:
+        # Workday's file chip appears once the upload is stored; long-poll
+        # requests can keep `pending` above zero indefinitely
+        return True
+    return state["named"] and not before["named"] and state["pending"] <= 0
+
+
+def _upload_state(driver: Any, file_name: str) -> Dict[str, Any]:
+    try:
+        return driver.execute_script(UPLOAD_STATE_SCRIPT, file_name) or EMPTY_UPLOAD_STATE
+    except Exception:
+        return EMPTY_UPLOAD_STATE
+
+
+def wait_for_upload(driver: Any, file_name: str, before: Dict[str, Any], timeout: float = None) -> bool:
+    """Wait until the page shows the uploaded file and has nothing in flight"""
+    deadline = time.time() + (config.upload_timeout if timeout is None else timeout)
+    while time.time() < deadline:
+        if _upload_finished(before, _upload_state(driver, file_name)):
+            return True
+        time.sleep(0.2)
+    return False
+
+
+def upload_visible(driver: Any, resume_path: str) -> bool:
+    """Whether the page already shows an uploaded resume, e.g. from a saved draft"""
+    state = _upload_state(driver, os.path.basename(resume_path))
+    return bool(state["chips"] or state["named"])
+
+
+def upload_resume(driver: Any, resume_path: str, timeout: float = None) -> bool:
+    """Send the resume to the best-ranked file input and wait for the upload to complete.
+
+    Returns True once the file was handed to an input; a missing completion
+    signal only produces a warning, since not every site shows one.
+    """
+    try:
+        candidates = driver.execute_script(FILE_INPUTS_SCRIPT) or []
+    except Exception as e:
+        print(f"❌ Could not look for upload fields: {e}")
+        return False
+    if not candidates:
+        print("⚠️ No resume upload field found on this page")
+        return False
+
+    file_name = os.path.basename(resume_path)
+    try:
+        driver.execute_script(NETWORK_HOOK_SCRIPT)
+    except Exception as e:
+        # Without the hook `pending` stays 0 and only the page signals are checked
+        print(f"⚠️ Could not watch upload requests: {e}")
+    before = _upload_state(driver, file_name)
+    for candidate in candidates:
+        try:
+            started = time.time()
+            candidate["element"].send_keys(os.path.abspath(resume_path))
+        except Exception as e:
+            print(f"⚠️ Upload to {candidate['label']} failed: {e}")
+            continue
+        print(f"📎 Uploading resume to: {candidate['label']}")
+        if wait_for_upload(driver, file_name, before, timeout):
+            print(f"✅ Resume upload complete in {time.time() - started:.1f}s")
+        else:
+            print(f"⚠️ No upload-complete signal after {time.time() - started:.0f}s, continuing")
+        return True
+    return False
@@ -0,0 +1,158 @@
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+from cryptography.fernet import Fernet
+from src.config import config
+
+# Cookie fields accepted back by Network.setCookies
+COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+
+LOCAL_STORAGE_SCRIPT = """
+const items = {};
+for (let i = 0; i < localStorage.length; i++) {
+    const key = localStorage.key(i);
+    items[key] = localStorage.getItem(key);
+}
+return items;
+"""
+
+# Runs before the tenant's own scripts, so no extra page load is needed
+RESTORE_STORAGE_SCRIPT = """
+(function (host, items) {
+    if (location.hostname !== host) return;
+    try {
+        for (const key in items) {
+            if (localStorage.getItem(key) === null) localStorage.setItem(key, items[key]);
+        }
+    } catch (e) {}
+})(%s, %s);
+"""
+
+# Signed-in state from the page already loaded, without visiting the login page
+SESSION_STATE_SCRIPT = """
+const visible = (el) => !!(el && (el.offsetWidth || el.offsetHeight || el.getClientRects().length));
+const any = (selector) => Array.from(document.querySelectorAll(selector)).some(visible);
+if (any('[data-automation-id="accountSettingsButton"], [data-automation-id="utilityButtonAccountSettings"], ' +
+        '[data-automation-id="signOutLink"], [data-automation-id="utilityButtonSignOut"]')) return 'signed_in';
+if (any('[data-automation-id="utilityButtonSignIn"], [data-automation-id="signInLink"], input[type="password"]'))
+    return 'signed_out';
+return 'unknown';
+"""
+
+
+def load_key() -> bytes:
+    """Fernet key from SESSION_KEY, or a private key file created on first use"""
+    if config.session_key:
+        return config.session_key.encode("utf-8")
+    path = config.session_key_path
+    if os.path.exists(path):
+        with open(path, "rb") as file:
+            return file.read().strip()
+    key = Fernet.generate_key()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # Readable by the owner only
+    with os.fdopen(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), "wb") as file:
+        file.write(key)
+    return key
+
+
+class SessionStore:
+    """Cookies and localStorage per tenant host, encrypted at rest.
+
+    Encrypted with Fernet; the key comes from SESSION_KEY or a private key
+    file created on first use.
+    """
+
+    def __init__(self, directory: str = None, key: bytes = None):
+        self.directory = directory or config.session_dir
+        os.makedirs(self.directory, exist_ok=True)
+        self.fernet = Fernet(key or load_key())
+
+    def _path(self, host: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(host.encode("utf-8")).hexdigest()[:24] + ".session")
+
+    def load(self, host: str) -> Optional[Dict[str, Any]]:
+        """Stored session with expired cookies dropped, or None when nothing usable is left"""
+        try:
+            with open(self._path(host), "rb") as file:
+                session = json.loads(self.fernet.decrypt(file.read()))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"⚠️ Discarding unreadable session for {host}: {e}")
+            self.delete(host)
+            return None
+
+        now = time.time()
+        if session.get("host") != host or now - session.get("saved", 0) > config.session_max_age:
+            self.delete(host)
+            return None
+        session["cookies"] = [cookie for cookie in session.get("cookies", [])
+                              if cookie.get("expires", -1) <= 0 or cookie["expires"] > now]
+        return session if session["cookies"] else None
+
+    def save(self, host: str, cookies: List[Dict[str, Any]], local_storage: Dict[str, str]):
+        session = {"host": host, "saved": time.time(), "cookies": cookies, "local_storage": local_storage}
+        token = self.fernet.encrypt(json.dumps(session).encode("utf-8"))
+        path = self._path(host)
+        with os.fdopen(os.open(path + ".tmp", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb") as file:
+            file.write(token)
+        os.replace(path + ".tmp", path)
+
+    def delete(self, host: str):
+        try:
+            os.remove(self._path(host))
+        except FileNotFoundError:
+            pass
+
+
+_session_store = None
+
+
+def get_session_store() -> Optional[SessionStore]:
+    """Process-wide session store, or None when disabled"""
+    global _session_store
+    if not config.session_store_enabled:
+        return None
+    if _session_store is None:
+        try:
+            _session_store = SessionStore()
+        except (ValueError, OSError) as e:
+            print(f"⚠️ Saved sessions disabled, the session key is unusable: {e}")
+            return None
+    return _session_store
+
+
+def capture_session(driver: Any, url: str) -> Dict[str, Any]:
+    """Cookies sent to url plus the page's localStorage"""
+    cookies = driver.execute_cdp_cmd("Network.getCookies", {"urls": [url]}).get("cookies", [])
+    return {
+        "cookies": [{key: cookie[key] for key in COOKIE_FIELDS if key in cookie} for cookie in cookies],
+        "local_storage": driver.execute_script(LOCAL_STORAGE_SCRIPT) or {},
+    }
+
+
+def restore_session(driver: Any, host: str, session: Dict[str, Any]):
+    """Install cookies and localStorage before the tenant page is first loaded"""
+    cookies = []
+    for cookie in session.get("cookies", []):
+        cookie = dict(cookie)
+        if cookie.get("expires", -1) <= 0:
+            cookie.pop("expires", None)  # Session cookie
+        cookies.append(cookie)
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+    if session.get("local_storage"):
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+            "source": RESTORE_STORAGE_SCRIPT % (json.dumps(host), json.dumps(session["local_storage"]))
+        })
+
+
+def session_state(driver: Any) -> str:
+    """'signed_in', 'signed_out' or 'unknown' for the current page"""
+    try:
+        return driver.execute_script(SESSION_STATE_SCRIPT) or "unknown"
+    except Exception:
+        return "unknown"
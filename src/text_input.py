@@ -0,0 +1,82 @@
+import time
+from typing import Any, List
+from src.config import config
+
+# Focus and select the current content so the inserted text replaces it
+PREPARE_SCRIPT = """
+const el = arguments[0];
+el.scrollIntoView({block: 'center'});
+el.focus();
+if (el.isContentEditable) {
+    document.execCommand('selectAll', false, null);
+} else if (typeof el.select === 'function') {
+    el.select();
+}
+return document.activeElement === el;
+"""
+
+# Key and change events for validators that don't listen to "input", then
+# blur so on-blur validation runs; returns the resulting value
+FINISH_SCRIPT = """
+const el = arguments[0];
+const key = arguments[1];
+el.dispatchEvent(new KeyboardEvent('keydown', {key: key, bubbles: true}));
+el.dispatchEvent(new KeyboardEvent('keyup', {key: key, bubbles: true}));
+el.dispatchEvent(new Event('change', {bubbles: true}));
+if (arguments[2]) el.blur();
+return el.isContentEditable ? el.innerText : el.value;
+"""
+
+
+def chunks(text: str, size: int) -> List[str]:
+    return [text[i:i + size] for i in range(0, len(text), size)] if size > 0 else [text]
+
+
+def insert_text(driver: Any, element: Any, text: str, chunk_chars: int = None, delay: float = None,
+                blur: bool = True) -> bool:
+    """Replace an input's content with one DevTools Input.insertText call per chunk.
+
+    insertText fires the same beforeinput/input events as typing, which is
+    what React-based Workday fields track; keydown/keyup/change and blur are
+    dispatched afterwards for validators that wait on those. Returns False
+    when the field did not take the text, so callers can fall back.
+    """
+    if not driver.execute_script(PREPARE_SCRIPT, element):
+        return False
+    size = config.text_chunk_chars if chunk_chars is None else chunk_chars
+    pause = config.typing_delay if delay is None else delay
+    parts = chunks(text, size)
+    for index, part in enumerate(parts):
+        driver.execute_cdp_cmd("Input.insertText", {"text": part})
+        if pause and index < len(parts) - 1:
+            time.sleep(pause)
+    value = driver.execute_script(FINISH_SCRIPT, element, text[-1:] or "Unidentified", blur)
+    # Masked fields (phone, dates) reformat the text, so only an empty field counts as a miss
+    return bool(value) or not text
+
+
+def type_per_character(element: Any, text: str, delay: float = None):
+    """The old path: one send_keys round trip per character"""
+    pause = config.typing_delay if delay is None else delay
+    for char in text:
+        element.send_keys(char)
+        if pause:
+            time.sleep(pause)
+
+
+def enter_text(driver: Any, element: Any, text: str, blur: bool = True) -> bool:
+    """Type text with the configured method (insert, chunked or keys); True when it was entered"""
+    mode = config.text_entry
+    if mode in ("insert", "chunked"):
+        try:
+            if insert_text(driver, element, text, chunk_chars=None if mode == "chunked" else 0, blur=blur):
+                return True
+            print("⚠️ Field ignored inserted text, typing it instead")
+        except Exception as e:
+            print(f"⚠️ Fast text entry failed ({e}), typing instead")
+    try:
+        element.clear()
+    except Exception:
+        pass
+    type_per_character(element, text)
+    return True
@@ -0,0 +1,240 @@
+import re
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+from selenium.webdriver.common.keys import Keys
+from src.candidate_profile import parse_month_year
+from src.config import config
+
+# What kind of control an element is, in one round trip
+DESCRIBE_SCRIPT = """
+const el = arguments[0];
+const container = el.closest('[data-uxi-widget-type], [data-automation-id="multiSelectContainer"], ' +
+                             '[data-automation-id="dateInputWrapper"]');
+return {
+    tag: el.tagName.toLowerCase(),
+    automation_id: el.getAttribute('data-automation-id') || '',
+    role: el.getAttribute('role') || '',
+    haspopup: el.getAttribute('aria-haspopup') || '',
+    widget_type: container ? (container.getAttribute('data-uxi-widget-type') || '') : '',
+    container_id: container ? (container.getAttribute('data-automation-id') || '') : '',
+    multiselect: !!el.closest('[data-automation-id="multiSelectContainer"], [aria-multiselectable="true"]')
+};
+"""
+
+# Visible options of the open listbox or prompt, with their text
+OPTIONS_SCRIPT = """
+const visible = (el) => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+return Array.from(document.querySelectorAll('[role="option"], [data-automation-id="promptOption"]'))
+    .filter(visible)
+    .map((el) => [el, (el.innerText || el.textContent || '').trim()]);
+"""
+
+# Month/day/year inputs of the segmented date widget around an element
+DATE_SEGMENTS_SCRIPT = """
+const wrapper = arguments[0].closest('[data-automation-id="dateInputWrapper"]') || arguments[0].parentElement;
+const segment = (name) => wrapper.querySelector('[data-automation-id="dateSection' + name + '-input"]');
+return {month: segment('Month'), day: segment('Day'), year: segment('Year')};
+"""
+
+# Whether the prompt around an element shows a selected pill
+SELECTED_SCRIPT = """
+const container = arguments[0].closest('[data-uxi-widget-type], [data-automation-id="multiSelectContainer"]');
+return !!(container && container.querySelector('[data-automation-id="selectedItem"]'));
+"""
+
+# Field types that are plain inputs unless Workday marks them up as a widget
+NATIVE_TEXT_TYPES = ("text", "email", "tel")
+
+US_TERRITORIES = ("minor outlying", "outlying islands", "american samoa", "guam", "puerto rico",
+                  "virgin islands", "northern mariana")
+YES_WORDS = ("yes", "true", "y", "agree", "accept")
+NO_WORDS = ("no", "false", "n", "disagree", "decline")
+ISO_DATE = re.compile(r"\b(\d{4})-(\d{1,2})(?:-(\d{1,2}))?\b")
+US_DATE = re.compile(r"\b(\d{1,2})/(\d{1,2})/(\d{4})\b")
+
+
+def best_option(value: str, options: List[str]) -> Optional[int]:
+    """Index of the option that best matches value, or None"""
+    wanted = " ".join(value.lower().split())
+    texts = [" ".join(option.lower().split()) for option in options]
+    if not wanted:
+        return None
+    if wanted in ("united states", "usa", "us", "united states of america"):
+        main = [i for i, text in enumerate(texts)
+                if "united states" in text and not any(territory in text for territory in US_TERRITORIES)]
+        if main:
+            return main[0]
+    for matches in (lambda text: text == wanted,
+                    lambda text: text.startswith(wanted),
+                    lambda text: wanted in text,
+                    # Whole words only, so "No" is not picked for "Unknown" or "Not applicable"
+                    lambda text: text and re.search(r"(?<!\w)" + re.escape(text) + r"(?!\w)", wanted)):
+        for i, text in enumerate(texts):
+            if matches(text):
+                return i
+    for words in (YES_WORDS, NO_WORDS):
+        if wanted in words:
+            for i, text in enumerate(texts):
+                if text.split(" ")[0].strip(",.") in words:
+                    return i
+    return None
+
+
+def date_parts(value: str) -> Optional[Dict[str, str]]:
+    """Zero-padded month, day and year of a date value; day defaults to the 1st"""
+    match = ISO_DATE.search(value or "")
+    if match:
+        year, month, day = match.group(1), match.group(2), match.group(3) or "1"
+    else:
+        match = US_DATE.search(value or "")
+        if match:
+            month, day, year = match.groups()
+        else:
+            parsed = parse_month_year(value)
+            if not parsed:
+                return None
+            year, month, day = str(parsed[0]), str(parsed[1]), "1"
+    return {"month": month.zfill(2), "day": day.zfill(2), "year": year}
+
+
+def _click(driver: Any, element: Any):
+    try:
+        element.click()
+    except Exception:
+        driver.execute_script("arguments[0].click();", element)
+
+
+def _wait_for_options(driver: Any, timeout: float = None) -> List[list]:
+    """Visible options once the popup has rendered, or [] after the timeout"""
+    deadline = time.time() + (config.widget_option_timeout if timeout is None else timeout)
+    while True:
+        options = driver.execute_script(OPTIONS_SCRIPT) or []
+        if options or time.time() >= deadline:
+            return options
+        time.sleep(0.1)
+
+
+def _choose(driver: Any, value: str, options: List[list]) -> bool:
+    index = best_option(value, [text for _, text in options])
+    if index is None:
+        print(f"⚠️ No option matches '{value}' (of {len(options)})")
+        return False
+    _click(driver, options[index][0])
+    print(f"✅ Selected: {options[index][1]}")
+    return True
+
+
+class WidgetAdapter(ABC):
+    """Fills one kind of custom widget with the fewest browser round trips"""
+    name = "widget"
+
+    @abstractmethod
+    def matches(self, info: Dict[str, Any]) -> bool:
+        """Whether DESCRIBE_SCRIPT info is this kind of widget"""
+
+    @abstractmethod
+    def set_value(self, driver: Any, element: Any, value: str, info: Dict[str, Any]) -> bool:
+        """Set value on the widget; True when it took"""
+
+
+class ListboxButtonAdapter(WidgetAdapter):
+    """Workday "Select One" button that opens a listbox"""
+    name = "listbox"
+
+    def matches(self, info):
+        return info["tag"] == "button" and info["haspopup"] == "listbox"
+
+    def set_value(self, driver, element, value, info):
+        _click(driver, element)
+        options = _wait_for_options(driver)
+        if _choose(driver, value, options):
+            return True
+        element.send_keys(Keys.ESCAPE)
+        return False
+
+
+class PromptSearchAdapter(WidgetAdapter):
+    """Searchable prompt: type-ahead, then pick a single result per value"""
+    name = "prompt"
+
+    def matches(self, info):
+        return info["tag"] == "input" and (info["automation_id"] == "searchBox"
+                                           or info["widget_type"] == "selectinput"
+                                           or info["container_id"] == "multiSelectContainer")
+
+    def set_value(self, driver, element, value, info):
+        # Multiselect pills take one search per value
+        terms = [term.strip() for term in re.split(r"[;,]", value)] if info["multiselect"] else [value]
+        selected = 0
+        for term in filter(None, terms):
+            _click(driver, element)
+            element.send_keys(Keys.CONTROL, "a")
+            element.send_keys(term, Keys.ENTER)
+            options = _wait_for_options(driver)
+            if not options:
+                # Single search results are committed by Enter on some tenants
+                if driver.execute_script(SELECTED_SCRIPT, element):
+                    selected += 1
+                else:
+                    print(f"⚠️ No results for '{term}'")
+                continue
+            if _choose(driver, term, options):
+                selected += 1
+            else:
+                element.send_keys(Keys.ESCAPE)
+        return selected > 0
+
+
+class DateSegmentsAdapter(WidgetAdapter):
+    """Segmented MM/DD/YYYY inputs, typed segment by segment"""
+    name = "date"
+
+    def matches(self, info):
+        return info["container_id"] == "dateInputWrapper" or info["automation_id"].startswith("dateSection")
+
+    def set_value(self, driver, element, value, info):
+        parts = date_parts(value)
+        if not parts:
+            print(f"⚠️ Not a date: {value}")
+            return False
+        segments = driver.execute_script(DATE_SEGMENTS_SCRIPT, element) or {}
+        typed = 0
+        for name in ("month", "day", "year"):
+            segment = segments.get(name)
+            if segment is not None:
+                segment.send_keys(parts[name])
+                typed += 1
+        return typed > 0
+
+
+WIDGET_ADAPTERS: List[WidgetAdapter] = [ListboxButtonAdapter(), PromptSearchAdapter(), DateSegmentsAdapter()]
+
+
+def register_widget(adapter: WidgetAdapter):
+    """Add an adapter ahead of the built-in ones"""
+    WIDGET_ADAPTERS.insert(0, adapter)
+
+
+def may_be_widget(field_type: str, xpath: str) -> bool:
+    """Whether a field needs DESCRIBE_SCRIPT to tell if it is a custom widget.
+
+    Widgets sit under a Workday automation id, which shows up in the locator
+    of the field or of its nearest located ancestor; plain text fields
+    without one skip the round trip.
+    """
+    return field_type not in NATIVE_TEXT_TYPES or "data-automation-id" in (xpath or "")
+
+
+def find_widget_adapter(driver: Any, element: Any) -> Optional[Tuple[WidgetAdapter, Dict[str, Any]]]:
+    """(adapter, element info) for a custom widget, or None for native controls"""
+    try:
+        info = driver.execute_script(DESCRIBE_SCRIPT, element) or {}
+    except Exception:
+        return None
+    if not info:
+        return None
+    for adapter in WIDGET_ADAPTERS:
+        if adapter.matches(info):
+            return adapter, info
+    return None
@@ -0,0 +1,71 @@
+from datetime import date
+import pytest
+from src.candidate_profile import compile_profile, normalize_phone, parse_address
+from src.resume_parser import ParsedResume
+
+
+@pytest.mark.parametrize("phone, code, e164, national, digits", [
+    ("(408) 555-0142", "1", "+14085550142", "(408) 555-0142", "4085550142"),
+    ("408.555.0142", "1", "+14085550142", "(408) 555-0142", "4085550142"),
+    ("1-408-555-0142", "44", "+14085550142", "(408) 555-0142", "4085550142"),
+    ("+44 20 7946 0958", "1", "+442079460958", "20 7946 0958", "2079460958"),
+    ("0044 20 7946 0958", "1", "+442079460958", "20 7946 0958", "2079460958"),
+    ("020 7946 0958", "44", "+442079460958", "020 7946 0958", "2079460958"),
+])
+def test_normalize_phone(phone, code, e164, national, digits):
+    result = normalize_phone(phone, code)
+    assert result["phone_e164"] == e164
+    assert result["phone_national"] == national
+    assert result["phone_digits"] == digits
+
+
+def test_trunk_prefix_with_us_default_is_not_guessed():
+    result = normalize_phone("020 7946 0958", "1")
+    assert result["phone_e164"] == ""
+    assert result["phone_country_code"] == ""
+    assert result["phone_national"] == "020 7946 0958"
+
+
+def test_short_number_has_no_e164():
+    assert normalize_phone("555-0142", "1")["phone_e164"] == ""
+
+
+def test_empty_phone():
+    assert normalize_phone("", "1") == {"phone_e164": "", "phone_national": "", "phone_digits": "",
+                                        "phone_country_code": ""}
+
+
+def test_parse_us_street_address():
+    assert parse_address("123 Main St, Santa Clara, CA 95050") == {
+        "street": "123 Main St", "city": "Santa Clara", "state": "California", "state_code": "CA",
+        "zip_code": "95050", "country": "United States"}
+
+
+def test_parse_city_and_state():
+    parts = parse_address("Santa Clara, CA")
+    assert (parts["city"], parts["state_code"], parts["street"]) == ("Santa Clara", "CA", "")
+
+
+def test_parse_international_city():
+    parts = parse_address("London, United Kingdom")
+    assert (parts["city"], parts["country"], parts["state"]) == ("London", "United Kingdom", "")
+
+
+def test_parse_empty_address():
+    assert not any(parse_address("").values())
+
+
+def test_compile_profile():
+    resume = ParsedResume(
+        name="Jane A. Doe", email="jane@example.com", phone="(408) 555-0142",
+        address="123 Main St, Santa Clara, CA 95050",
+        experience=[{"title": "Software Engineer", "company": "Widget Corp", "duration": "Jun 2017 - Dec 2019"},
+                    {"title": "Senior Engineer", "company": "Acme", "duration": "Jan 2020 - Present"}],
+        education=[{"school": "Stanford University", "degree": "MS Computer Science", "year": "2017"}])
+    profile = compile_profile(resume, today=date(2024, 1, 1))
+    assert (profile.first_name, profile.middle_name, profile.last_name) == ("Jane", "A.", "Doe")
+    assert profile.phone_e164 == "+14085550142"
+    assert (profile.current_title, profile.current_company) == ("Senior Engineer", "Acme")
+    assert profile.currently_employed
+    assert profile.years_of_experience == pytest.approx(6.7, abs=0.05)  # Both end months count
+    assert profile.latest_school == "Stanford University"
@@ -0,0 +1,95 @@
+import os
+import pytest
+from cryptography.fernet import Fernet
+from src.checkpoint_journal import (COMPLETED, NAVIGATED, PAGE_FILLED, PAGE_MAPPED, RESUME_PARSED, RESUME_UPLOADED,
+                                    ApplicationJournal, prune_journals)
+
+URL = "https://acme.wd5.myworkdayjobs.com/en-US/Careers/job/Engineer_R123"
+KEY = Fernet.generate_key()
+
+
+@pytest.fixture
+def resume(tmp_path):
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(b"%PDF resume")
+    return str(path)
+
+
+@pytest.fixture
+def journal(tmp_path, resume):
+    return ApplicationJournal(URL, resume, directory=str(tmp_path / "journals"), key=KEY)
+
+
+def test_empty_state(journal):
+    state = journal.state()
+    assert state.resume is None and not state.uploaded and not state.completed
+    assert state.pages == {} and state.last_page == 0
+
+
+def test_state_replays_steps(journal):
+    journal.record(RESUME_PARSED, resume={"name": "Jane Doe"})
+    journal.record(RESUME_UPLOADED)
+    journal.record(PAGE_MAPPED, page=1, fingerprint="f1", fields=[{"label": "City"}])
+    journal.record(PAGE_FILLED, page=1, filled=5)
+    journal.record(NAVIGATED, page=1)
+    journal.record(PAGE_MAPPED, page=2, fingerprint="f2", fields=[])
+
+    state = journal.state()
+    assert state.resume == {"name": "Jane Doe"}
+    assert state.uploaded
+    assert state.pages[1] == {"fingerprint": "f1", "fields": [{"label": "City"}], "filled": 5}
+    assert state.last_page == 2
+    assert not state.completed
+    assert state.mapped_page("f1")["filled"] == 5
+    assert state.mapped_page("f3") is None
+    assert state.mapped_page("") is None
+
+
+def test_remapped_page_wins(journal):
+    journal.record(PAGE_MAPPED, page=1, fingerprint="f", fields=[{"label": "old"}])
+    journal.record(PAGE_MAPPED, page=3, fingerprint="f", fields=[{"label": "new"}])
+    assert journal.state().mapped_page("f")["fields"] == [{"label": "new"}]
+
+
+def test_completed(journal):
+    journal.record(COMPLETED)
+    assert journal.state().completed
+    journal.reset()
+    assert not journal.state().completed
+
+
+def test_encrypted_at_rest(journal):
+    journal.record(RESUME_PARSED, resume={"name": "Jane Doe", "email": "jane@example.com"})
+    with open(journal.path, "rb") as file:
+        content = file.read()
+    assert b"Jane" not in content and b"jane@example.com" not in content
+
+
+def test_torn_and_foreign_lines_are_skipped(journal, tmp_path, resume):
+    journal.record(RESUME_UPLOADED)
+    with open(journal.path, "a", encoding="utf-8") as file:
+        file.write("gAAAAABtorn")  # Crash mid-write, no newline
+    journal.record(NAVIGATED, page=1)
+    state = journal.state()
+    assert state.uploaded and state.last_page == 2
+
+    other_key = ApplicationJournal(URL, resume, directory=str(tmp_path / "journals"), key=Fernet.generate_key())
+    assert not other_key.state().uploaded
+
+
+def test_journal_is_keyed_by_posting_and_resume(tmp_path, resume):
+    directory = str(tmp_path / "journals")
+    first = ApplicationJournal(URL, resume, directory=directory, key=KEY)
+    assert ApplicationJournal(URL + "?source=LinkedIn", resume, directory=directory, key=KEY).path == first.path
+    assert ApplicationJournal(URL.replace("R123", "R456"), resume, directory=directory, key=KEY).path != first.path
+
+
+def test_prune_expired_and_plaintext_journals(tmp_path):
+    directory = tmp_path / "journals"
+    directory.mkdir()
+    fresh, stale, legacy = directory / "a.journal", directory / "b.journal", directory / "c.jsonl"
+    for path in (fresh, stale, legacy):
+        path.write_text("x")
+    os.utime(stale, (0, 0))
+    prune_journals(str(directory), max_age=3600)
+    assert sorted(os.listdir(directory)) == ["a.journal"]
@@ -0,0 +1,73 @@
+import time
+import pytest
+from src.disk_cache import DiskCache
+from src.llm_cache import LLMResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DiskCache(str(tmp_path / "cache.sqlite3"), ttl=60, memory_entries=2, disk_entries=3)
+
+
+def test_make_key_is_order_independent():
+    assert DiskCache.make_key(a=1, b="x") == DiskCache.make_key(b="x", a=1)
+    assert DiskCache.make_key(a=1) != DiskCache.make_key(a=2)
+
+
+def test_set_get_delete(cache):
+    assert cache.get("k") is None
+    cache.set("k", "v")
+    assert cache.get("k") == "v"
+    cache.delete("k")
+    assert cache.get("k") is None
+
+
+def test_disk_level_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    DiskCache(path, ttl=60).set("k", "v")
+    reopened = DiskCache(path, ttl=60)
+    assert reopened.get("k") == "v"
+    assert reopened.stats()["disk_hits"] == 1
+    assert reopened.get("k") == "v"
+    assert reopened.stats()["memory_hits"] == 1
+
+
+def test_expired_entries_miss(cache):
+    cache.set("k", "v", ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("k") is None
+    assert cache.stats()["expired"] >= 1
+
+
+def test_disk_cap_drops_least_recently_read(cache):
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+        time.sleep(0.01)
+    fresh = DiskCache(cache.path, ttl=60, disk_entries=3)
+    fresh.get("a")  # Read, so "b" is now the least recently used
+    fresh.set("d", "d")
+    assert fresh.stats()["disk_size"] == 3
+    assert fresh.get("b") is None
+    assert fresh.get("a") == "a"
+
+
+def test_memory_cap(cache):
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+    assert cache.stats()["memory_size"] == 2
+
+
+def test_clear(cache):
+    cache.set("k", "v")
+    cache.clear()
+    assert cache.get("k") is None
+    assert cache.stats()["disk_size"] == 0
+
+
+def test_llm_cache_only_caches_deterministic_requests(tmp_path):
+    cache = LLMResponseCache(path=str(tmp_path / "llm.sqlite3"))
+    assert cache.should_cache(0)
+    assert not cache.should_cache(0.7)
+    assert cache.should_cache(0.7, use_cache=True)
+    assert not cache.should_cache(0, use_cache=False)
+    assert cache.stats()["bypassed"] == 2
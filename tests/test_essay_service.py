@@ -0,0 +1,67 @@
+import threading
+from types import SimpleNamespace
+import pytest
+from src.candidate_profile import CandidateProfile
+from src.config import config
+from src.disk_cache import DiskCache
+from src.essay_service import EssayService
+from src.job_posting import JobPosting
+
+
+class FakeLLM:
+    def __init__(self):
+        self.prompts = []
+        self.lock = threading.Lock()
+
+    def generate_response(self, prompt, max_length=None, use_cache=None):
+        with self.lock:
+            self.prompts.append(prompt)
+        return f"Answer {len(self.prompts)}"
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "essay_speculative", "cover_letter,why_interested,not_a_template")
+    resume = SimpleNamespace(experience=[{"title": "Engineer", "company": "Acme"}], skills=["Python"])
+    profile = CandidateProfile(full_name="Jane Doe", email="jane@example.com")
+    essays = EssayService(FakeLLM(), resume, profile, cache=DiskCache(str(tmp_path / "essays.sqlite3"), ttl=60))
+    yield essays
+    essays.stop()
+
+
+@pytest.mark.parametrize("label, expected", [
+    ("Cover Letter*", "cover_letter"),
+    ("What are your greatest strengths?", "strengths_weaknesses"),
+    ("Where do you see yourself in five years?", "career_goals"),
+    ("Why do you want to work at Acme?", "why_interested"),
+    ("Describe your experience with distributed systems", "experience_description"),
+    ("Additional comments", None),
+])
+def test_template_for_label(service, label, expected):
+    assert service.template_for_label(label) == expected
+
+
+def test_start_generates_speculative_templates(service):
+    service.start(JobPosting(url="https://acme.wd5.myworkdayjobs.com/job/1", company="Acme", title="Engineer"))
+    assert sorted(service._futures) == ["cover_letter", "why_interested"]
+    assert service.answer_for_label("Cover Letter", timeout=5).startswith("Answer")
+    assert service.answer_for_label("Career goals", timeout=5) is None  # Not requested yet
+
+
+def test_prepare_starts_matching_templates(service):
+    service.start(JobPosting(requisition_id="R1"))
+    matched = service.prepare(["Where do you see yourself in 5 years?", "Additional comments"])
+    assert matched == ["Where do you see yourself in 5 years?"]
+    assert service.answer_for_label("Where do you see yourself in 5 years?", timeout=5).startswith("Answer")
+
+
+def test_new_posting_regenerates_requested_templates(service):
+    service.start(JobPosting(requisition_id="R1", company="Acme", title="Engineer"))
+    service.prepare(["Describe your experience"])
+    first = service.answer_for_label("Describe your experience", timeout=5)
+    service.start(JobPosting(requisition_id="R1", company="Acme", title="Engineer", location="Austin"))
+    assert service.answer_for_label("Describe your experience", timeout=5) == first  # Same posting kept
+    service.start(JobPosting(requisition_id="R2", company="Globex", title="Engineer"))
+    assert sorted(service._futures) == ["cover_letter", "experience_description", "why_interested"]
+    assert service.answer_for_label("Cover Letter", timeout=5)
+    assert any("Globex" in prompt for prompt in service.llm_client.prompts)
@@ -0,0 +1,68 @@
+import pytest
+from src.candidate_profile import CandidateProfile
+from src.field_resolver import normalize_label, resolve_field_locally
+
+PROFILE = CandidateProfile(
+    full_name="Jane A. Doe", first_name="Jane", middle_name="A.", last_name="Doe", email="jane@example.com",
+    phone_national="(408) 555-0142", phone_country_code="+1", street="123 Main St", city="Santa Clara",
+    state="California", zip_code="95050", country="United States", current_title="Senior Engineer",
+    current_company="Acme", years_of_experience=6.5)
+
+
+def test_normalize_label():
+    assert normalize_label("  First   Name*: ") == "first name"
+
+
+@pytest.mark.parametrize("label, field_type, expected", [
+    ("First Name*", "text", "Jane"),
+    ("Given Name", "text", "Jane"),
+    ("Middle Initial", "text", "A."),
+    ("Last Name", "text", "Doe"),
+    ("Surname", "text", "Doe"),
+    ("Legal Name", "text", "Jane A. Doe"),
+    ("Email Address*", "email", "jane@example.com"),
+    ("Phone Number*", "tel", "(408) 555-0142"),
+    ("Country Phone Code", "select", "+1"),
+    ("Address Line 1*", "text", "123 Main St"),
+    ("City*", "text", "Santa Clara"),
+    ("Current City", "text", "Santa Clara"),
+    ("State*", "select", "California"),
+    ("State/Province", "select", "California"),
+    ("Postal Code", "text", "95050"),
+    ("Country*", "select", "United States"),
+    ("Current Job Title", "text", "Senior Engineer"),
+    ("Current Employer", "text", "Acme"),
+    ("Years of Experience", "number", None),  # Only text-like and select fields
+    ("Years of Experience", "text", "6.5"),
+    ("How many years of experience do you have?", "text", "6.5"),
+])
+def test_resolves_profile_labels(label, field_type, expected):
+    assert resolve_field_locally(label, field_type, PROFILE) == expected
+
+
+@pytest.mark.parametrize("label, field_type", [
+    ("Phone Extension", "text"),  # Never the phone number itself
+    ("First Name", "textarea"),
+    ("Current Employer", "select"),  # Dropdown options are not free text
+    ("Why do you want to work here?", "text"),
+    ("Middle Name", "text"),
+])
+def test_leaves_fields_to_the_llm(label, field_type):
+    profile = CandidateProfile(first_name="Jane", phone_national="(408) 555-0142", current_company="Acme")
+    assert resolve_field_locally(label, field_type, profile) is None
+
+
+@pytest.mark.parametrize("label", [
+    "How many years of experience do you have with Kubernetes?",
+    "Years of experience in Python",
+    "Are you willing to travel out of state?",
+    "State your salary expectations",
+    "Preferred city to work in",
+    "Which city are you willing to relocate to?",
+])
+def test_questions_mentioning_profile_words_go_to_the_llm(label):
+    assert resolve_field_locally(label, "text", PROFILE) is None
+
+
+def test_no_profile():
+    assert resolve_field_locally("First Name", "text", None) is None
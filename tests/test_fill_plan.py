@@ -0,0 +1,35 @@
+import json
+from src.fill_plan import PLAN_VERSION, FillPlan, PlanStep, load_plan, save_plan
+
+
+def _plan():
+    return FillPlan(host="acme.wd5.myworkdayjobs.com", source_url="https://acme.wd5.myworkdayjobs.com/job/1",
+                    created=1700000000.0, steps=[PlanStep(fingerprint="f1", fields=[{"label": "City", "value": "Santa Clara"}],
+                                    navigation={"action": "next", "xpath": "//button"}),
+                           PlanStep(fingerprint="f2", fields=[], navigation={"action": "done"})])
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "plans" / "acme.json")
+    save_plan(_plan(), path)
+    assert load_plan(path) == _plan()
+
+
+def test_step_index():
+    plan = _plan()
+    assert plan.step(1).fingerprint == "f2"
+    assert plan.step(2) is None
+    assert plan.step(-1) is None
+
+
+def test_other_version_is_rejected(tmp_path):
+    path = tmp_path / "old.json"
+    path.write_text(json.dumps({**_plan().to_dict(), "version": PLAN_VERSION + 1}))
+    assert load_plan(str(path)) is None
+
+
+def test_unreadable_plan(tmp_path):
+    assert load_plan(str(tmp_path / "missing.json")) is None
+    broken = tmp_path / "broken.json"
+    broken.write_text("{not json")
+    assert load_plan(str(broken)) is None
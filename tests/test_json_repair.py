@@ -0,0 +1,48 @@
+import pytest
+from src.json_repair import JSONStreamRepairer, loads_tolerant
+
+
+def test_plain_object():
+    assert loads_tolerant('{"0": "Jane", "1": "Doe"}') == {"0": "Jane", "1": "Doe"}
+
+
+def test_skips_prose_and_code_fences():
+    text = 'Here is the mapping:\n```json\n{"0": "Jane"}\n```\nLet me know if you need more.'
+    assert loads_tolerant(text) == {"0": "Jane"}
+
+
+def test_drops_trailing_commas():
+    assert loads_tolerant('{"a": [1, 2, ], "b": 3, }') == {"a": [1, 2], "b": 3}
+
+
+def test_ignores_output_after_first_value():
+    assert loads_tolerant('{"a": 1} {"b": 2}') == {"a": 1}
+
+
+def test_closes_truncated_string_and_containers():
+    assert loads_tolerant('{"0": "Jane", "1": "Senior Eng') == {"0": "Jane", "1": "Senior Eng"}
+
+
+def test_cuts_back_to_last_complete_member():
+    assert loads_tolerant('{"0": "Jane", "1": ') == {"0": "Jane"}
+
+
+def test_brackets_inside_strings():
+    assert loads_tolerant('{"0": "a {b} [c]"}') == {"0": "a {b} [c]"}
+
+
+def test_stray_bracket_in_prose_is_skipped():
+    assert loads_tolerant('Note: {not json} then {"0": "x"}') == {"0": "x"}
+
+
+def test_chunked_feed_matches_whole():
+    text = '{"skills": ["Python", "Go"], "name": "Jane"}'
+    repairer = JSONStreamRepairer()
+    for i in range(0, len(text), 3):
+        repairer.feed(text[i:i + 3])
+    assert repairer.result() == {"skills": ["Python", "Go"], "name": "Jane"}
+
+
+def test_no_json_raises():
+    with pytest.raises(ValueError):
+        loads_tolerant("I could not find any fields.")
@@ -0,0 +1,43 @@
+from src.disk_cache import DiskCache
+from src.layout_cache import LayoutCache, PageLayout, changed_labels, layout_from_signature
+
+SIGNATURE = ["input:text:legalNameSection:firstName", "input:text:legalNameSection:lastName",
+             "button::countryDropdown:"]
+
+
+def test_fingerprint_is_stable():
+    first = layout_from_signature("acme.wd5.myworkdayjobs.com", SIGNATURE)
+    second = layout_from_signature("acme.wd5.myworkdayjobs.com", list(SIGNATURE))
+    assert first.fingerprint == second.fingerprint
+    assert first.controls == 3
+
+
+def test_fingerprint_depends_on_controls_not_host():
+    layout = layout_from_signature("acme.wd5.myworkdayjobs.com", SIGNATURE)
+    assert layout_from_signature("other.wd1.myworkdayjobs.com", SIGNATURE).fingerprint == layout.fingerprint
+    assert layout_from_signature("acme.wd5.myworkdayjobs.com", SIGNATURE[:2]).fingerprint != layout.fingerprint
+    assert layout_from_signature("acme.wd5.myworkdayjobs.com", SIGNATURE[::-1]).fingerprint != layout.fingerprint
+
+
+def test_no_controls_no_layout():
+    assert layout_from_signature("acme.wd5.myworkdayjobs.com", []) is None
+
+
+def test_layouts_are_per_tenant_and_candidate(tmp_path):
+    cache = LayoutCache(DiskCache(str(tmp_path / "layouts.sqlite3"), ttl=60))
+    layout = PageLayout(host="acme.wd5.myworkdayjobs.com", fingerprint="f", controls=2)
+    cache.save(layout, "jane", [{"label": "City", "value": "Santa Clara"}])
+    assert cache.load(layout, "jane") == [{"label": "City", "value": "Santa Clara"}]
+    assert cache.load(layout, "john") is None
+    assert cache.load(PageLayout(host="other.wd1.myworkdayjobs.com", fingerprint="f", controls=2), "jane") is None
+    cache.invalidate(layout, "jane")
+    assert cache.load(layout, "jane") is None
+
+
+def test_changed_labels_flags_different_questions():
+    records = [{"label": "Do you require sponsorship?", "value": "No"},
+               {"label": "Country", "value": "United States"},
+               {"label": "City", "value": "Austin"}]
+    labels = ["Are you 18 or older?", "  country ", None]
+    assert changed_labels(records, labels) == [0]
+    assert changed_labels(records, [record["label"] for record in records]) == []
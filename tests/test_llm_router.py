@@ -0,0 +1,102 @@
+import time
+import pytest
+from src.config import config
+from src.llm_cache import LLMResponseCache
+from src.llm_router import LLMRouter
+
+
+class FakeBackend:
+    def __init__(self, model, reply="ok", delay=0.0, error=None):
+        self.model, self.reply, self.delay, self.error = model, reply, delay, error
+        self.calls = 0
+
+    def _generate(self, prompt, max_length=None, temperature=None, system=None, response_format=None):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            raise RuntimeError(self.error)
+        return f"{self.reply}: {prompt}"
+
+
+@pytest.fixture(autouse=True)
+def no_default_cache(monkeypatch):
+    monkeypatch.setattr(config, "llm_cache_enabled", False)
+
+
+def make_router(*backends, **kwargs):
+    return LLMRouter(list(backends), **kwargs)
+
+
+def test_needs_a_backend():
+    with pytest.raises(ValueError):
+        LLMRouter([])
+
+
+def test_fails_over_to_the_next_backend():
+    broken, working = FakeBackend("a", error="down"), FakeBackend("b", reply="from b")
+    router = make_router(broken, working)
+    assert router.generate_response("hi") == "from b: hi"
+    assert router.stats[id(broken)].error_rate == 1.0
+    assert router.stats[id(working)].error_rate == 0.0
+    router.close()
+
+
+def test_all_backends_failing_raises():
+    router = make_router(FakeBackend("a", error="down"), FakeBackend("b", error="timeout"))
+    with pytest.raises(Exception, match="All LLM backends failed: FakeBackend: down; FakeBackend: timeout"):
+        router.generate_response("hi")
+    router.close()
+
+
+def test_ranks_by_health_then_latency():
+    slow, fast, flaky = FakeBackend("slow"), FakeBackend("fast"), FakeBackend("flaky")
+    router = make_router(slow, fast, flaky)
+    for _ in range(config.router_min_samples):
+        router.stats[id(slow)].record(2.0, True)
+        router.stats[id(fast)].record(0.5, True)
+        router.stats[id(flaky)].record(0.1, False)
+    assert router.ranked_backends() == [fast, slow, flaky]
+    assert not router.stats[id(flaky)].healthy
+    router.close()
+
+
+def test_hedges_a_request_slower_than_its_p95(monkeypatch):
+    monkeypatch.setattr(config, "router_min_hedge_delay", 0.05)
+    primary, backup = FakeBackend("primary", reply="primary", delay=1.0), FakeBackend("backup", reply="backup")
+    router = make_router(primary, backup)
+    for _ in range(5):
+        router.stats[id(primary)].record(0.01, True)
+        router.stats[id(backup)].record(0.02, True)
+    started = time.perf_counter()
+    assert router.generate_response("hi") == "backup: hi"
+    assert time.perf_counter() - started < 0.5
+    assert primary.calls == backup.calls == 1
+    router.close()
+
+
+def test_no_hedging_without_latency_samples():
+    primary, backup = FakeBackend("primary", reply="primary", delay=0.1), FakeBackend("backup")
+    router = make_router(primary, backup)
+    assert router.generate_response("hi") == "primary: hi"
+    assert backup.calls == 0
+    router.close()
+
+
+def test_caches_at_the_router(tmp_path):
+    backend = FakeBackend("a")
+    router = make_router(backend, FakeBackend("b"), cache=LLMResponseCache(str(tmp_path / "llm.sqlite3")))
+    assert router.generate_response("hi", temperature=0) == router.generate_response("hi", temperature=0)
+    assert backend.calls == 1
+    router.close()
+
+
+def test_report_and_close():
+    backend = FakeBackend("a")
+    router = make_router(backend, FakeBackend("b"))
+    router.generate_response("hi")
+    rows = router.report()
+    assert [row["model"] for row in rows] == ["a", "b"]
+    assert rows[0]["p50"] is not None and rows[1]["p50"] is None
+    router.close()
+    with pytest.raises(RuntimeError):
+        router.generate_response("again")
@@ -0,0 +1,61 @@
+import json
+from src.config import config
+from src.network_policy import NetworkPolicy, PageNetworkStats, collect_network_stats
+
+
+def test_from_config(monkeypatch):
+    monkeypatch.setattr(config, "blocked_categories", "analytics, chat")
+    monkeypatch.setattr(config, "blocked_resource_types", "font,unknown")
+    monkeypatch.setattr(config, "blocked_urls", "*cdn.example.com*")
+    policy = NetworkPolicy.from_config()
+    assert set(policy.patterns) == {"analytics", "chat", "font", "custom"}
+    assert "*cdn.example.com*" in policy.urls()
+
+
+def test_nothing_blocked(monkeypatch):
+    monkeypatch.setattr(config, "blocked_categories", "")
+    monkeypatch.setattr(config, "blocked_resource_types", "")
+    monkeypatch.setattr(config, "blocked_urls", "")
+    assert NetworkPolicy.from_config().urls() == []
+
+
+def test_category():
+    policy = NetworkPolicy({"analytics": ["*google-analytics.com*"], "font": ["*.woff2"]})
+    assert policy.category("https://www.google-analytics.com/collect?v=1") == "analytics"
+    assert policy.category("https://acme.wd5.myworkdayjobs.com/fonts/a.woff2") == "font"
+    assert policy.category("https://acme.wd5.myworkdayjobs.com/wday/cxs/jobs") == "other"
+
+
+def _entry(method, **params):
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+
+class FakeDriver:
+    def __init__(self, entries):
+        self.entries = entries
+
+    def get_log(self, kind):
+        assert kind == "performance"
+        return self.entries
+
+
+def test_collect_network_stats():
+    policy = NetworkPolicy({"analytics": ["*google-analytics.com*"]})
+    driver = FakeDriver([
+        _entry("Network.requestWillBeSent", requestId="1", request={"url": "https://acme.example/app.js"}),
+        _entry("Network.loadingFinished", requestId="1", encodedDataLength=2048),
+        _entry("Network.requestWillBeSent", requestId="2", request={"url": "https://www.google-analytics.com/a"}),
+        _entry("Network.loadingFailed", requestId="2", blockedReason="inspector"),
+        {"message": "not json"},
+    ])
+    stats = collect_network_stats(driver, policy)
+    assert (stats.requests, stats.bytes, stats.blocked) == (2, 2048, 1)
+    assert stats.blocked_by == {"analytics": 1}
+    assert stats.summary() == "1 requests, 2 KB loaded; 1 blocked (analytics 1)"
+
+
+def test_collect_without_performance_log():
+    class NoLog:
+        def get_log(self, kind):
+            raise RuntimeError("performance log not enabled")
+    assert collect_network_stats(NoLog()) == PageNetworkStats()
@@ -0,0 +1,59 @@
+import pytest
+from src.candidate_profile import compile_profile
+from src.offline_analysis import detect_page, map_detection
+from src.resume_parser import ParsedResume
+
+PAGE = """<html><head><script>var x = "<input type='text'>";</script></head><body>
+<h2>My Information</h2>
+<div data-automation-id="formField-legalNameSection_firstName">
+  <label for="first">First Name*</label><input type="text" id="first" data-automation-id="legalNameSection_firstName">
+</div>
+<div data-automation-id="formField-email">
+  <label for="email">Email Address*</label><input type="email" id="email" data-automation-id="email">
+</div>
+<div data-automation-id="formField-countryDropdown">
+  <label for="country">Country*</label>
+  <button id="country" aria-haspopup="listbox" data-automation-id="countryDropdown">Select One</button>
+</div>
+<fieldset><legend>Application Questions</legend>
+  <label for="why">Why are you interested?</label><textarea id="why"></textarea>
+</fieldset>
+<input type="hidden" name="csrf">
+<div style="display: none"><input type="text" name="trap"></div>
+<input type="text" id="locked" disabled>
+<input type="file" id="resume">
+</body></html>"""
+
+
+@pytest.mark.parametrize("parser", ["lxml", "html.parser"])
+def test_detect_page(parser):
+    detection = detect_page(PAGE, url="https://acme.wd5.myworkdayjobs.com/apply", parser=parser)
+    fields = {field["label"]: field for field in detection.fields}
+    assert set(fields) == {"First Name*", "Email Address*", "Country*", "Why are you interested?"}
+    assert fields["First Name*"]["field_type"] == "text"
+    assert fields["First Name*"]["xpath"] == "//*[@data-automation-id='legalNameSection_firstName']"
+    assert fields["First Name*"]["section"] == "My Information"
+    assert fields["Country*"]["field_type"] == "select"
+    assert fields["Why are you interested?"]["field_type"] == "textarea"
+    assert fields["Why are you interested?"]["section"] == "Application Questions"
+    assert detection.fingerprint
+
+
+def test_parsers_agree():
+    assert detect_page(PAGE, parser="lxml").fields == detect_page(PAGE, parser="html.parser").fields
+
+
+def test_fingerprint_ignores_values():
+    filled = PAGE.replace('id="first"', 'id="first" value="Jane"')
+    assert detect_page(filled).fingerprint == detect_page(PAGE).fingerprint
+
+
+def test_map_detection_leaves_open_fields():
+    resume = ParsedResume(name="Jane Doe", email="jane@example.com", address="Santa Clara, CA")
+    analysis = map_detection(detect_page(PAGE), resume, compile_profile(resume))
+    values = {field.label: field.value for field in analysis.fields}
+    assert values["First Name*"] == "Jane"
+    assert values["Email Address*"] == "jane@example.com"
+    assert values["Country*"] == "United States"
+    assert [field.label for field in analysis.open_fields()] == ["Why are you interested?"]
+    assert analysis.prompt_tokens > 0
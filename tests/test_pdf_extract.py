@@ -0,0 +1,34 @@
+import pytest
+from benchmarks.samples import write_sample_pdfs
+from src.config import config
+from src.pdf_extract import PDF_BACKENDS, PDFBackend, available_backends, extract_pdf_text
+
+
+@pytest.fixture(scope="module")
+def sample_pdf(tmp_path_factory):
+    return write_sample_pdfs(str(tmp_path_factory.mktemp("pdfs")), page_counts=(4,))[0]
+
+
+def test_backends_must_implement_extraction():
+    class CountOnly(PDFBackend):
+        def page_count(self, file_path):
+            return 0
+
+    with pytest.raises(TypeError):
+        CountOnly()
+
+
+@pytest.mark.parametrize("name", available_backends())
+def test_page_ranges(name, sample_pdf):
+    backend = PDF_BACKENDS[name]()
+    assert backend.page_count(sample_pdf) == 4
+    pages = list(backend.iter_pages(sample_pdf))
+    assert len(pages) == 4 and all(page.strip() for page in pages)
+    assert list(backend.iter_pages(sample_pdf, 1, 3)) == pages[1:3]
+    assert list(backend.iter_pages(sample_pdf, 2)) == pages[2:]
+
+
+def test_parallel_extraction_matches_serial(sample_pdf, monkeypatch):
+    monkeypatch.setattr(config, "pdf_parallel_min_pages", 1)
+    name = available_backends()[0]
+    assert extract_pdf_text(sample_pdf, backend=name, workers=2) == extract_pdf_text(sample_pdf, backend=name, workers=1)
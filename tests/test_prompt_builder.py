@@ -0,0 +1,98 @@
+import json
+from src.candidate_profile import compile_profile
+from src.form_fields import WorkdayField
+from src.prompt_builder import MappingPromptBuilder, estimate_tokens
+from src.resume_parser import ParsedResume
+
+RESUME = ParsedResume(
+    name="Jane Doe", email="jane@example.com", phone="(408) 555-0142", address="Santa Clara, CA 95050",
+    summary="Backend engineer.", skills=["Python", "Go"],
+    experience=[{"title": "Senior Engineer", "company": "Acme", "duration": "Jan 2020 - Present",
+                 "description": "Led the streaming migration"},
+                {"title": "Engineer", "company": "Widget Corp", "duration": "Jun 2017 - Dec 2019",
+                 "description": "Built REST APIs"}],
+    education=[{"school": "Stanford University", "degree": "MS Computer Science", "year": "2017"}])
+
+
+def _fields(*specs):
+    return [WorkdayField(label=label, field_type=field_type, section=section) for label, field_type, section in specs]
+
+
+def test_chunks_respect_the_token_budget():
+    builder = MappingPromptBuilder()
+    fields = _fields(*[(f"Question {i}", "text", "") for i in range(20)])
+    budget = 4 * builder.field_cost(fields[0])
+    chunks = builder.chunk_fields(fields, budget)
+    assert [i for chunk in chunks for i in chunk] == list(range(20))
+    assert all(sum(builder.field_cost(fields[i]) for i in chunk) <= budget for chunk in chunks)
+
+
+def test_chunks_keep_sections_together():
+    builder = MappingPromptBuilder()
+    fields = _fields(("First Name", "text", "Contact"), ("School", "text", "Education"),
+                     ("Last Name", "text", "Contact"), ("Degree", "text", "Education"))
+    budget = 2 * max(builder.field_cost(f) for f in fields)
+    chunks = builder.chunk_fields(fields, budget)
+    assert sorted(map(sorted, chunks)) == [[0, 2], [1, 3]]
+
+
+def test_oversized_section_is_split():
+    builder = MappingPromptBuilder()
+    fields = _fields(*[(f"Essay {i}", "textarea", "Questions") for i in range(3)])
+    chunks = builder.chunk_fields(fields, builder.field_cost(fields[0]))
+    assert chunks == [[0], [1], [2]]
+
+
+def test_no_fields_no_chunks():
+    assert MappingPromptBuilder().chunk_fields([], 1000) == []
+
+
+def test_relevant_sections():
+    builder = MappingPromptBuilder()
+    assert builder.relevant_sections(_fields(("Email", "email", ""))) == ["name", "email", "phone", "address"]
+    assert "education" in builder.relevant_sections(_fields(("Degree", "select", "")))
+    # Long-form answers get the whole background
+    sections = builder.relevant_sections(_fields(("Anything else?", "textarea", "")))
+    assert {"summary", "skills", "experience", "education"} <= set(sections)
+
+
+def _candidate(prompt):
+    line = next(line for line in prompt.body.splitlines() if line.startswith("R:"))
+    return json.loads(line[2:])
+
+
+def test_build_encodes_the_profile():
+    profile = compile_profile(RESUME)
+    fields = _fields(("Current Employer", "text", ""), ("Degree", "select", ""))
+    candidate = _candidate(MappingPromptBuilder().build(RESUME, fields, profile=profile))
+    assert candidate["first_name"] == "Jane"
+    assert candidate["phone_e164"] == "+14085550142"
+    assert candidate["current_company"] == "Acme"
+    assert candidate["latest_school"] == "Stanford University"
+    # Two roles: the history table is included, descriptions only for long-form pages
+    assert candidate["jobs"][0] == ["title", "company", "duration"]
+    assert "schools" not in candidate  # One degree is fully covered by latest_*
+    assert "summary" not in candidate and "skills" not in candidate
+
+
+def test_build_with_textarea_includes_descriptions():
+    profile = compile_profile(RESUME)
+    candidate = _candidate(MappingPromptBuilder().build(RESUME, _fields(("Tell us about you", "textarea", "")),
+                                                        profile=profile))
+    assert candidate["jobs"][0][-1] == "description"
+    assert candidate["summary"] == "Backend engineer."
+
+
+def test_build_without_profile_uses_resume_sections():
+    candidate = _candidate(MappingPromptBuilder().build(RESUME, _fields(("Email", "email", ""))))
+    assert candidate == {"name": "Jane Doe", "email": "jane@example.com", "phone": "(408) 555-0142",
+                         "address": "Santa Clara, CA 95050"}
+
+
+def test_build_field_indices_and_prefix():
+    builder = MappingPromptBuilder()
+    prompt = builder.build(RESUME, _fields(("City", "text", ""), ("State", "select", "")), [4, 7])
+    assert 'F:[[4,"City","text"],[7,"State","select"]]' in prompt.body
+    assert prompt.prefix == builder.prefix
+    assert prompt.total_tokens == estimate_tokens(prompt.prefix) + estimate_tokens(prompt.body)
+    assert builder.mapping_schema([4, 7])["required"] == ["4", "7"]
@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+from src.repeatable_sections import block_control_values, education_values, experience_values
+
+RESUME = SimpleNamespace(
+    experience=[{"title": "Senior Engineer", "company": "Acme", "location": "Austin, TX",
+                 "duration": "Jan 2020 - Present", "description": "Led the platform team"},
+                {"title": "Engineer", "company": "Globex", "duration": "03/2016 - 12/2019"}],
+    education=[{"school": "MIT", "degree": "B.S. in Computer Science", "year": "2016"}])
+
+
+def test_experience_values():
+    assert experience_values(RESUME.experience[0]) == {
+        "title": "Senior Engineer", "company": "Acme", "location": "Austin, TX",
+        "description": "Led the platform team", "start": "01/2020", "end": "", "current": "Yes"}
+    values = experience_values(RESUME.experience[1])
+    assert (values["start"], values["end"], values["current"]) == ("03/2016", "12/2019", "")
+    assert experience_values({"title": "Intern"})["current"] == ""  # No dates is not "current"
+
+
+def test_education_values():
+    assert education_values(RESUME.education[0]) == {
+        "school": "MIT", "degree": "B.S. in Computer Science", "field_of_study": "Computer Science",
+        "end": "2016", "start": ""}
+    assert education_values({"degree": "MBA", "field_of_study": "Finance"})["field_of_study"] == "Finance"
+
+
+def control(section, index, key):
+    return {"section": section, "index": index, "key": key, "xpath": f"//{section}[{index}]/{key}"}
+
+
+def test_block_control_values():
+    controls = [
+        control("experience", 0, "jobTitle"),
+        control("experience", 0, "currentlyWorkHere"),
+        control("experience", 0, "endDate"),
+        control("experience", 1, "companyName"),
+        control("experience", 1, "startDate"),
+        control("experience", 1, "roleDescription"),
+        control("experience", 2, "jobTitle"),  # No third job in the resume
+        control("education", 0, "schoolName"),
+        control("education", 0, "fieldOfStudy"),
+        control("education", 0, "degree"),
+        control("education", 0, "lastYearAttended"),
+        control("education", 0, "gpa"),  # Not a known key
+    ]
+    assert block_control_values(controls, RESUME) == {
+        "//experience[0]/jobTitle": "Senior Engineer",
+        "//experience[0]/currentlyWorkHere": "Yes",
+        "//experience[0]/endDate": "",  # Left blank while the job is current
+        "//experience[1]/companyName": "Globex",
+        "//experience[1]/startDate": "03/2016",
+        "//experience[1]/roleDescription": "",
+        "//education[0]/schoolName": "MIT",
+        "//education[0]/fieldOfStudy": "Computer Science",
+        "//education[0]/degree": "B.S. in Computer Science",
+        "//education[0]/lastYearAttended": "2016",
+    }
+
+
+def test_no_entries_no_values():
+    assert block_control_values([control("education", 0, "schoolName")], SimpleNamespace(education=None)) == {}
@@ -0,0 +1,78 @@
+from src.resume_rules import RuleBasedResumeParser
+
+RESUME = """JANE DOE
+jane.doe@example.com | (408) 555-0142 | linkedin.com/in/janedoe
+Santa Clara, CA 95050
+
+Experience
+Senior Software Engineer at Acme Analytics
+Jan 2020 - Present
+- Led the streaming migration
+Software Engineer | Widget Corp | Jun 2017 - Dec 2019
+- Built REST APIs
+
+Education
+Stanford University
+Master of Science in Computer Science, 2017
+
+Skills
+Python, Go, PostgreSQL • Kubernetes
+
+Certifications
+AWS Certified Solutions Architect, 2021
+"""
+
+
+def test_contact_fields():
+    fields, confidence = RuleBasedResumeParser().parse(RESUME)
+    assert fields["name"] == "Jane Doe"
+    assert fields["email"] == "jane.doe@example.com"
+    assert fields["phone"] == "(408) 555-0142"
+    assert fields["address"] == "Santa Clara, CA 95050"
+    assert confidence["email"] == 1.0
+
+
+def test_experience_entries():
+    fields, confidence = RuleBasedResumeParser().parse(RESUME)
+    assert fields["experience"] == [
+        {"company": "Acme Analytics", "title": "Senior Software Engineer", "duration": "Jan 2020 - Present",
+         "description": "Led the streaming migration"},
+        {"company": "Widget Corp", "title": "Software Engineer", "duration": "Jun 2017 - Dec 2019",
+         "description": "Built REST APIs"},
+    ]
+    assert confidence["experience"] >= 0.8
+
+
+def test_education_skills_and_certifications():
+    fields, _ = RuleBasedResumeParser().parse(RESUME)
+    assert fields["education"] == [{"school": "Stanford University",
+                                     "degree": "Master of Science in Computer Science", "year": "2017"}]
+    assert fields["skills"] == ["Python", "Go", "PostgreSQL", "Kubernetes"]
+    assert fields["certifications"][0]["name"] == "AWS Certified Solutions Architect"
+    assert fields["certifications"][0]["year"] == "2021"
+
+
+def test_missing_sections_have_no_confidence():
+    fields, confidence = RuleBasedResumeParser().parse("Jane Doe\njane@example.com\n")
+    assert fields["experience"] == [] and confidence["experience"] == 0.0
+    assert fields["skills"] == [] and confidence["skills"] == 0.0
+
+
+def test_summary_from_header():
+    fields, confidence = RuleBasedResumeParser().parse(
+        "Jane Doe\njane@example.com\n\nSummary\nBackend engineer focused on data platforms.\n")
+    assert fields["summary"] == "Backend engineer focused on data platforms."
+    assert confidence["summary"] == 0.9
+
+
+def test_unheaded_summary_is_low_confidence():
+    text = ("Jane Doe\njane@example.com\nBackend engineer with eight years building streaming data platforms "
+            "and leading small teams.\n\nExperience\nEngineer at Acme\nJan 2020 - Present\n")
+    fields, confidence = RuleBasedResumeParser().parse(text)
+    assert fields["summary"].startswith("Backend engineer")
+    assert confidence["summary"] == 0.5
+
+
+def test_no_summary_needs_no_llm():
+    _, confidence = RuleBasedResumeParser().parse(RESUME)
+    assert confidence["summary"] == 0.9
@@ -0,0 +1,57 @@
+import os
+import time
+import pytest
+from cryptography.fernet import Fernet
+from src.config import config
+from src.session_store import SessionStore
+
+HOST = "acme.wd5.myworkdayjobs.com"
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SessionStore(str(tmp_path / "sessions"), key=Fernet.generate_key())
+
+
+def test_round_trip_is_encrypted(store):
+    cookies = [{"name": "PLAY_SESSION", "value": "secret-token", "domain": HOST, "expires": -1}]
+    store.save(HOST, cookies, {"wd-locale": "en-US"})
+    session = store.load(HOST)
+    assert session["cookies"] == cookies
+    assert session["local_storage"] == {"wd-locale": "en-US"}
+
+    raw = open(store._path(HOST), "rb").read()
+    assert b"secret-token" not in raw and HOST.encode() not in raw
+    assert oct(os.stat(store._path(HOST)).st_mode & 0o777) == "0o600"
+
+
+def test_sessions_are_per_host(store):
+    store.save(HOST, [{"name": "a", "value": "1"}], {})
+    assert store.load("other.wd1.myworkdayjobs.com") is None
+
+
+def test_drops_expired_cookies(store):
+    now = time.time()
+    store.save(HOST, [{"name": "old", "value": "1", "expires": now - 60},
+                      {"name": "live", "value": "2", "expires": now + 3600},
+                      {"name": "session", "value": "3", "expires": -1}], {})
+    assert [cookie["name"] for cookie in store.load(HOST)["cookies"]] == ["live", "session"]
+
+
+def test_nothing_usable_left(store):
+    store.save(HOST, [{"name": "old", "value": "1", "expires": time.time() - 60}], {})
+    assert store.load(HOST) is None
+
+
+def test_old_sessions_are_deleted(store, monkeypatch):
+    store.save(HOST, [{"name": "a", "value": "1"}], {})
+    monkeypatch.setattr(config, "session_max_age", -1)
+    assert store.load(HOST) is None
+    assert not os.path.exists(store._path(HOST))
+
+
+def test_another_key_cannot_read_sessions(store):
+    store.save(HOST, [{"name": "a", "value": "1"}], {})
+    other = SessionStore(store.directory, key=Fernet.generate_key())
+    assert other.load(HOST) is None
+    assert not os.path.exists(store._path(HOST))  # Unreadable sessions are discarded
@@ -0,0 +1,70 @@
+import pytest
+from src.config import config
+from src.text_input import FINISH_SCRIPT, PREPARE_SCRIPT, chunks, enter_text, insert_text
+
+
+@pytest.mark.parametrize("text, size, expected", [
+    ("abcdefg", 3, ["abc", "def", "g"]),
+    ("abc", 3, ["abc"]),
+    ("abc", 10, ["abc"]),
+    ("abc", 0, ["abc"]),  # Whole text in one insert
+    ("", 3, []),
+    ("", 0, [""]),
+])
+def test_chunks(text, size, expected):
+    assert chunks(text, size) == expected
+    assert "".join(chunks(text, size)) == text
+
+
+class FakeDriver:
+    def __init__(self, focused=True, value=None):
+        self.focused, self.value = focused, value
+        self.inserted, self.finished = [], []
+
+    def execute_script(self, script, *args):
+        if script == PREPARE_SCRIPT:
+            return self.focused
+        if script == FINISH_SCRIPT:
+            self.finished.append(args[1:])
+            return "".join(self.inserted) if self.value is None else self.value
+        raise AssertionError("unexpected script")
+
+    def execute_cdp_cmd(self, command, params):
+        assert command == "Input.insertText"
+        self.inserted.append(params["text"])
+
+
+class FakeElement:
+    def __init__(self):
+        self.keys = []
+
+    def clear(self):
+        self.keys = []
+
+    def send_keys(self, key):
+        self.keys.append(key)
+
+
+def test_insert_text_in_chunks():
+    driver = FakeDriver()
+    assert insert_text(driver, FakeElement(), "Santa Clara", chunk_chars=4, delay=0)
+    assert driver.inserted == ["Sant", "a Cl", "ara"]
+    assert driver.finished == [("a", True)]  # Key events name the last character, then blur
+
+
+def test_insert_text_rejected_by_field():
+    assert not insert_text(FakeDriver(focused=False), FakeElement(), "x", delay=0)
+    assert not insert_text(FakeDriver(value=""), FakeElement(), "x", delay=0)
+    assert insert_text(FakeDriver(value="(408) 555-0142"), FakeElement(), "4085550142", delay=0)
+
+
+def test_enter_text_falls_back_to_typing(monkeypatch):
+    monkeypatch.setattr(config, "text_entry", "insert")
+    monkeypatch.setattr(config, "typing_delay", 0)
+    element = FakeElement()
+    assert enter_text(FakeDriver(focused=False), element, "abc")
+    assert element.keys == ["a", "b", "c"]
+
+    driver, element = FakeDriver(), FakeElement()
+    assert enter_text(driver, element, "abc")
+    assert driver.inserted == ["abc"] and element.keys == []
@@ -0,0 +1,59 @@
+import pytest
+from src.widgets import WidgetAdapter, best_option, date_parts, may_be_widget
+
+YES_NO = ["Yes", "No", "I don't know"]
+
+
+@pytest.mark.parametrize("value, options, expected", [
+    ("Yes", YES_NO, 0),
+    ("no", YES_NO, 1),
+    ("California", ["Alabama", "California (CA)"], 1),
+    ("Senior", ["Junior Engineer", "Senior Engineer"], 1),
+    ("United States", ["United States Minor Outlying Islands", "United States of America"], 1),
+    ("No, I do not require sponsorship", YES_NO, 1),
+    ("Y", ["Yes, I agree", "No"], 0),
+    ("decline", ["Yes", "No, thank you"], 1),
+])
+def test_best_option(value, options, expected):
+    assert best_option(value, options) == expected
+
+
+@pytest.mark.parametrize("value", ["Unknown", "Not applicable", "Nowhere", ""])
+def test_best_option_ignores_options_inside_other_words(value):
+    assert best_option(value, YES_NO) is None
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2021-03-15", {"month": "03", "day": "15", "year": "2021"}),
+    ("2021-3", {"month": "03", "day": "01", "year": "2021"}),
+    ("7/4/2020", {"month": "07", "day": "04", "year": "2020"}),
+    ("March 2019", {"month": "03", "day": "01", "year": "2019"}),
+])
+def test_date_parts(value, expected):
+    assert date_parts(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "Present", "soon"])
+def test_date_parts_rejects_non_dates(value):
+    assert date_parts(value) is None
+
+
+@pytest.mark.parametrize("field_type, xpath, expected", [
+    ("text", "//*[@id='phone']", False),
+    ("email", "/html/body/div[2]/form/input[3]", False),
+    ("text", "//*[@data-automation-id='searchBox']", True),
+    ("text", "//*[@data-automation-id='formField-skills']/div[1]/input[1]", True),
+    ("select", "//*[@id='country']", True),
+    ("date", "//*[@id='start']", True),
+])
+def test_may_be_widget(field_type, xpath, expected):
+    assert may_be_widget(field_type, xpath) is expected
+
+
+def test_widget_adapters_must_implement_both_methods():
+    class MatchOnly(WidgetAdapter):
+        def matches(self, info):
+            return True
+
+    with pytest.raises(TypeError):
+        MatchOnly()